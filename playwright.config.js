@@ -1,15 +1,20 @@
 import { defineConfig } from '@playwright/test';
 
+// BASE_URL=http://127.0.0.1:8000 runs the specs against python3 -m transforms.serve
+// (the built dist/) instead of the Vite dev server
+const BASE_URL = process.env.BASE_URL;
+
 export default defineConfig({
   testDir: './tests',
   timeout: 30000,
   retries: 0,
+  fullyParallel: !!BASE_URL,
   use: {
-    baseURL: 'http://localhost:5173',
+    baseURL: BASE_URL || 'http://localhost:5173',
     headless: true,
     screenshot: 'only-on-failure',
   },
-  webServer: {
+  webServer: BASE_URL ? undefined : {
     command: 'npm run dev',
     url: 'http://localhost:5173',
     reuseExistingServer: true,
@@ -0,0 +1,117 @@
+// Client for the blog search index built by `python3 -m transforms.search`.
+// blogSearch(query) resolves to [{url, title, excerpt, score}], best first.
+// It fetches search/index.json once and then only the shards holding the
+// query's words; both are cached for the rest of the page's life.
+(function() {
+  var BASE = '/search/';
+  var LIMIT = 10;
+  var index = null;
+  var shards = {};
+
+  function load(url) {
+    return fetch(url).then(function(response) {
+      if (!response.ok) throw new Error('blog search: ' + url + ' ' + response.status);
+      return response.json();
+    });
+  }
+
+  function loadIndex() {
+    if (!index) {
+      index = load(BASE + 'index.json').then(function(data) {
+        data.stopWords = {};
+        data.stop.forEach(function(word) { data.stopWords[word] = true; });
+        return data;
+      });
+    }
+    return index;
+  }
+
+  // Same rules as transforms/search.py's stem(), shipped in index.json
+  function stem(data, word) {
+    for (var i = 0; i < data.suffixes.length; i++) {
+      var suffix = data.suffixes[i][0], replacement = data.suffixes[i][1];
+      if (word.slice(-suffix.length) === suffix) {
+        if (word.length - suffix.length + replacement.length >= data.minStem) {
+          word = word.slice(0, -suffix.length) + replacement;
+        }
+        break;
+      }
+    }
+    if (word.charAt(word.length - 1) === 'e' && word.length > data.minStem + 1) {
+      word = word.slice(0, -1);
+    }
+    return word;
+  }
+
+  function tokens(data, text) {
+    var words = text.toLowerCase().normalize('NFKD').replace(/[\u0300-\u036f]/g, '').match(/[a-z0-9]+/g) || [];
+    return words.filter(function(word) {
+      return word.length >= data.minWord && !data.stopWords[word];
+    }).map(function(word) { return stem(data, word); });
+  }
+
+  function shardKey(data, term) {
+    return data.prefix ? term.slice(0, data.prefix) : 'all';
+  }
+
+  // Front-coded terms -> {term: [doc gap, weight, ...]}
+  function loadShard(data, key) {
+    var name = data.shards[key];
+    if (!name) return Promise.resolve({});
+    if (!shards[name]) {
+      shards[name] = load(BASE + name).then(function(shard) {
+        var postings = {};
+        var previous = '';
+        (shard.terms ? shard.terms.split(' ') : []).forEach(function(entry, i) {
+          var term = previous.slice(0, parseInt(entry.charAt(0), 36)) + entry.slice(1);
+          postings[term] = shard.postings[i];
+          previous = term;
+        });
+        return postings;
+      });
+    }
+    return shards[name];
+  }
+
+  window.blogSearch = function(query, limit) {
+    return loadIndex().then(function(data) {
+      var words = tokens(data, query);
+      return Promise.all(words.map(function(term) {
+        return loadShard(data, shardKey(data, term));
+      })).then(function(loaded) {
+        var count = data.docs.filter(Boolean).length;
+        var scores = {}, matched = {};
+        words.forEach(function(term, n) {
+          // The last word may still be being typed: it also matches as a prefix
+          var last = n === words.length - 1 && !/\s$/.test(query);
+          var postings = loaded[n];
+          var hits = {};
+          if (last) {
+            Object.keys(postings).forEach(function(t) {
+              if (t.indexOf(term) === 0) hits[t] = t === term ? 1 : 0.5;
+            });
+          } else {
+            hits[term] = 1;
+          }
+          Object.keys(hits).forEach(function(t) {
+            var flat = postings[t];
+            if (!flat || !flat.length) return;
+            var idf = Math.log(1 + count / (flat.length / 2));
+            var doc = 0;
+            for (var i = 0; i < flat.length; i += 2) {
+              doc += flat[i];
+              scores[doc] = (scores[doc] || 0) + flat[i + 1] * idf * hits[t];
+              (matched[doc] = matched[doc] || {})[n] = true;
+            }
+          });
+        });
+        return Object.keys(scores).map(Number).sort(function(a, b) {
+          return Object.keys(matched[b]).length - Object.keys(matched[a]).length || scores[b] - scores[a] || a - b;
+        }).slice(0, limit || LIMIT).map(function(doc) {
+          var entry = data.docs[doc];
+          return {url: entry[0], title: entry[1], excerpt: entry[2], score: Math.round(scores[doc] * 10) / 10};
+        });
+      });
+    });
+  };
+})();
@@ -1,7 +1,9 @@
 import { test } from '@playwright/test';
 
+const BASE_URL = process.env.BASE_URL || 'https://perioskouplandingdoctor.vercel.app';
+
 test('check inner padding', async ({ page }) => {
-  await page.goto('https://perioskouplandingdoctor.vercel.app/');
+  await page.goto(`${BASE_URL}/`);
   await page.waitForTimeout(500);
   
   const home = await page.evaluate(() => {
@@ -17,7 +19,7 @@ test('check inner padding', async ({ page }) => {
   });
   console.log('HOME INNER:', JSON.stringify(home));
   
-  await page.goto('https://perioskouplandingdoctor.vercel.app/blog');
+  await page.goto(`${BASE_URL}/blog`);
   await page.waitForTimeout(500);
   
   const blog = await page.evaluate(() => {
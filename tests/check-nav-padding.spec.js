@@ -1,7 +1,9 @@
 import { test } from '@playwright/test';
 
+const BASE_URL = process.env.BASE_URL || 'https://perioskouplandingdoctor.vercel.app';
+
 test('check nav padding', async ({ page }) => {
-  await page.goto('https://perioskouplandingdoctor.vercel.app/');
+  await page.goto(`${BASE_URL}/`);
   await page.waitForTimeout(500);
   
   const homeNav = await page.evaluate(() => {
@@ -16,7 +18,7 @@ test('check nav padding', async ({ page }) => {
   });
   console.log('HOME NAV:', JSON.stringify(homeNav));
   
-  await page.goto('https://perioskouplandingdoctor.vercel.app/blog');
+  await page.goto(`${BASE_URL}/blog`);
   await page.waitForTimeout(500);
   
   const blogNav = await page.evaluate(() => {
@@ -1,9 +1,11 @@
 import { test } from '@playwright/test';
 
+const BASE_URL = process.env.BASE_URL || 'https://perioskouplandingdoctor.vercel.app';
+
 test('check navbar widths', async ({ page }) => {
   await page.setViewportSize({ width: 1400, height: 800 });
   
-  await page.goto('https://perioskouplandingdoctor.vercel.app/');
+  await page.goto(`${BASE_URL}/`);
   await page.waitForTimeout(500);
   
   const homeWidth = await page.evaluate(() => {
@@ -24,7 +26,7 @@ test('check navbar widths', async ({ page }) => {
   });
   console.log('HOME:', JSON.stringify(homeWidth, null, 2));
   
-  await page.goto('https://perioskouplandingdoctor.vercel.app/blog');
+  await page.goto(`${BASE_URL}/blog`);
   await page.waitForTimeout(500);
   
   const blogWidth = await page.evaluate(() => {
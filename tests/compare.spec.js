@@ -1,8 +1,10 @@
 import { test, expect } from '@playwright/test';
 
+const BASE_URL = process.env.BASE_URL || 'https://perioskouplandingdoctor.vercel.app';
+
 test('compare navbars', async ({ page }) => {
   // Homepage
-  await page.goto('https://perioskouplandingdoctor.vercel.app/');
+  await page.goto(`${BASE_URL}/`);
   await page.waitForTimeout(1000);
   
   const homeStyles = await page.evaluate(() => {
@@ -23,7 +25,7 @@ test('compare navbars', async ({ page }) => {
   console.log('HOME:', JSON.stringify(homeStyles));
   
   // Blog
-  await page.goto('https://perioskouplandingdoctor.vercel.app/blog');
+  await page.goto(`${BASE_URL}/blog`);
   await page.waitForTimeout(1000);
   
   const blogStyles = await page.evaluate(() => {
@@ -1,7 +1,7 @@
 // @ts-check
 import { test, expect } from '@playwright/test';
 
-const BASE_URL = 'https://perioskouplandingdoctor.vercel.app';
+const BASE_URL = process.env.BASE_URL || 'https://perioskouplandingdoctor.vercel.app';
 
 // All pages to test (excluding homepage)
 const PAGES = [
@@ -1,7 +1,7 @@
 // Quick sanity check for navbar and fonts on all pages
 import { test, expect } from '@playwright/test';
 
-const BASE_URL = 'https://perioskouplandingdoctor.vercel.app';
+const BASE_URL = process.env.BASE_URL || 'https://perioskouplandingdoctor.vercel.app';
 
 const PAGES = [
   '/calculator.html',
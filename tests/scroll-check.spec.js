@@ -1,7 +1,9 @@
 import { test } from '@playwright/test';
 
+const BASE_URL = process.env.BASE_URL || 'https://perioskouplandingdoctor.vercel.app';
+
 test('screenshot signup page scrolled', async ({ page }) => {
-  await page.goto('https://perioskouplandingdoctor.vercel.app/signup');
+  await page.goto(`${BASE_URL}/signup`);
   await page.waitForTimeout(1000);
   await page.evaluate(() => window.scrollBy(0, 400));
   await page.waitForTimeout(500);
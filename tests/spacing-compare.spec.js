@@ -1,8 +1,10 @@
 import { test } from '@playwright/test';
 
+const BASE_URL = process.env.BASE_URL || 'https://perioskouplandingdoctor.vercel.app';
+
 test('spacing compare', async ({ page }) => {
   // Homepage
-  await page.goto('https://perioskouplandingdoctor.vercel.app/');
+  await page.goto(`${BASE_URL}/`);
   await page.waitForTimeout(500);
   
   const homeSpacing = await page.evaluate(() => {
@@ -24,7 +26,7 @@ test('spacing compare', async ({ page }) => {
   console.log('HOME:', JSON.stringify(homeSpacing, null, 2));
   
   // Blog
-  await page.goto('https://perioskouplandingdoctor.vercel.app/blog');
+  await page.goto(`${BASE_URL}/blog`);
   await page.waitForTimeout(500);
   
   const blogSpacing = await page.evaluate(() => {
@@ -0,0 +1,31 @@
+import pytest
+
+from transforms.blog import parse_front_matter
+
+
+def meta(front_matter):
+    return parse_front_matter(f'---\n{front_matter}\n---\nBody\n')[0]
+
+
+@pytest.mark.parametrize('line, value', [
+    ('title: "C # tips"', 'C # tips'),
+    ('title: "C # tips"  # the quotes keep the #', 'C # tips'),
+    ("title: 'C # tips'", 'C # tips'),
+    ('title: Plain # comment', 'Plain'),
+    ("title: it's # comment", "it's"),
+    ('title: C#', 'C#'),
+    ("title: ['a # b', c]  # list", ['a # b', 'c']),
+])
+def test_comments_are_stripped_outside_quotes(line, value):
+    assert meta(line)['title'] == value
+
+
+def test_values_and_body():
+    front, body = parse_front_matter('---\n# note\ndate: 2026-01-02\ndraft: true\nread_time: 4\n---\nBody\n')
+    assert front == {'date': '2026-01-02', 'draft': True, 'read_time': 4}
+    assert body == 'Body\n'
+
+
+def test_missing_front_matter():
+    with pytest.raises(ValueError):
+        parse_front_matter('Body\n')
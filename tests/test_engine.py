@@ -0,0 +1,85 @@
+import os
+import shutil
+import sys
+
+from transforms import TRANSFORMS, cache, engine
+from transforms.registry import transform
+
+SUFFIX = '<!-- seen -->'
+
+
+@transform('test-mark', pages=['a.html', 'b.html'])
+def mark(content, page):
+    page.depends_on('dep.txt')
+    return content if content.endswith(SUFFIX) else content + SUFFIX
+
+
+def write(root, path, text):
+    with open(os.path.join(root, path), 'w') as f:
+        f.write(text)
+
+
+def read(root, path):
+    with open(os.path.join(root, path)) as f:
+        return f.read()
+
+
+def run(root):
+    results = engine.run(['test-mark'], ['a.html', 'b.html'], root=str(root), verbose=False, snapshot=False)
+    return {r.path: r.status for r in results}
+
+
+def site(tmp_path):
+    for path in ('a.html', 'b.html'):
+        write(tmp_path, path, f'<p>{path}</p>')
+    write(tmp_path, 'dep.txt', 'one')
+    return tmp_path
+
+
+def test_pages_are_transformed_once_and_then_cached(tmp_path):
+    root = site(tmp_path)
+    assert run(root) == {'a.html': engine.CHANGED, 'b.html': engine.CHANGED}
+    assert read(root, 'a.html') == '<p>a.html</p>' + SUFFIX
+    assert run(root) == {'a.html': engine.SKIPPED, 'b.html': engine.SKIPPED}
+
+
+def test_editing_a_page_reprocesses_only_that_page(tmp_path):
+    root = site(tmp_path)
+    run(root)
+    write(root, 'a.html', '<p>edited</p>')
+    assert run(root) == {'a.html': engine.CHANGED, 'b.html': engine.SKIPPED}
+
+
+def test_editing_a_dependency_reprocesses_its_pages(tmp_path):
+    root = site(tmp_path)
+    run(root)
+    write(root, 'dep.txt', 'two')
+    assert run(root) == {'a.html': engine.UNCHANGED, 'b.html': engine.UNCHANGED}
+
+
+def test_editing_a_constant_changes_the_fingerprint(tmp_path, monkeypatch):
+    root = site(tmp_path)
+    run(root)
+    monkeypatch.setattr(sys.modules[__name__], 'SUFFIX', '<!-- seen again -->')
+    assert run(root) == {'a.html': engine.CHANGED, 'b.html': engine.CHANGED}
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    root = site(tmp_path)
+    engine.run(['test-mark'], ['a.html'], root=str(root), dry_run=True, verbose=False)
+    assert read(root, 'a.html') == '<p>a.html</p>'
+    assert not os.path.exists(os.path.join(root, cache.CACHE_FILE))
+
+
+def test_fingerprint_covers_imported_helper_modules(tmp_path, monkeypatch):
+    footer = TRANSFORMS['full-footer']
+    assert {'transforms.locator', 'transforms.includes'} <= cache._imported_modules(footer.func.__module__)
+    before = cache.fingerprint(footer, engine.ROOT)
+
+    locator = sys.modules['transforms.locator']
+    edited = tmp_path / 'locator.py'
+    shutil.copy(locator.__file__, edited)
+    with open(edited, 'a') as f:
+        f.write('# edited\n')
+    monkeypatch.setattr(locator, '__file__', str(edited))
+    assert cache.fingerprint(footer, engine.ROOT) != before
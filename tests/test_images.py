@@ -0,0 +1,24 @@
+from transforms.images import picture
+from transforms.locator import locate
+
+ENTRY = {'width': 640, 'height': 480, 'variants': {'webp': [(320, '/img/v/a-320.webp'), (640, '/img/v/a-640.webp')]}}
+
+
+def render(img_html):
+    doc = locate(img_html)
+    img = doc.find('img')
+    return picture(doc, img, ENTRY, img, '100vw')
+
+
+def test_picture_has_a_source_per_format_and_the_img_fallback():
+    assert render('<img src="/a.png" alt="">') == (
+        '<picture>\n'
+        '    <source type="image/webp" srcset="/img/v/a-320.webp 320w, /img/v/a-640.webp 640w" sizes="100vw">\n'
+        '    <img src="/a.png" alt="" width="640" height="480">\n'
+        '</picture>')
+
+
+def test_attribute_values_are_escaped_once():
+    html = render('<img src="/a.png" alt=\'Say "hi" &amp; wave\' title="a &lt; b" width="10">')
+    assert '<img src="/a.png" alt="Say &quot;hi&quot; &amp; wave" title="a &lt; b" width="10" height="480">' in html
+    assert locate(html).find('img').attrs['alt'] == 'Say &quot;hi&quot; &amp; wave'
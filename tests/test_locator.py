@@ -0,0 +1,47 @@
+import pytest
+
+from transforms.locator import locate, splice
+
+
+def test_splice_applies_edits_in_any_order():
+    assert splice('abcdef', [(4, 5, 'E'), (0, 1, 'A'), (2, 2, '+')]) == 'Ab+cdEf'
+
+
+def test_splice_allows_insertions_at_an_edit_boundary():
+    assert splice('abc', [(1, 2, 'B'), (2, 2, '+')]) == 'aB+c'
+
+
+def test_splice_rejects_overlapping_edits():
+    with pytest.raises(ValueError):
+        splice('abcdef', [(0, 3, ''), (2, 4, '')])
+
+
+def test_splice_without_edits_returns_the_text():
+    assert splice('abc', []) == 'abc'
+
+
+def test_locate_nested_elements_and_inner_text():
+    doc = locate('<div id="a"><nav class="x y"><a href="/">Home</a></nav></div>')
+    nav = doc.find('nav', cls='y')
+    assert doc.inner(nav) == '<a href="/">Home</a>'
+    assert doc.find('div', id='a').contains(nav)
+    assert [el.tag for el in doc.find_all(within=nav)] == ['nav', 'a']
+
+
+def test_locate_lowercases_attribute_names():
+    doc = locate('<svg viewBox="0 0 24 24"></svg>')
+    assert doc.find('svg').attrs == {'viewbox': '0 0 24 24'}
+
+
+def test_script_bodies_are_raw_text():
+    doc = locate('<div><script>if (a) document.write("</div>");</script></div><p>after</p>')
+    div = doc.find('div')
+    assert doc.inner(div).startswith('<script>') and doc.inner(div).endswith('</script>')
+    assert doc.find('p', within=div) is None
+
+
+def test_unclosed_elements_end_at_their_parent():
+    doc = locate('<ul><li>one<li>two</ul>')
+    first, second = doc.find_all('li')
+    assert doc.inner(first) == 'one<li>two'
+    assert second.end == first.end
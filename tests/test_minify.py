@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from transforms import minify
+from transforms.engine import ROOT, site_pages
+
+PAGES = site_pages(ROOT) + sorted(f'partials/{name}' for name in os.listdir(os.path.join(ROOT, 'partials')))
+
+
+@pytest.mark.parametrize('path', PAGES)
+def test_minify_is_idempotent_on_every_page(path):
+    with open(os.path.join(ROOT, path)) as f:
+        once = minify.minify_html(f.read())
+    assert minify.minify_html(once) == once
+
+
+@pytest.mark.parametrize('html, expected', [
+    ('<div>\n  <!-- c -->\n  <script type="application/ld+json">{"a": 1}</script>\n</div>\n',
+     '<div><script type="application/ld+json">{"a":1}</script></div>\n'),
+    ('<p>a <!-- x --> b</p>', '<p>a b</p>'),
+    ('<p>a<!-- x -->b</p>', '<p>ab</p>'),
+    ('<span>a</span>\n<!-- x -->\n<span>b</span>', '<span>a</span>\n<span>b</span>'),
+])
+def test_dropped_comments_take_their_whitespace_along(html, expected):
+    assert minify.minify_html(html) == expected
+    assert minify.minify_html(expected) == expected
+
+
+def test_kept_comments_and_raw_text():
+    html = '<!-- @hero -->\n<pre>  a\n  b</pre>\n<p class="  x\n  y ">t</p>'
+    assert minify.minify_html(html) == '<!-- @hero --><pre>  a\n  b</pre><p class="x y">t</p>'
+
+
+def build(directory, name):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, name), 'w') as f:
+        f.write('<html>\n  <body>\n    <!-- x -->\n' + '    <p>Hello   world</p>\n' * 200 + '  </body>\n</html>\n')
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_rebuilt_output_is_restored_from_the_input_hash(tmp_path, monkeypatch):
+    dist = tmp_path / 'dist'
+    build(dist, 'index.html')
+    entries, stale = minify.run(str(dist), 'dist', root=str(tmp_path))
+    assert stale == ['index.html']
+    minified, gz = read(dist / 'index.html'), read(dist / 'index.html.gz')
+
+    # Unchanged since the last run: not touched
+    assert minify.run(str(dist), 'dist', root=str(tmp_path))[1] == []
+
+    # vite build writes the unminified file again: restored without minifying
+    build(dist, 'index.html')
+    os.remove(dist / 'index.html.gz')
+    monkeypatch.setattr(minify, 'minify_html', lambda html: pytest.fail('minified again'))
+    again, stale = minify.run(str(dist), 'dist', root=str(tmp_path))
+    assert stale == ['index.html']
+    assert read(dist / 'index.html') == minified and read(dist / 'index.html.gz') == gz
+    assert again == entries
+
+
+def test_a_changed_input_is_minified_and_old_outputs_pruned(tmp_path):
+    dist = tmp_path / 'dist'
+    build(dist, 'index.html')
+    minify.run(str(dist), 'dist', root=str(tmp_path))
+    stored = set(os.listdir(tmp_path / minify.CACHE_DIR))
+    with open(dist / 'index.html', 'w') as f:
+        f.write('<p>new   page</p>\n' * 100)
+    minify.run(str(dist), 'dist', root=str(tmp_path))
+    assert read(dist / 'index.html').startswith(b'<p>new page</p>')
+    assert not stored & set(os.listdir(tmp_path / minify.CACHE_DIR))
@@ -0,0 +1,69 @@
+import os
+import random
+import re
+
+import pytest
+
+from transforms.engine import ROOT, Page, site_pages
+from transforms.rules import PRE_CLEANUP, Rule, RuleSet, apply_rules, rule_lists, sequential_apply
+
+RULE_LISTS = {name: rules for _, name, rules in rule_lists()}
+TRANSFORM_OF = {name: t for t, name, _ in rule_lists()}
+
+
+def pre_cleanup(path):
+    with open(os.path.join(ROOT, PRE_CLEANUP[path])) as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('name', sorted(RULE_LISTS))
+def test_rule_lists_match_one_sub_per_rule_on_the_pre_cleanup_homepage(name):
+    rules = RULE_LISTS[name]
+    html = pre_cleanup('index.html')
+    output, hits = RuleSet(rules).apply(html)
+    assert sum(hits) > 0
+    assert output == sequential_apply(html, rules)
+
+
+@pytest.mark.parametrize('name', sorted(RULE_LISTS))
+def test_rule_lists_match_one_sub_per_rule_on_the_pages_they_run_on(name):
+    rules = RULE_LISTS[name]
+    for path in filter(TRANSFORM_OF[name].applies_to, site_pages(ROOT)):
+        html = Page.load(path, ROOT).content
+        assert apply_rules(html, rules) == sequential_apply(html, rules), path
+
+
+def test_scoped_rules_only_match_in_their_section():
+    rules = [Rule('x', 'X', scope='b')]
+    html = 'x<!-- @a -->x<!-- @b -->x<!-- @c -->x'
+    assert apply_rules(html, rules) == 'x<!-- @a -->x<!-- @b -->X<!-- @c -->x'
+    assert apply_rules('xx', rules) == 'xx'
+
+
+def test_rules_see_the_original_page():
+    assert apply_rules('ab', [Rule('a', 'b'), Rule('bb', 'c')]) == 'bb'
+
+
+def test_replacement_templates():
+    assert apply_rules('<a id="1">', [Rule(r'<a id="(?P<id>\d)">', r'<b \g<id>>')]) == '<b 1>'
+
+
+PATTERNS = ['<a', '<ab', '<b>', 'a[bc]+', 'b?c', '<a[^>]*>', '>b', 'c<', '(?:ab)+', '<b', '[ab]{2}']
+
+
+def test_matches_one_combined_alternation():
+    rng = random.Random(0)
+    for _ in range(2000):
+        patterns = rng.sample(PATTERNS, rng.randint(1, 5))
+        html = ''.join(rng.choice('<>abc') for _ in range(rng.randint(0, 30)))
+        combined = re.compile('|'.join(f'({p})' for p in patterns))
+        expected = combined.sub(lambda m: f'[{m.lastindex - 1}]' if m.group() else '', html)
+        rules = [Rule(p, f'[{i}]') for i, p in enumerate(patterns)]
+        assert RuleSet(rules).apply(html)[0] == expected, (patterns, html)
+
+
+def test_hit_counts_per_rule():
+    ruleset = RuleSet([Rule('a'), Rule('b'), Rule('z')])
+    assert ruleset.apply('abab')[1] == [2, 2, 0]
+    ruleset.apply('a')
+    assert ruleset.hits == [3, 2, 0]
@@ -0,0 +1,54 @@
+import pytest
+
+from transforms.sections import SectionIndex
+
+PAGE = ('<head></head>\n'
+        '<!-- @a -->\n<section style="background: linear-gradient(red, blue)">A</section>\n'
+        '<!-- @b -->\nB\n'
+        '<!-- @c -->\nC\n')
+
+
+def names(html):
+    return SectionIndex(html).names
+
+
+def test_render_without_changes_is_the_page():
+    assert SectionIndex(PAGE).layout().render() == PAGE
+
+
+def test_reorder_moves_sections_into_the_listed_slots():
+    html = SectionIndex(PAGE).layout().reorder(['c', 'a']).render()
+    assert names(html) == ['c', 'b', 'a']
+    assert html.startswith('<head></head>\n<!-- @c -->')
+
+
+def test_reorder_after_drop_keeps_the_other_sections():
+    html = SectionIndex(PAGE).layout().drop('b').reorder(['c', 'a']).render()
+    assert names(html) == ['c', 'a']
+
+
+def test_dropped_sections_cannot_come_back():
+    layout = SectionIndex(PAGE).layout().drop('b')
+    with pytest.raises(KeyError, match='Dropped section: @b'):
+        layout.reorder(['c', 'b', 'a'])
+    with pytest.raises(KeyError, match='Dropped section'):
+        layout.move('a', after='b')
+    assert layout.order == ['a', 'c']
+
+
+def test_unknown_sections_are_rejected():
+    with pytest.raises(KeyError, match='Unknown section: @z'):
+        SectionIndex(PAGE).layout().replace('z', '')
+
+
+def test_move_keep_replace_and_restyle():
+    layout = SectionIndex(PAGE).layout().move('a', after='c').replace('b', '<!-- @b -->\nnew\n')
+    assert names(layout.render()) == ['b', 'c', 'a']
+    assert 'new' in layout.render()
+    html = SectionIndex(PAGE).layout().restyle('a', 'background: #000;').keep(['a']).render()
+    assert html == '<head></head>\n<!-- @a -->\n<section style="background: #000;">A</section>\n'
+
+
+def test_duplicate_markers_are_an_error():
+    with pytest.raises(ValueError):
+        SectionIndex('<!-- @a -->x<!-- @a -->y')
@@ -1,10 +1,12 @@
 import { test } from '@playwright/test';
 
+const BASE_URL = process.env.BASE_URL || 'https://perioskouplandingdoctor.vercel.app';
+
 const pages = [
-  'https://perioskouplandingdoctor.vercel.app/',
-  'https://perioskouplandingdoctor.vercel.app/blog',
-  'https://perioskouplandingdoctor.vercel.app/calculator.html',
-  'https://perioskouplandingdoctor.vercel.app/contact.html',
+  `${BASE_URL}/`,
+  `${BASE_URL}/blog`,
+  `${BASE_URL}/calculator.html`,
+  `${BASE_URL}/contact.html`,
 ];
 
 test('verify all navbars match', async ({ page }) => {
@@ -0,0 +1,17 @@
+"""
+Shared page transform engine for the site rewrite scripts.
+
+Each rewrite (navbar sync, footer swap, gradients, blur cleanup, ...) is a
+registered transform. run() loads every page once, applies the selected
+transforms in memory in order and writes each file at most once.
+Pages can be processed in parallel with jobs=N.
+
+    python3 -m transforms chrome
+    python3 -m transforms sync-navbar full-footer --dry-run
+    python3 -m transforms chrome --jobs 8
+"""
+from .registry import TRANSFORMS, PIPELINES, Transform, transform, get_pipeline
+from .engine import ROOT, Page, PageResult, site_pages, process_page, run
+
+# Register the built-in transforms
+from . import includes, navbar, footer, gradient, blurs, blog_sync, reorganize, seo, images, tailwind  # noqa: E402,F401
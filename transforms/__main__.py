@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Run page transforms from the command line.
+
+    python3 -m transforms                      # default 'chrome' pipeline
+    python3 -m transforms sync-navbar remove-blurs
+    python3 -m transforms chrome --jobs 8
+    python3 -m transforms sync-from-blog --watch
+    python3 -m transforms --list
+    python3 -m transforms --rules
+    python3 -m transforms homepage --no-cache --profile trace.json
+"""
+import argparse
+import sys
+
+from . import PIPELINES, TRANSFORMS, get_pipeline, profiling, rules, run
+from .includes import dependency_graph
+from .watch import watch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('names', nargs='*', default=['chrome'],
+                        help='transforms or pipelines to run, in order')
+    parser.add_argument('--pages', nargs='+', help='only process these pages')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='process pages in N worker processes (0 = one per CPU)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore .transform-cache.json and process every page')
+    parser.add_argument('--dry-run', action='store_true', help="don't write any files")
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help="don't snapshot the pages before writing them (see transforms.snapshots)")
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and re-process pages as they are edited')
+    parser.add_argument('--poll', action='store_true', help='with --watch, poll mtimes instead of inotify')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='time every transform and its patterns; FILE.json is a Chrome trace, '
+                             'anything else JSON lines')
+    parser.add_argument('--graph', action='store_true', help='show which pages include which partials')
+    parser.add_argument('--list', action='store_true', help='list transforms and pipelines')
+    parser.add_argument('--rules', action='store_true', help='show how often each cleanup rule matches, per page')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, t in TRANSFORMS.items():
+            scope = ', '.join(t.pages) if t.pages is not None else 'all pages'
+            if t.exclude:
+                scope += f" (except {', '.join(t.exclude)})"
+            print(f'{name:20} {scope}')
+        print()
+        for name, steps in PIPELINES.items():
+            print(f"{name:20} {' -> '.join(steps)}")
+        return 0
+
+    if args.graph:
+        graph = dependency_graph()
+        if not graph:
+            print('No includes recorded yet; run: python3 -m transforms includes')
+        for dep, pages in graph.items():
+            print(f'{dep}  ({len(pages)} pages)')
+            for page in pages:
+                print(f'    {page}')
+        return 0
+
+    if args.rules:
+        return 0 if rules.report(args.pages) else 1
+
+    if args.watch:
+        try:
+            get_pipeline(args.names)
+        except KeyError as e:
+            print(f'✗ {e.args[0]}')
+            return 1
+        watch(args.names, jobs=args.jobs, poll=args.poll)
+        return 0
+
+    try:
+        results = run(args.names, pages=args.pages, dry_run=args.dry_run,
+                      jobs=args.jobs, use_cache=not args.no_cache, profile=bool(args.profile),
+                      snapshot=not args.no_snapshot)
+    except KeyError as e:
+        print(f'✗ {e.args[0]}')
+        return 1
+    if args.profile:
+        records = [record for r in results for record in r.profile]
+        profiling.write(records, args.profile)
+        profiling.summary(records)
+        cached = sum(r.status == 'skipped' for r in results)
+        print(f'\n✓ {len(records)} transform calls written to {args.profile}'
+              + (f' ({cached} cached pages not profiled; add --no-cache)' if cached else ''))
+    return 1 if any(r.status == 'error' for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
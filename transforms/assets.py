@@ -0,0 +1,301 @@
+"""
+Content-addressed asset fingerprinting for the build output.
+
+Runs after vite build (npm's postbuild hook). Every static asset in dist/ is
+hashed; byte-identical copies (app_image.png.backup, logo-white.svg next to
+logo-brand.svg, ...) collapse to one canonical file, and every asset the
+site references is renamed to <name>.<hash>.<ext>. References in all HTML,
+CSS and JS files are rewritten in one pass with a single combined pattern.
+CSS and JS are rewritten before they are hashed themselves, so a stylesheet's
+fingerprint changes when an image it points at does.
+
+Files that must keep their URL (favicon.ico, robots.txt, files referenced by
+absolute https://perioskoup.com/... URLs such as og:image) stay in place
+and only get a fingerprinted copy. dist/asset-manifest.json maps original
+URLs to fingerprinted ones. The Cache-Control rules in vercel.json
+(immutable for fingerprinted files, revalidate for HTML) are checked on
+every run and rewritten if they drift.
+
+    npm run build                              # runs this as postbuild
+    python3 -m transforms.assets --dry-run     # report only
+    python3 -m transforms.assets --dir public --dry-run   # find duplicates in public/
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+from .engine import ROOT
+from .seo import SITE_URL, VERCEL_CONFIG
+
+MANIFEST = 'asset-manifest.json'
+HASH_LENGTH = 10
+TEXT_EXTENSIONS = ('.html', '.css', '.js', '.mjs', '.svg', '.webmanifest')
+# Never renamed: well-known URLs, crawler files, and build metadata
+KEEP_NAMES = ('favicon.ico', 'apple-touch-icon.png', 'robots.txt', 'sitemap.xml', MANIFEST)
+SKIP = re.compile(r'(^|/)(sitemap(-\d+)?\.xml|\..*)$|\.(gz|br)$')
+# Leftovers that are never the canonical copy of a duplicate
+JUNK = re.compile(r'\.(backup|bak|orig)$|~$')
+# Names that are already content-addressed: ours, Vite's /assets/, image variants
+FINGERPRINTED = re.compile(r'\.[0-9a-f]{%d}\.[A-Za-z0-9]+$|^assets/|^img/.*-[0-9a-f]{10}-\d+\.\w+$' % HASH_LENGTH)
+ABSOLUTE = re.compile(re.escape(SITE_URL) + r'/([^\s"\'(),?#<>]+)')
+REFERENCE = re.compile(r'(?<=[\s"\'(,=])(/[^\s"\'(),?#<>]+\.[A-Za-z0-9]+)(?=[\s"\'),?#<>]|$)')
+
+CACHE_IMMUTABLE = 'public, max-age=31536000, immutable'
+CACHE_REVALIDATE = 'public, max-age=0, must-revalidate'
+HEADERS = [
+    {'source': '/assets/(.*)', 'headers': [{'key': 'Cache-Control', 'value': CACHE_IMMUTABLE}]},
+    {'source': '/img/(.*)', 'headers': [{'key': 'Cache-Control', 'value': CACHE_IMMUTABLE}]},
+    {'source': '/(.*\\.[0-9a-f]{%d}\\.[a-z0-9]+)' % HASH_LENGTH,
+     'headers': [{'key': 'Cache-Control', 'value': CACHE_IMMUTABLE}]},
+    # Pages: cleanUrls paths without an extension, and *.html
+    {'source': '/((?!.*\\.[a-z0-9]+$).*)', 'headers': [{'key': 'Cache-Control', 'value': CACHE_REVALIDATE}]},
+    {'source': '/(.*\\.html)', 'headers': [{'key': 'Cache-Control', 'value': CACHE_REVALIDATE}]},
+]
+
+
+def file_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def fingerprinted_name(path, digest):
+    directory, name = os.path.split(path)
+    stem, ext = os.path.splitext(name)
+    return f'{directory}/{stem}.{digest}{ext}' if directory else f'{stem}.{digest}{ext}'
+
+
+def walk(directory):
+    """All files under directory, relative, in sorted order."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        rel = os.path.relpath(dirpath, directory).replace(os.sep, '/')
+        for name in sorted(filenames):
+            found.append(name if rel == '.' else f'{rel}/{name}')
+    return found
+
+
+def is_text(path):
+    return path.endswith(TEXT_EXTENSIONS)
+
+
+def rewriter(mapping):
+    """Function replacing every /old URL in a text with its new URL, in one pass."""
+    if not mapping:
+        return lambda text: (text, 0)
+    pattern = re.compile('(?<=[\\s"\'(,=])(%s)(?=[\\s"\'),?#<>]|$)'
+                         % '|'.join(re.escape(url) for url in sorted(mapping, key=len, reverse=True)))
+
+    def rewrite(text):
+        return pattern.subn(lambda m: mapping[m.group(1)], text)
+    return rewrite
+
+
+class Asset:
+    def __init__(self, path, data):
+        self.path = path
+        self.data = data
+        self.refs = set()  # asset paths this (text) file references
+        self.referenced = False
+        self.absolute = False  # referenced by full site URL somewhere
+        self.digest = None
+        self.rewritten = False
+
+    @property
+    def url(self):
+        return '/' + self.path
+
+
+def plan(directory):
+    """Read dist once; returns (assets by path, text of every HTML/CSS/JS file by path)."""
+    files = walk(directory)
+    assets = {}
+    texts = {}
+    for path in files:
+        if SKIP.search(path):
+            continue
+        with open(os.path.join(directory, path), 'rb') as f:
+            data = f.read()
+        if is_text(path):
+            texts[path] = data.decode('utf-8', 'replace')
+        if not path.endswith('.html'):
+            assets[path] = Asset(path, data)
+
+    for path, text in texts.items():
+        for url in set(REFERENCE.findall(text)):
+            target = assets.get(url[1:])
+            if target is not None and target.path != path:
+                target.referenced = True
+                if path in assets:
+                    assets[path].refs.add(target.path)
+        for url in ABSOLUTE.findall(text):
+            if url in assets:
+                assets[url].absolute = True
+    return assets, texts
+
+
+def resolve(assets, texts):
+    """Hash assets dependencies-first and group identical ones.
+
+    Returns (url mapping, groups as digest -> [canonical, *duplicates]). Text
+    assets are rewritten with the mapping of the files they reference before
+    they are hashed themselves.
+    """
+    mapping = {}
+    groups = {}
+    pending = sorted(assets)
+    while pending:
+        ready = [p for p in pending if all(assets[d].digest is not None for d in assets[p].refs)]
+        if not ready:  # reference cycle: hash the rest as they are
+            ready = pending
+        for path in ready:
+            asset = assets[path]
+            if asset.refs:
+                texts[path], count = rewriter(mapping)(texts[path])
+                asset.data = texts[path].encode()
+                asset.rewritten = count > 0
+            asset.digest = file_hash(asset.data)
+        level = {}
+        for path in ready:
+            level.setdefault(assets[path].digest, []).append(assets[path])
+        for digest, members in level.items():
+            # A group found at an earlier level keeps its canonical copy
+            groups.setdefault(digest, []).extend(sorted(members, key=_preference))
+        for digest in level:
+            members = groups[digest]
+            target = target_path(members)
+            for asset in members:
+                if asset.referenced and asset.path != target:
+                    mapping[asset.url] = '/' + target
+        pending = [p for p in pending if p not in ready]
+    return mapping, groups
+
+
+def _preference(asset):
+    return (bool(JUNK.search(asset.path)), not asset.referenced, len(asset.path), asset.path)
+
+
+def target_path(members):
+    """Where a group of identical files ends up: the canonical copy, fingerprinted if the site uses it."""
+    best = members[0]
+    # Already content-addressed, unless we just changed the content under that name
+    if FINGERPRINTED.search(best.path) and not best.rewritten or not any(a.referenced for a in members):
+        return best.path
+    return fingerprinted_name(best.path, best.digest)
+
+
+def keeps_name(asset):
+    return os.path.basename(asset.path) in KEEP_NAMES or asset.absolute
+
+
+def apply(directory, assets, texts, mapping, groups, dry_run=False):
+    """Write fingerprinted files, drop duplicates and rewrite references in pages."""
+    written = []
+    removed = []
+    for digest, members in sorted(groups.items(), key=lambda item: item[1][0].path):
+        best = members[0]
+        target = target_path(members)
+        if target != best.path:
+            written.append((best.path, target))
+            if not dry_run:
+                with open(os.path.join(directory, target), 'wb') as f:
+                    f.write(best.data)
+        for asset in members:
+            if asset.path == target:
+                if asset.refs and not dry_run:
+                    with open(os.path.join(directory, asset.path), 'wb') as f:
+                        f.write(asset.data)
+                continue
+            if keeps_name(asset):
+                if asset.refs and not dry_run:
+                    with open(os.path.join(directory, asset.path), 'wb') as f:
+                        f.write(asset.data)
+                continue
+            if asset is not best:
+                removed.append((asset.path, best.path))
+            if not dry_run:
+                os.remove(os.path.join(directory, asset.path))
+
+    rewrite = rewriter(mapping)
+    rewritten = 0
+    references = 0
+    for path, text in texts.items():
+        if path in assets:
+            continue  # rewritten before hashing
+        new, count = rewrite(text)
+        if count:
+            rewritten += 1
+            references += count
+            if not dry_run:
+                with open(os.path.join(directory, path), 'w') as f:
+                    f.write(new)
+    return written, removed, rewritten, references
+
+
+def update_headers(root=ROOT, dry_run=False):
+    """Make vercel.json carry HEADERS; returns True if it had to change."""
+    path = os.path.join(root, VERCEL_CONFIG)
+    with open(path, 'r') as f:
+        config = json.load(f)
+    ours = {rule['source'] for rule in HEADERS}
+    others = [rule for rule in config.get('headers', []) if rule.get('source') not in ours]
+    headers = others + HEADERS
+    if config.get('headers') == headers:
+        return False
+    config['headers'] = headers
+    if not dry_run:
+        with open(path + '.tmp', 'w') as f:
+            json.dump(config, f, indent=2)
+            f.write('\n')
+        os.replace(path + '.tmp', path)
+    return True
+
+
+def fingerprint(directory, dry_run=False):
+    assets, texts = plan(directory)
+    mapping, groups = resolve(assets, texts)
+    written, removed, rewritten, references = apply(directory, assets, texts, mapping, groups, dry_run)
+    if not dry_run:
+        # Keep what earlier runs renamed, so rerunning on the same dist is harmless
+        path = os.path.join(directory, MANIFEST)
+        try:
+            with open(path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        manifest = {url: mapping.get(new, new) for url, new in manifest.items()}
+        manifest.update(mapping)
+        with open(path, 'w') as f:
+            json.dump(dict(sorted(manifest.items())), f, indent=2)
+            f.write('\n')
+    return assets, written, removed, rewritten, references
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.assets', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default='dist', help='build output to fingerprint (default: dist)')
+    parser.add_argument('--dry-run', action='store_true', help="report what would change, don't write")
+    args = parser.parse_args(argv)
+
+    directory = os.path.join(ROOT, args.dir)
+    if not os.path.isdir(directory):
+        print(f'✗ {args.dir}/ not found (run npm run build first)')
+        return 1
+    assets, written, removed, rewritten, references = fingerprint(directory, args.dry_run)
+    for old, new in written:
+        print(f'✓ {old} -> {new}')
+    for path, kept in removed:
+        print(f'  duplicate  {path}  (same bytes as {kept})')
+    saved = sum(len(assets[path].data) for path, _ in removed)
+    print(f"\n{len(assets)} assets: {len(written)} fingerprinted, {len(removed)} duplicates removed ({saved} bytes), "
+          f"{references} references rewritten in {rewritten} files" + (' (dry run)' if args.dry_run else ''))
+    if update_headers(dry_run=args.dry_run):
+        print(f'✓ {VERCEL_CONFIG} Cache-Control headers updated' + (' (dry run)' if args.dry_run else ''))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Benchmark the page transforms on a synthetic corpus.
+
+The corpus is built from the real site markup: the <head> of
+blog/index.html, the old simple footer, partials/navbar.html and the @marker
+sections of the homepage as it was before the cleanups (index.html.bak,
+so the blurs and section gradients are still there to remove), shuffled
+and cycled until each page reaches the requested size. The first copy of
+a section keeps its marker name, so scoped rules match it; later copies
+get unique names so the section index sees every one. Every benchmark
+runs in a fresh worker process so its peak RSS is its own, and the run
+fails if a benchmark's transform changes no page, since it then timed a
+no-op.
+
+    python3 -m transforms.bench                              # 200 pages x ~100 KB
+    python3 -m transforms.bench --pages 2000 --size 50 --repeat 3
+    python3 -m transforms.bench --compare bench-results/previous.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from . import TRANSFORMS
+from .engine import ROOT, Page
+from .includes import PARTIALS_DIR, render_partial
+from .rules import PRE_CLEANUP
+from .sections import MARKER_COMMENT, SectionIndex
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RESULTS_DIR = os.path.join(ROOT, 'bench-results')
+
+# The footer full-footer replaces, as it looked on the subpages
+SIMPLE_FOOTER = '''<footer class="py-8 border-t border-white/10" style="background: #0a171e;">
+        <div class="max-w-7xl mx-auto px-6 text-center text-white/50 text-sm">© 2026 Perioskoup. All rights reserved.</div>
+    </footer>'''
+
+
+def reverse_sections(content, page):
+    index = SectionIndex(content)
+    return index.layout().reorder(index.names[::-1]).render()
+
+
+# Benchmark name -> transform function(content, page)
+BENCHMARKS = {
+    'navbar-sync': TRANSFORMS['sync-navbar'].func,
+    'footer-swap': TRANSFORMS['full-footer'].func,
+    'gradient': TRANSFORMS['body-gradient'].func,
+    'blur-removal': TRANSFORMS['remove-blurs'].func,
+    'section-reorder': reverse_sections,
+}
+
+
+def _read(path):
+    with open(os.path.join(ROOT, path), 'r') as f:
+        return f.read()
+
+
+def generate_corpus(root, pages=200, size_kb=100, seed=0):
+    """Write `pages` synthetic pages of roughly size_kb each under root/blog/, with partials/."""
+    rng = random.Random(seed)
+    blog = _read('blog/index.html')
+    head = blog[:blog.index('<body')]
+    body_tag = re.search(r'<body[^>]*>', blog).group(0)
+    index = SectionIndex(_read(PRE_CLEANUP['index.html']))
+    sections = [index[name] for name in index.names if name != 'footer']
+
+    os.makedirs(os.path.join(root, 'blog'), exist_ok=True)
+    # Transforms that render partials resolve them against the page root
+    shutil.copytree(os.path.join(ROOT, PARTIALS_DIR), os.path.join(root, PARTIALS_DIR), dirs_exist_ok=True)
+    paths = []
+    for n in range(pages):
+        parts = [head, body_tag, '\n', render_partial('navbar', {'anchor_prefix': '/'}), '\n']
+        size = sum(map(len, parts))
+        order = sections[:]
+        rng.shuffle(order)
+        i = 0
+        while size < size_kb * 1024:
+            section = order[i % len(order)]
+            if i >= len(order):
+                # Unique marker names so the section index sees every copy
+                section = MARKER_COMMENT.sub(lambda m: f'<!-- @{m.group(1)}-{i} -->', section, count=1)
+            parts.append(section)
+            size += len(section)
+            i += 1
+        parts += ['\n    ', SIMPLE_FOOTER, '\n</body>\n</html>\n']
+        path = f'blog/bench-{n:05d}.html'
+        with open(os.path.join(root, path), 'w') as f:
+            f.write(''.join(parts))
+        paths.append(path)
+    return paths
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # bytes on macOS
+
+
+def run_benchmark(name, root, paths, repeat=1):
+    """Time one benchmark over the corpus (called in a fresh worker process)."""
+    func = BENCHMARKS[name]
+    pages = [Page.load(path, root) for path in paths]
+    total_bytes = sum(len(p.original.encode()) for p in pages)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        changed = 0
+        for page in pages:
+            changed += func(page.original, page) != page.original
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        'seconds': round(best, 6),
+        'pages_per_s': round(len(pages) / best, 1) if best else None,
+        'mb_per_s': round(total_bytes / 1e6 / best, 2) if best else None,
+        'pages_changed': changed,
+        'peak_rss_kb': _peak_rss_kb(),
+    }
+
+
+def compare(results, previous, max_slowdown):
+    """Print per-benchmark ratios; return names slower than max_slowdown."""
+    regressions = []
+    for name, result in results['results'].items():
+        before = previous.get('results', {}).get(name)
+        if not before or not before['seconds']:
+            continue
+        ratio = result['seconds'] / before['seconds']
+        flag = ''
+        if ratio > max_slowdown:
+            flag = '  ✗ REGRESSION'
+            regressions.append(name)
+        print(f'  {name:16} {before["seconds"]:9.4f}s -> {result["seconds"]:9.4f}s  ({ratio:.2f}x){flag}')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.bench', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=200, help='number of synthetic pages')
+    parser.add_argument('--size', type=int, default=100, help='approximate page size in KB')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help='report the best of N runs')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='run only these benchmarks')
+    parser.add_argument('-o', '--output', help=f'results file (default: {os.path.relpath(RESULTS_DIR)}/<timestamp>.json)')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    parser.add_argument('--max-slowdown', type=float, default=2.0,
+                        help='with --compare, exit 1 if any benchmark is this many times slower')
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix='transform-bench-')
+    try:
+        paths = generate_corpus(tmp, args.pages, args.size, args.seed)
+        corpus_bytes = sum(os.path.getsize(os.path.join(tmp, p)) for p in paths)
+        print(f'Corpus: {len(paths)} pages, {corpus_bytes / 1e6:.1f} MB\n')
+
+        results = {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'corpus': {'pages': len(paths), 'size_kb': args.size, 'seed': args.seed, 'bytes': corpus_bytes},
+            'results': {},
+        }
+        no_ops = []
+        for name in args.only or BENCHMARKS:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(run_benchmark, name, tmp, paths, args.repeat).result()
+            results['results'][name] = result
+            rss = f"{result['peak_rss_kb'] / 1024:7.1f} MB RSS" if result['peak_rss_kb'] else ''
+            print(f"  {name:16} {result['seconds']:9.4f}s  {result['pages_per_s']:>9} pages/s  "
+                  f"{result['mb_per_s']:>8} MB/s  {rss}")
+            if not result['pages_changed']:
+                print(f'  ✗ {name} changed none of the {len(paths)} pages, so it timed a no-op')
+                no_ops.append(name)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+    print(f'\n✓ Saved {output}')
+    if no_ops:
+        return 1
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            previous = json.load(f)
+        print(f'\nCompared to {args.compare}:')
+        if compare(results, previous, args.max_slowdown):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,500 @@
+"""
+Blog generator: Markdown posts in content/blog/ -> blog/*.html.
+
+Every post is a Markdown file with front matter:
+
+    ---
+    title: How Patient Compliance Apps Transform Dental Practice Results
+    description: Meta description (also the card excerpt unless excerpt is set)
+    date: 2025-12-14
+    category: Patient Engagement
+    keywords: [patient compliance app, dental compliance software]
+    icon: solar:chart-2-bold-duotone      # listing card icon
+    accent: lime                          # lime | neutral
+    related: [best-ai-dental-companion-2025, dental-practice-ai-assistant-guide]
+    ---
+
+    Markdown body...
+
+Posts are rendered into partials/blog-post.html (the existing article shell)
+as blog/<slug>.html. A file with a `page:` key and no body describes a
+hand-written page (page: blog/<slug>.html) that is only listed. The listing
+is paginated into blog/index.html, blog/page-2.html, ... from
+partials/blog-index.html, and every blog page is written to vite.inputs.json,
+which vite.config.js reads as build inputs.
+
+Builds are incremental: .blog-cache.json records, per output, a hash of its
+inputs (the post source, the related posts' card data, the listing) and of
+every partial it was rendered from. Only outputs whose inputs changed are
+rebuilt, posts in a process pool with --jobs.
+
+    python3 -m transforms.blog
+    python3 -m transforms.blog --jobs 0      # one worker process per CPU
+    python3 -m transforms.blog --force --dry-run
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from . import cache, md
+from .engine import ROOT, Page
+from .includes import render_partial
+from .seo import SITE_URL, canonical_url
+
+CONTENT_DIR = 'content/blog'
+OUTPUT_DIR = 'blog'
+CACHE_FILE = '.blog-cache.json'
+VITE_INPUTS = 'vite.inputs.json'
+POSTS_PER_PAGE = 12
+WORDS_PER_MINUTE = 200
+DEFAULT_IMAGE = f'{SITE_URL}/og-image.png'
+DEFAULT_ICON = 'solar:notebook-bold-duotone'
+DEFAULT_CATEGORY = 'Insights'
+
+# Listing card colours (front matter `accent`)
+ACCENTS = {
+    'lime': {
+        'gradient': 'from-lime-500/20 to-lime-600/10',
+        'icon_class': 'text-lime-500/50',
+        'tag_class': 'bg-lime-500/20 text-lime-400',
+    },
+    'neutral': {
+        'gradient': 'from-white/10 to-lime-500/10',
+        'icon_class': 'text-white/30',
+        'tag_class': 'bg-white/10 text-white/80',
+    },
+}
+
+FRONT_MATTER = re.compile(r'\A---[ \t]*\n(.*?)\n---[ \t]*(?:\n|\Z)', re.DOTALL)
+FIELD = re.compile(r'^([\w-]+)\s*:\s*(.*?)\s*$')
+TAGS = re.compile(r'<[^>]+>')
+ARTICLE = re.compile(r'<article\b.*?</article>', re.DOTALL)
+
+TOC = '''
+    <!-- Table of Contents -->
+    <aside class="py-8 bg-nebula/5 border-b border-white/10">
+        <div class="max-w-4xl mx-auto px-6">
+            <h2 class="text-sm font-semibold text-white/50 uppercase tracking-wider mb-4">Table of Contents</h2>
+            <ol class="space-y-2 text-sm">
+{items}
+            </ol>
+        </div>
+    </aside>
+'''
+TOC_ITEM = '                <li><a href="#{id}" class="text-white/60 hover:text-mint transition-colors">{text}</a></li>'
+
+RELATED = '''
+    <!-- Related Posts -->
+    <section class="py-16 bg-nebula/5 border-t border-white/10">
+        <div class="max-w-4xl mx-auto px-6">
+            <h2 class="text-2xl font-bold mb-8">Related Articles</h2>
+            <div class="grid md:grid-cols-2 gap-6">
+{items}
+            </div>
+        </div>
+    </section>
+'''
+
+PAGINATION = '''
+            <nav aria-label="Blog pages" class="flex items-center justify-center gap-2 mt-12 text-sm">
+{items}
+            </nav>'''
+PAGE_LINK = '                <a href="{href}" class="px-4 py-2 rounded-full border border-white/10 text-white/60 hover:text-lime-400 transition-colors"{rel}>{label}</a>'
+CURRENT_PAGE = '                <span class="px-4 py-2 rounded-full bg-lime-600 text-white font-semibold" aria-current="page">{label}</span>'
+
+
+def escape(text):
+    """Escape text for element content and double-quoted attributes."""
+    return html.escape(str(text), quote=False).replace('"', '&quot;')
+
+
+def parse_value(raw):
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in '"\'':
+        return raw[1:-1]
+    if raw.startswith('[') and raw.endswith(']'):
+        return [parse_value(item.strip()) for item in raw[1:-1].split(',') if item.strip()]
+    if raw in ('true', 'false'):
+        return raw == 'true'
+    if raw.isdigit():
+        return int(raw)
+    return raw
+
+
+def strip_comment(raw):
+    """raw without a trailing ' # comment'; a # inside a quoted value or list item is kept."""
+    quote = None
+    opens = True  # at the start of a value or list item, where a quote can open
+    for i, ch in enumerate(raw):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '"\'' and opens:
+            quote = ch
+        elif ch == '#' and i and raw[i - 1] in ' \t':
+            return raw[:i]
+        if not ch.isspace():
+            opens = ch in '[,'
+    return raw
+
+
+def parse_front_matter(text, path='<post>'):
+    """Split text into (front matter dict, Markdown body)."""
+    m = FRONT_MATTER.match(text)
+    if not m:
+        raise ValueError(f'{path}: missing --- front matter ---')
+    meta = {}
+    for n, line in enumerate(m.group(1).splitlines(), 2):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        field = FIELD.match(line)
+        if not field:
+            raise ValueError(f'{path}:{n}: expected "key: value", got {line.strip()!r}')
+        meta[field.group(1)] = parse_value(strip_comment(field.group(2)).strip())
+    return meta, text[m.end():]
+
+
+def read_minutes(text):
+    return max(1, round(len(TAGS.sub(' ', text).split()) / WORDS_PER_MINUTE))
+
+
+class Post:
+    """Front matter of one source file plus everything the listing needs."""
+
+    def __init__(self, source, text, root=ROOT):
+        self.source = source
+        self.hash = cache.content_hash(text)
+        meta, body = parse_front_matter(text, source)
+        for field in ('title', 'date'):
+            if field not in meta:
+                raise ValueError(f'{source}: missing front matter field: {field}')
+        self.meta = meta
+        self.body = body
+        self.slug = meta.get('slug') or os.path.splitext(os.path.basename(source))[0]
+        self.date = date.fromisoformat(str(meta['date']))
+        self.page = meta.get('page')  # hand-written page, listed only
+        self.path = self.page or f'{OUTPUT_DIR}/{self.slug}.html'
+        if self.page:
+            try:
+                with open(os.path.join(root, self.page), 'r') as f:
+                    page_html = f.read()
+            except OSError:
+                raise ValueError(f'{source}: page not found: {self.page}') from None
+            article = ARTICLE.search(page_html)
+            minutes = read_minutes(article.group(0) if article else page_html)
+        else:
+            minutes = read_minutes(body)
+        self.read_time = meta.get('read_time', minutes)
+
+    @classmethod
+    def load(cls, source, root=ROOT):
+        with open(os.path.join(root, source), 'r') as f:
+            return cls(source, f.read(), root)
+
+    @property
+    def href(self):
+        return f'/{self.path}'
+
+    def card(self):
+        """Escaped values for the listing and related-post partials."""
+        accent = ACCENTS.get(self.meta.get('accent', 'lime'), ACCENTS['lime'])
+        excerpt = self.meta.get('excerpt') or self.meta.get('description', '')
+        return {
+            'href': self.href,
+            'title': escape(self.meta['title']),
+            'excerpt': escape(excerpt),
+            'category': escape(self.meta.get('category', DEFAULT_CATEGORY)),
+            'icon': escape(self.meta.get('icon', DEFAULT_ICON)),
+            'read_time': str(self.read_time),
+            'month': f'{self.date:%B %Y}',
+            **accent,
+        }
+
+
+def load_posts(root=ROOT):
+    """Every post under content/blog/, newest first (ties by slug)."""
+    directory = os.path.join(root, CONTENT_DIR)
+    try:
+        names = sorted(n for n in os.listdir(directory) if n.endswith('.md'))
+    except FileNotFoundError:
+        names = []
+    posts = [Post.load(f'{CONTENT_DIR}/{name}', root) for name in names]
+    seen = {}
+    for post in posts:
+        if post.path in seen:
+            raise ValueError(f'{post.source} and {seen[post.path]} both write {post.path}')
+        seen[post.path] = post.source
+    posts.sort(key=lambda p: p.slug)
+    posts.sort(key=lambda p: p.date, reverse=True)
+    return posts
+
+
+def article_schema(meta, url, image):
+    schema = {
+        '@context': 'https://schema.org',
+        '@type': 'Article',
+        'headline': meta['title'],
+        'description': meta.get('description', ''),
+        'image': image,
+        'author': {'@type': 'Organization', 'name': 'Perioskoup'},
+        'publisher': {
+            '@type': 'Organization',
+            'name': 'Perioskoup',
+            'logo': {'@type': 'ImageObject', 'url': f'{SITE_URL}/logo.png'},
+        },
+        'datePublished': str(meta['date']),
+        'dateModified': str(meta.get('updated', meta['date'])),
+        'mainEntityOfPage': {'@type': 'WebPage', '@id': url},
+    }
+    keywords = meta.get('keywords')
+    if keywords:
+        schema['keywords'] = ', '.join(keywords) if isinstance(keywords, list) else keywords
+    text = json.dumps(schema, indent=4, ensure_ascii=False).replace('</', '<\\/')
+    return '\n'.join('    ' + line for line in text.splitlines())
+
+
+def render_post(source, related, root=ROOT):
+    """Render one Markdown post. related: card dicts of its related posts.
+
+    Returns (path, html, deps). Top-level so it can run in pool workers.
+    """
+    post = Post.load(source, root)
+    meta = post.meta
+    content, headings = md.render(post.body)
+    url = canonical_url(post.path, root)
+    image = meta.get('image', DEFAULT_IMAGE)
+    if image.startswith('/'):
+        image = SITE_URL + image
+    keywords = meta.get('keywords', '')
+    if isinstance(keywords, list):
+        keywords = ', '.join(keywords)
+
+    toc = ''
+    sections = [(slug, text) for level, slug, text in headings if level == 2]
+    if sections and meta.get('toc', True):
+        items = '\n'.join(TOC_ITEM.format(id=slug, text=TAGS.sub('', text)) for slug, text in sections)
+        toc = TOC.format(items=items)
+
+    page = Page(post.path, '', root)
+    related_html = ''
+    if related:
+        items = '\n'.join(render_partial('blog-related', card, root, page) for card in related)
+        related_html = RELATED.format(items=items)
+
+    d = post.date
+    params = {
+        'title': escape(meta['title']),
+        'description': escape(meta.get('description', '')),
+        'keywords': escape(keywords),
+        'url': url,
+        'image': escape(image),
+        'date': str(d),
+        'date_display': f'{d:%B} {d.day}, {d.year}',
+        'read_time': str(post.read_time),
+        'category': escape(meta.get('category', DEFAULT_CATEGORY)),
+        'breadcrumb': escape(meta.get('breadcrumb', meta['title'])),
+        'lead': escape(meta.get('lead', meta.get('description', ''))),
+        'schema': article_schema(meta, url, image),
+        'toc': toc,
+        'content': content,
+        'related': related_html,
+    }
+    return post.path, render_partial('blog-post', params, root, page) + '\n', sorted(page.deps)
+
+
+def listing_path(n):
+    return f'{OUTPUT_DIR}/index.html' if n == 1 else f'{OUTPUT_DIR}/page-{n}.html'
+
+
+def listing_plan(posts):
+    """[(page number, featured card or None, [cards])] for the listing pages."""
+    if not posts:
+        return [(1, None, [])]
+    featured = next((p for p in posts if p.meta.get('featured')), posts[0])
+    rest = [p.card() for p in posts if p is not featured]
+    pages = [rest[i:i + POSTS_PER_PAGE] for i in range(0, len(rest), POSTS_PER_PAGE)] or [[]]
+    return [(n, featured.card() if n == 1 else None, cards) for n, cards in enumerate(pages, 1)]
+
+
+def render_listing(n, total, featured, cards, root=ROOT):
+    path = listing_path(n)
+    page = Page(path, '', root)
+    links = []
+    head_links = ''
+    if total > 1:
+        for i in range(1, total + 1):
+            href = '/' + listing_path(i).replace('index.html', '')
+            if i == n:
+                links.append(CURRENT_PAGE.format(label=i))
+            else:
+                rel = ' rel="prev"' if i == n - 1 else ' rel="next"' if i == n + 1 else ''
+                links.append(PAGE_LINK.format(href=href, rel=rel, label=i))
+            if i in (n - 1, n + 1):
+                rel = 'prev' if i < n else 'next'
+                head_links += f'\n    <link rel="{rel}" href="{canonical_url(listing_path(i), root)}">'
+    params = {
+        'title': ('Blog | Perioskoup AI Dental Companion - Insights for Modern Dentistry' if n == 1
+                  else f'Blog - Page {n} | Perioskoup AI Dental Companion'),
+        'url': canonical_url(path, root),
+        'head_links': head_links,
+        'featured': render_partial('blog-featured', featured, root, page) if featured else '',
+        'heading': 'Latest Articles' if n == 1 else f'Articles - Page {n}',
+        'cards': '\n\n'.join(render_partial('blog-card', card, root, page) for card in cards),
+        'pagination': PAGINATION.format(items='\n'.join(links)) if links else '',
+    }
+    return path, render_partial('blog-index', params, root, page) + '\n', sorted(page.deps)
+
+
+def vite_inputs(posts, pages):
+    """Rollup input name -> path for every blog page."""
+    inputs = {'blog': listing_path(1)}
+    for n in range(2, pages + 1):
+        inputs[f'blog-page-{n}'] = listing_path(n)
+    for post in sorted(posts, key=lambda p: p.slug):
+        inputs[f'blog-{post.slug}'] = post.path
+    return inputs
+
+
+def generator_hash():
+    """Changes whenever this module or the Markdown renderer changes."""
+    h = hashlib.sha256()
+    for module in (sys.modules[__name__], md):
+        with open(module.__file__, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _key(*parts):
+    return cache.content_hash(json.dumps(parts, sort_keys=True, default=str))
+
+
+def load_manifest(root):
+    try:
+        with open(os.path.join(root, CACHE_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(root, manifest):
+    path = os.path.join(root, CACHE_FILE)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def build(root=ROOT, jobs=1, force=False, dry_run=False, verbose=True):
+    """Rebuild stale blog pages; returns {'built': [...], 'cached': [...], 'removed': [...]}."""
+    posts = load_posts(root)
+    by_slug = {p.slug: p for p in posts}
+    manifest = load_manifest(root)
+    generator = generator_hash()
+    previous = manifest.get('outputs', {}) if manifest.get('generator') == generator and not force else {}
+    hashes = cache.FileHashes(root)
+
+    def fresh(path, key):
+        entry = previous.get(path)
+        return (entry is not None and entry['key'] == key
+                and os.path.exists(os.path.join(root, path))
+                and all(hashes[dep] == sha for dep, sha in entry['deps'].items()))
+
+    # Outputs this run is responsible for: path -> (key, job)
+    wanted = {}
+    for post in posts:
+        if post.page:
+            continue
+        related = []
+        for slug in post.meta.get('related', []):
+            if slug not in by_slug:
+                raise ValueError(f'{post.source}: unknown related post: {slug}')
+            related.append(by_slug[slug].card())
+        wanted[post.path] = (_key(post.hash, related), (render_post, post.source, related))
+    plan = listing_plan(posts)
+    for n, featured, cards in plan:
+        wanted[listing_path(n)] = (_key(n, len(plan), featured, cards),
+                                   (render_listing, n, len(plan), featured, cards))
+
+    stale = [path for path, (key, _) in wanted.items() if not fresh(path, key)]
+    results = {'built': [], 'cached': sorted(set(wanted) - set(stale)), 'removed': []}
+    outputs = {path: previous[path] for path in results['cached']}
+
+    def jobs_for(paths):
+        return [wanted[path][1] for path in paths]
+
+    if jobs != 1 and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=jobs or None) as pool:
+            futures = [pool.submit(func, *args, root=root) for func, *args in jobs_for(stale)]
+            rendered = [future.result() for future in futures]
+    else:
+        rendered = [func(*args, root=root) for func, *args in jobs_for(stale)]
+
+    for path, content, deps in rendered:
+        if not dry_run:
+            full = os.path.join(root, path)
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, 'w') as f:
+                f.write(content)
+        outputs[path] = {
+            'key': wanted[path][0],
+            'hash': cache.content_hash(content),
+            'deps': {dep: hashes[dep] for dep in deps},
+        }
+        results['built'].append(path)
+
+    # Generated pages whose post (or listing page) no longer exists
+    for path in sorted(set(manifest.get('outputs', {})) - set(wanted)):
+        if not dry_run and os.path.exists(os.path.join(root, path)):
+            os.remove(os.path.join(root, path))
+        results['removed'].append(path)
+
+    inputs = json.dumps(vite_inputs(posts, len(plan)), indent=2) + '\n'
+    inputs_path = os.path.join(root, VITE_INPUTS)
+    try:
+        with open(inputs_path, 'r') as f:
+            inputs_changed = f.read() != inputs
+    except OSError:
+        inputs_changed = True
+    if not dry_run:
+        if inputs_changed:
+            with open(inputs_path, 'w') as f:
+                f.write(inputs)
+        save_manifest(root, {'generator': generator, 'outputs': outputs})
+
+    if verbose:
+        for path in sorted(results['built']):
+            print(f'✓ built    {path}')
+        for path in results['removed']:
+            print(f'✓ removed  {path}')
+        if inputs_changed:
+            print(f'✓ updated  {VITE_INPUTS}')
+        print(f"\n{len(posts)} posts, {len(plan)} listing pages: {len(results['built'])} built, "
+              f"{len(results['cached'])} cached, {len(results['removed'])} removed")
+        if dry_run:
+            print('(dry run, nothing written)')
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.blog', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='worker processes for rendering posts (0 = one per CPU)')
+    parser.add_argument('--force', action='store_true', help=f'ignore {CACHE_FILE} and rebuild everything')
+    parser.add_argument('--dry-run', action='store_true', help='render but do not write anything')
+    args = parser.parse_args(argv)
+    try:
+        build(jobs=args.jobs, force=args.force, dry_run=args.dry_run)
+    except ValueError as e:
+        print(f'✗ {e}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Transforms that copy shared chrome from blog/index.html (the source of truth).
+
+sync-from-blog  -- navbar, nav-scrolled style, body class and scroll script
+update-pages    -- navbar, footer and scroll script plus the old theme fixups
+
+blog/index.html only has a placeholder that navbar-init.js fills, so the
+navbar itself comes from partials/navbar.html, as in sync-navbar.
+"""
+import os
+import re
+from functools import lru_cache
+
+from .includes import render_partial
+from .locator import line_span, locate, splice
+from .navbar import navbar_removals
+from .registry import transform
+
+SOURCE_PAGE = 'blog/index.html'
+
+DEFAULT_NAV_STYLE = 'nav.nav-scrolled { background-color: rgba(18, 34, 45, 0.95); backdrop-filter: blur(20px); }'
+DEFAULT_BODY_CLASS = 'text-white min-h-screen font-sans'
+UPDATE_PAGES_BODY_STYLE = 'background: linear-gradient(180deg, #234966 0%, #12222d 50%, #0a171e 100%);'
+STYLE_ATTR = re.compile(r'\bstyle="([^"]*)"')
+# Bare bg-white / bg-rice classes only; bg-white/5 (what they become) and bg-rice-50 are left alone
+OLD_CARD_BG = re.compile(r'\b(bg-white|bg-rice)(?![\w/-])')
+
+# Scroll script
+SCROLL_SCRIPT = '''
+    <script>
+        // Navbar scroll effect
+        window.addEventListener('scroll', () => {
+            document.getElementById('navbar').classList.toggle('nav-scrolled', window.scrollY > 50);
+        });
+    </script>'''
+
+# Pages to update: (path, use_root_anchors); the homepage uses # not /#
+SYNC_FROM_BLOG_PAGES = [
+    ('index.html', False),
+    ('calculator.html', True),
+    ('contact.html', True),
+    ('signup.html', True),
+    ('privacy.html', True),
+    ('terms.html', True),
+    ('periochamp.html', True),
+]
+
+UPDATE_PAGES = [
+    'calculator.html',
+    'privacy.html',
+    'terms.html',
+    'periochamp.html',
+    'signup.html',
+    'blog/best-ai-dental-companion-2025.html',
+    'blog/dental-practice-ai-assistant-guide.html',
+    'blog/patient-compliance-dental-apps.html',
+]
+
+
+def source_chrome(root):
+    """Footer, scroll script, nav style and body class of blog/index.html
+    under root (re-read only when the file changes)."""
+    path = os.path.join(root, SOURCE_PAGE)
+    st = os.stat(path)
+    return _source_chrome(path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=16)
+def _source_chrome(path, mtime_ns, size):
+    with open(path, 'r') as f:
+        html = f.read()
+    doc = locate(html)
+
+    chrome = {'footer': '', 'navbar_script': ''}
+    footer = doc.find('footer')
+    if footer:
+        chrome['footer'] = doc.text(footer)
+    for script in doc.find_all('script'):
+        if '// Navbar scroll effect' in doc.inner(script):
+            chrome['navbar_script'] = doc.text(script)
+            break
+    style = re.search(r'(nav\.nav-scrolled \{[^}]+\})', html)
+    chrome['nav_style'] = style.group(1) if style else DEFAULT_NAV_STYLE
+    body = doc.find('body')
+    chrome['body_class'] = body.attrs.get('class') if body and body.attrs.get('class') else DEFAULT_BODY_CLASS
+    return chrome
+
+
+@transform('sync-from-blog', pages=[path for path, _ in SYNC_FROM_BLOG_PAGES], sources=[SOURCE_PAGE])
+def sync_from_blog(content, page):
+    chrome = source_chrome(page.root)
+    # Homepage: #anchor instead of /#anchor
+    prefix = '/' if dict(SYNC_FROM_BLOG_PAGES)[page.path] else ''
+    navbar = render_partial('navbar', {'anchor_prefix': prefix}, page.root, page)
+
+    doc = locate(content)
+    # Remove existing navbar (and orphaned mobile menus)
+    edits = navbar_removals(doc)
+
+    # Add nav-scrolled style if not present
+    head = doc.find('head')
+    if head and 'nav.nav-scrolled' not in content:
+        edits.append((head.inner_end, head.inner_end, f'    <style>\n        {chrome["nav_style"]}\n    </style>\n'))
+
+    body = doc.find('body')
+    if body:
+        # Update body class, insert navbar after <body...>
+        tag = content[body.start:body.inner_start]
+        tag = re.sub(r'class="[^"]*"', lambda m: f'class="{chrome["body_class"]}"', tag, count=1)
+        edits.append((body.start, body.inner_start, tag))
+        edits.append((body.inner_start, body.inner_start, '\n\n' + navbar + '\n'))
+
+        # Add scroll script if not present
+        if 'Navbar scroll effect' not in content:
+            edits.append((body.inner_end, body.inner_end, f'{SCROLL_SCRIPT}\n'))
+    return splice(content, edits)
+
+
+@transform('update-pages', pages=UPDATE_PAGES, sources=[SOURCE_PAGE])
+def update_pages(content, page):
+    chrome = source_chrome(page.root)
+    navbar = render_partial('navbar', {'anchor_prefix': '/'}, page.root, page)
+
+    doc = locate(content)
+    # Remove existing navbar, footer and scroll script
+    edits = navbar_removals(doc)
+    chrome_elements = doc.find_all('footer') + [el for el in doc.find_all('script')
+                                                if '// Navbar scroll effect' in doc.inner(el)]
+    # Blank lines around them go too, so reruns don't pile up empty lines;
+    # the footer and script usually share theirs, hence the merge
+    spans = []
+    for start, end in sorted(line_span(content, el.start, el.end, blank_lines=True) for el in chrome_elements):
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(end, spans[-1][1]))
+        else:
+            spans.append((start, end))
+    edits += [(start, end, '') for start, end in spans]
+
+    body = doc.find('body')
+    if body:
+        # Add gradient background to body, new navbar after it, new footer before </body>
+        tag = content[body.start:body.inner_start]
+        if UPDATE_PAGES_BODY_STYLE not in tag:
+            if STYLE_ATTR.search(tag):
+                tag = STYLE_ATTR.sub(lambda m: f'style="{UPDATE_PAGES_BODY_STYLE} {m.group(1)}"', tag, count=1)
+            else:
+                tag = f'{tag[:-1]} style="{UPDATE_PAGES_BODY_STYLE}">'
+            edits.append((body.start, body.inner_start, tag))
+        edits.append((body.inner_start, body.inner_start, '\n' + navbar))
+        edits.append((body.inner_end, body.inner_end, f'{chrome["footer"]}\n\n{chrome["navbar_script"]}\n\n'))
+    content = splice(content, edits)
+
+    # Old theme: text-nebula -> text-white, bg-white/bg-rice -> glass card
+    content = re.sub(r'text-nebula(-/60)?', r'text-white\1', content)
+    content = OLD_CARD_BG.sub('bg-white/5 border-white/10', content)
+    return content
@@ -0,0 +1,27 @@
+"""
+remove-blurs -- drop the large decorative blur circles from the homepage.
+"""
+from .registry import transform
+from .rules import Rule, apply_rules
+
+# Remove the large decorative blur circles that cause weird backlights
+BLUR_RULES = [
+    Rule(r'<div class="absolute top-1/2 left-0 w-\[500px\][^>]+blur-\[120px\][^>]+pointer-events-none"></div>\n?',
+         scope='transformation', name='transformation blur (left)'),
+    Rule(r'<div class="absolute top-1/2 right-0 w-\[500px\][^>]+blur-\[120px\][^>]+pointer-events-none"></div>\n?',
+         scope='transformation', name='transformation blur (right)'),
+    Rule(r'<div class="absolute top-0 left-0 w-\[500px\][^>]+blur-3xl[^>]+pointer-events-none"></div>\n?',
+         scope='award', name='award blur (top left)'),
+    Rule(r'<div class="absolute bottom-0 right-0 w-\[400px\][^>]+blur-3xl[^>]+pointer-events-none"></div>\n?',
+         scope='award', name='award blur (bottom right)'),
+    Rule(r'<div class="absolute inset-0 bg-mint/20 blur-3xl rounded-full animate-pulse"></div>\n?',
+         scope='security', name='security pulse blur'),
+    # Small blur decorations in comparison cards
+    Rule(r'<div class="absolute top-0 right-0 w-32 h-32 bg-lime-400/5 rounded-full blur-2xl[^>]+></div>\n?',
+         name='comparison card blur'),
+]
+
+
+@transform('remove-blurs', pages=['index.html'])
+def remove_blurs(content, page):
+    return apply_rules(content, BLUR_RULES)
@@ -0,0 +1,207 @@
+"""
+Per-page weight budgets, checked from the files on disk.
+
+For every page (dist/ by default, --dir . for the source pages with
+public/) it totals:
+
+    html            bytes of the page itself
+    inline_script   bytes inside <script> elements without src (JSON-LD included)
+    inline_style    bytes inside <style> elements and style="" attributes
+    inline_svg      bytes of inline <svg> elements
+    assets          bytes of the local files the page loads (scripts,
+                    stylesheets, images, icons; each file counted once)
+    asset_count     number of those files
+    origins         third-party origins the page loads from (CDNs, fonts)
+
+and compares them with budgets.json: "default" budgets, overridden per page
+under "pages". Exits with status 1 if any page is over budget.
+
+Each run is appended as one JSON line to budget-history.jsonl (time, git
+commit, every page's totals), so weight can be charted over time;
+--no-history skips that.
+
+    npm run build && python3 -m transforms.budget
+    python3 -m transforms.budget --dir . --no-history
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from .engine import ROOT
+from .links import TAG, attributes
+from .seo import SITE_URL
+from .sitemap import walk_pages
+
+BUDGETS_FILE = 'budgets.json'
+HISTORY_FILE = 'budget-history.jsonl'
+PUBLIC_DIR = 'public'
+METRICS = ('html', 'inline_script', 'inline_style', 'inline_svg', 'assets', 'asset_count', 'origins')
+
+SCRIPT = re.compile(r'<script\b([^>]*)>(.*?)</script\s*>', re.DOTALL | re.IGNORECASE)
+STYLE = re.compile(r'<style\b[^>]*>(.*?)</style\s*>', re.DOTALL | re.IGNORECASE)
+STYLE_ATTR = re.compile(r'\sstyle\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+PICTURE = re.compile(r'<picture\b.*?</picture\s*>', re.DOTALL | re.IGNORECASE)
+SVG = re.compile(r'<svg\b.*?</svg\s*>', re.DOTALL | re.IGNORECASE)
+# <link rel> values that load something
+LOADING_RELS = ('stylesheet', 'icon', 'shortcut icon', 'apple-touch-icon', 'preload', 'modulepreload', 'manifest',
+                'preconnect', 'dns-prefetch')
+LOADING_TAGS = ('link', 'script', 'img', 'source', 'iframe', 'video', 'audio')
+
+
+def load_budgets(root=ROOT):
+    try:
+        with open(os.path.join(root, BUDGETS_FILE), 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def budget_for(budgets, page):
+    limits = dict(budgets.get('default', {}))
+    limits.update(budgets.get('pages', {}).get(page, {}))
+    return limits
+
+
+def loaded_urls(html):
+    """URLs the page fetches (not <a> links), in order."""
+    urls = []
+    # In a <picture> with <source>s the browser loads one source, not the <img> fallback
+    pictures = [m.span() for m in PICTURE.finditer(html) if '<source' in m.group()]
+    for m in TAG.finditer(html):
+        tag = m.group(1).lower()
+        if tag not in LOADING_TAGS:
+            continue
+        if tag == 'img' and any(start < m.start() < end for start, end in pictures):
+            continue
+        attrs = attributes(m.group(2))
+        if tag == 'link':
+            if attrs.get('rel', '').lower() in LOADING_RELS and 'href' in attrs:
+                urls.append(attrs['href'])
+            continue
+        if 'src' in attrs:
+            urls.append(attrs['src'])
+        elif tag == 'source' and 'srcset' in attrs:
+            # The browser picks one candidate; count the first
+            urls.append(attrs['srcset'].split(',')[0].split()[0])
+    return [url.strip() for url in urls if url.strip()]
+
+
+def measure(directory, page, static_dirs):
+    """Totals for one page."""
+    path = os.path.join(directory, page)
+    with open(path, 'rb') as f:
+        data = f.read()
+    html = data.decode('utf-8', 'replace')
+    totals = dict.fromkeys(METRICS, 0)
+    totals['html'] = len(data)
+    for m in SCRIPT.finditer(html):
+        if not re.search(r'\ssrc\s*=', m.group(1)):
+            totals['inline_script'] += len(m.group(2).encode())
+    totals['inline_style'] = (sum(len(m.group(1).encode()) for m in STYLE.finditer(html))
+                              + sum(len((m.group(1) or m.group(2) or '').encode()) for m in STYLE_ATTR.finditer(html)))
+    totals['inline_svg'] = sum(len(m.group().encode()) for m in SVG.finditer(html))
+
+    site = urlsplit(SITE_URL).netloc
+    origins = set()
+    files = set()
+    for url in loaded_urls(html):
+        parts = urlsplit(url if not url.startswith('//') else 'https:' + url)
+        if parts.scheme in ('http', 'https') and parts.netloc not in (site, 'www.' + site):
+            origins.add(f'{parts.scheme}://{parts.netloc}')
+        elif not parts.scheme and parts.path:
+            rel = os.path.normpath(os.path.join(os.path.dirname(page), parts.path)) \
+                if not parts.path.startswith('/') else parts.path.lstrip('/')
+            files.add(rel)
+        elif parts.scheme in ('http', 'https'):
+            files.add(parts.path.lstrip('/'))
+    for rel in files:
+        for d in static_dirs:
+            full = os.path.join(d, rel)
+            if os.path.isfile(full):
+                totals['assets'] += os.path.getsize(full)
+                totals['asset_count'] += 1
+                break
+    totals['origins'] = len(origins)
+    return totals, sorted(origins)
+
+
+def git_commit(root=ROOT):
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def append_history(record, root=ROOT):
+    with open(os.path.join(root, HISTORY_FILE), 'a') as f:
+        f.write(json.dumps(record, sort_keys=True, separators=(',', ':')) + '\n')
+
+
+def size(metric, value):
+    if metric in ('asset_count', 'origins'):
+        return str(value)
+    return f'{value / 1024:.1f}K'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.budget', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default='dist', help='directory of pages to measure (default: dist; . for the source)')
+    parser.add_argument('--no-history', action='store_true', help=f'do not append this run to {HISTORY_FILE}')
+    parser.add_argument('--origins', action='store_true', help='list the third-party origins of each page')
+    args = parser.parse_args(argv)
+
+    directory = os.path.normpath(os.path.join(ROOT, args.dir))
+    if not os.path.isdir(directory):
+        print(f'✗ {args.dir}/ not found (run npm run build first, or pass --dir .)')
+        return 1
+    static_dirs = [directory] + ([os.path.join(ROOT, PUBLIC_DIR)] if directory == ROOT else [])
+    budgets = load_budgets()
+    if not budgets:
+        print(f'⚠️  no {BUDGETS_FILE}; measuring only')
+
+    results = {}
+    violations = []
+    width = 4
+    for page in walk_pages(directory):
+        totals, origins = measure(directory, page, static_dirs)
+        results[page] = totals
+        width = max(width, len(page))
+        for metric, limit in budget_for(budgets, page).items():
+            if totals.get(metric, 0) > limit:
+                violations.append((page, metric, totals[metric], limit))
+        if args.origins and origins:
+            print(f"  {page}: {', '.join(origins)}")
+
+    over = {(page, metric) for page, metric, _, _ in violations}
+    print(f"{'page':<{width}}  " + '  '.join(f'{metric:>13}' for metric in METRICS))
+    for page, totals in results.items():
+        cells = []
+        for metric in METRICS:
+            cell = size(metric, totals[metric]) + (' ✗' if (page, metric) in over else '  ')
+            cells.append(f'{cell:>13}')
+        print(f'{page:<{width}}  ' + '  '.join(cells))
+
+    for page, metric, value, limit in violations:
+        print(f'✗ {page}: {metric} {size(metric, value)} over budget {size(metric, limit)}')
+    if not args.no_history:
+        append_history({
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'dir': os.path.relpath(directory, ROOT).replace(os.sep, '/'),
+            'pages': results,
+            'violations': len(violations),
+        })
+    print(f'\n{len(results)} pages, {len(violations)} over budget'
+          + ('' if args.no_history else f' (appended to {HISTORY_FILE})'))
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
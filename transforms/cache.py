@@ -0,0 +1,158 @@
+"""
+Incremental cache for transform runs (.transform-cache.json).
+
+For every page and chain of transforms the manifest records the hash of the
+content the chain last left on disk and the fingerprint of each transform.
+Transforms can also record per-page dependencies (Page.depends_on, e.g. the
+partials a page includes); their hashes are stored with the entry. A rerun
+skips a page entirely when its content hash, the current fingerprints and
+its dependencies all match, so only pages whose inputs changed are touched.
+"""
+import ast
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import types
+
+CACHE_FILE = '.transform-cache.json'
+CACHE_VERSION = 1
+
+
+def content_hash(content):
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def fingerprint(transform, root):
+    """Hash of a transform's code, the module constants it uses, the
+    transforms.* modules its module imports and its source files.
+
+    Editing a template or pattern constant, a regex or the function body changes
+    the fingerprint; so does editing a helper it imports (locator, includes,
+    sections, ...), directly or through another helper, or a source page like
+    blog/index.html.
+    """
+    h = hashlib.sha256(transform.name.encode())
+    module = sys.modules[transform.func.__module__]
+    _hash_function(h, transform.func, module, set())
+    for name in sorted(_imported_modules(module.__name__) - {module.__name__}):
+        h.update(name.encode())
+        try:
+            with open(sys.modules[name].__file__, 'rb') as f:
+                h.update(f.read())
+        except (OSError, KeyError, TypeError):
+            h.update(b'<missing>')
+    for path in transform.sources:
+        try:
+            with open(os.path.join(root, path), 'rb') as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b'<missing>')
+    return h.hexdigest()[:16]
+
+
+def _hash_function(h, func, module, seen):
+    if func in seen:
+        return
+    seen.add(func)
+    try:
+        h.update(inspect.getsource(func).encode())
+    except (OSError, TypeError):
+        h.update(func.__code__.co_code)
+    for name in sorted(_global_names(func.__code__)):
+        value = getattr(module, name, None)
+        if isinstance(value, types.FunctionType) and value.__module__ == module.__name__:
+            _hash_function(h, value, module, seen)
+        elif name.isupper() and isinstance(value, (str, bytes, int, float, list, tuple, dict)):
+            h.update(f'{name}={value!r}'.encode())
+
+
+def _imported_modules(name, found=None):
+    """name and every transforms.* module it imports, directly or not.
+
+    Only module-level imports count: the ones inside functions are report
+    and command-line helpers that import the engine lazily.
+    """
+    found = set() if found is None else found
+    if name in found:
+        return found
+    found.add(name)
+    module = sys.modules.get(name)
+    try:
+        with open(module.__file__, 'rb') as f:
+            tree = ast.parse(f.read())
+    except (AttributeError, OSError, TypeError, SyntaxError):
+        return found
+    package = name if hasattr(module, '__path__') else name.rpartition('.')[0]
+    for node in _module_level(tree.body):
+        if isinstance(node, ast.Import):
+            targets = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = importlib.util.resolve_name('.' * node.level + (node.module or ''), package)
+            # `from . import locator` imports a module, `from .locator import locate` a name
+            targets = [f'{base}.{alias.name}' if f'{base}.{alias.name}' in sys.modules else base
+                       for alias in node.names]
+        else:
+            continue
+        for target in targets:
+            if target == 'transforms' or target.startswith('transforms.'):
+                _imported_modules(target, found)
+    return found
+
+
+def _module_level(body):
+    """Statements run on import, including those under a top-level if/try."""
+    for node in body:
+        yield node
+        if isinstance(node, (ast.If, ast.Try)):
+            yield from _module_level(node.body + node.orelse + getattr(node, 'finalbody', []))
+            for handler in getattr(node, 'handlers', []):
+                yield from _module_level(handler.body)
+
+
+def _global_names(code):
+    """Global names used by a code object, including nested lambdas/comprehensions."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+
+class FileHashes:
+    """Content hashes of files under root, each computed at most once per run."""
+
+    def __init__(self, root):
+        self.root = root
+        self.hashes = {}
+
+    def __getitem__(self, path):
+        if path not in self.hashes:
+            try:
+                with open(os.path.join(self.root, path), 'rb') as f:
+                    self.hashes[path] = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                self.hashes[path] = None
+        return self.hashes[path]
+
+
+def load(root):
+    try:
+        with open(os.path.join(root, CACHE_FILE), 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != CACHE_VERSION:
+        return {}
+    return manifest.get('pages', {})
+
+
+def save(root, pages):
+    path = os.path.join(root, CACHE_FILE)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'version': CACHE_VERSION, 'pages': pages}, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp, path)
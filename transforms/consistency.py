@@ -0,0 +1,227 @@
+"""
+Consistency check for the shared navbar, mobile menu and footer.
+
+Extracts nav#navbar, div#mobile-menu and the page footer from every page
+and normalizes each subtree: attributes sorted, class lists and text
+whitespace collapsed, comments dropped, and /#anchor links written as
+#anchor (sync-navbar gives index.html the bare # prefix on purpose).
+Pages with <div id="navbar-placeholder"> get their navbar at runtime; for
+those the markup is taken from the script that injects it (navbar-init.js
+or components/navbar.js, through main.js). The normalized subtrees are
+hashed; for each part the most common hash is the reference, and every
+page that differs gets a minimal diff against it.
+
+Runs offline over the source pages (or --dir dist) in milliseconds, so it
+can gate a deploy instead of the browser specs (navbar-consistency,
+compare, deep-compare). Exits with status 1 if any page differs or lacks a
+part.
+
+    python3 -m transforms.consistency
+    python3 -m transforms.consistency --dir dist --parts navbar footer
+"""
+import argparse
+import difflib
+import hashlib
+import os
+import re
+import sys
+import time
+
+from .engine import ROOT, site_pages
+from .locator import ATTR, TOKEN, VOID_ELEMENTS, locate
+from .navbar import anchor_prefix
+from .sitemap import walk_pages
+
+# part -> how to find it in a located document
+PARTS = {
+    'navbar': lambda doc: doc.find('nav', id='navbar'),
+    'mobile-menu': lambda doc: doc.find('div', id='mobile-menu'),
+    'footer': lambda doc: doc.find('footer'),
+}
+# Pages that are deliberately built without the shared chrome
+CHROME_EXCLUDE = ['seo-geo-strategy.html', '404.html']
+WHITESPACE = re.compile(r'\s+')
+HOME_ANCHOR = re.compile(r'^/(?=#)')
+STYLE_SPACE = re.compile(r'\s*([:;,])\s*')
+PLACEHOLDER = 'id="navbar-placeholder"'
+# Script a page loads -> (file holding the navbar markup, how it is written there)
+INJECTORS = {
+    '/navbar-init.js': ('public/navbar-init.js', 'concat'),
+    '/main.js': ('components/navbar.js', 'template'),
+}
+JS_STRING = re.compile(r"'((?:[^'\\]|\\.)*)'")
+TEMPLATE = re.compile(r'return\s*`(.*?)`', re.DOTALL)
+MAX_WIDTH = 160
+
+
+def injected_markup(page, html, root=ROOT):
+    """(navbar markup, script) for a page whose navbar is injected at runtime, or (None, None)."""
+    for src, (path, style) in INJECTORS.items():
+        if f'src="{src}"' not in html:
+            continue
+        try:
+            with open(os.path.join(root, path), 'r') as f:
+                js = f.read()
+        except OSError:
+            continue
+        if style == 'concat':
+            # 'a' + 'b' + ... up to the ; that ends the assignment
+            strings = []
+            pos = js.find('outerHTML')
+            for m in JS_STRING.finditer(js, pos) if pos != -1 else ():
+                if ';' in js[pos:m.start()]:
+                    break
+                strings.append(re.sub(r'\\(.)', r'\1', m.group(1)))
+                pos = m.end()
+            markup = ''.join(strings)
+        else:
+            m = TEMPLATE.search(js)
+            markup = m.group(1).replace('${prefix}', anchor_prefix(page)) if m else ''
+        if markup:
+            return markup, os.path.basename(path)
+    return None, None
+
+
+def normalize_attrs(raw):
+    attrs = []
+    for m in ATTR.finditer(raw):
+        name = m.group(1).lower()
+        if name == '/':
+            continue
+        value = next((v for v in m.group(2, 3, 4) if v is not None), None)
+        if value is not None:
+            value = WHITESPACE.sub(' ', value).strip()
+            if name == 'href':
+                value = HOME_ANCHOR.sub('', value) or '/'
+            elif name == 'style':
+                value = STYLE_SPACE.sub(r'\1', value).rstrip(';')
+        attrs.append(name if value is None else f'{name}="{value}"')
+    return ' '.join(sorted(attrs))
+
+
+def normalize(html):
+    """Lines of a subtree, one per tag or text run, indented by depth."""
+    lines = []
+    depth = 0
+    pos = 0
+
+    def text(chunk):
+        chunk = WHITESPACE.sub(' ', chunk).strip()
+        if chunk:
+            lines.append('  ' * depth + chunk)
+
+    for m in TOKEN.finditer(html):
+        text(html[pos:m.start()])
+        pos = m.end()
+        tag = m.group('tag')
+        if tag is None:
+            continue  # comment or doctype
+        tag = tag.lower()
+        if m.group('close'):
+            depth = max(depth - 1, 0)
+            lines.append('  ' * depth + f'</{tag}>')
+            continue
+        attrs = normalize_attrs(m.group('attrs'))
+        lines.append('  ' * depth + (f'<{tag} {attrs}>' if attrs else f'<{tag}>'))
+        if tag not in VOID_ELEMENTS and not m.group('attrs').rstrip().endswith('/'):
+            depth += 1
+    text(html[pos:])
+    return lines
+
+
+def fingerprint(lines):
+    return hashlib.sha256('\n'.join(lines).encode()).hexdigest()[:12]
+
+
+def extract(directory, pages, parts, root=ROOT):
+    """({part: {page: normalized lines or None}}, {page: injecting script})."""
+    found = {part: {} for part in parts}
+    injected = {}
+    for page in pages:
+        with open(os.path.join(directory, page), 'r', encoding='utf-8') as f:
+            html = f.read()
+        doc = locate(html)
+        runtime = None
+        if PLACEHOLDER in html:
+            markup, script = injected_markup(page, html, root)
+            if markup is not None:
+                runtime = (markup, locate(markup))
+                injected[page] = script
+        for part in parts:
+            source, located = html, doc
+            if part != 'footer' and runtime is not None:
+                source, located = runtime
+            el = PARTS[part](located)
+            found[part][page] = normalize(source[el.start:el.end]) if el else None
+    return found, injected
+
+
+def compare(versions):
+    """(reference hash, lines, pages by hash) for one part; most common version first, ties by page order."""
+    groups = {}
+    for page, lines in versions.items():
+        if lines is not None:
+            groups.setdefault(fingerprint(lines), []).append(page)
+    if not groups:
+        return None, [], groups
+    reference = max(groups, key=lambda h: len(groups[h]))
+    return reference, versions[groups[reference][0]], groups
+
+
+def minimal_diff(reference, lines, reference_name, name):
+    """Unified diff without context lines; hunks keep their @@ line numbers."""
+    return list(difflib.unified_diff(reference, lines, reference_name, name, n=0, lineterm=''))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.consistency', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default='.', help='directory of pages to check (default: the source pages)')
+    parser.add_argument('--parts', nargs='+', choices=list(PARTS), default=list(PARTS),
+                        help='subtrees to compare (default: all)')
+    parser.add_argument('--max-lines', type=int, default=40, help='diff lines shown per page (default: 40)')
+    args = parser.parse_args(argv)
+
+    directory = os.path.normpath(os.path.join(ROOT, args.dir))
+    if not os.path.isdir(directory):
+        print(f'✗ {args.dir}/ not found')
+        return 1
+    started = time.perf_counter()
+    pages = site_pages(directory) if directory == ROOT else list(walk_pages(directory))
+    pages = [page for page in pages if page not in CHROME_EXCLUDE]
+    found, injected = extract(directory, pages, args.parts)
+
+    def label(page, part):
+        return f'{page} ({injected[page]})' if page in injected and part != 'footer' else page
+
+    failures = 0
+    for part in args.parts:
+        reference, lines, groups = compare(found[part])
+        missing = [page for page, version in found[part].items() if version is None]
+        if reference is None:
+            print(f'✗ {part}: not found on any page')
+            failures += 1
+            continue
+        same = groups.pop(reference)
+        print(f"{'✓' if not groups and not missing else '✗'} {part}: {len(same)} pages match "
+              f"({reference}, e.g. {label(same[0], part)})")
+        for page in missing:
+            print(f'  ✗ {page}: no {part}')
+        for digest, members in sorted(groups.items(), key=lambda item: item[1][0]):
+            diff = minimal_diff(lines, found[part][members[0]], same[0], members[0])
+            changed = sum(1 for line in diff if line[:1] in '+-' and not line.startswith(('+++', '---')))
+            also = f' (also {", ".join(members[1:])})' if len(members) > 1 else ''
+            print(f'  ✗ {label(members[0], part)}{also}: {changed} lines differ ({digest})')
+            for line in diff[2:2 + args.max_lines]:
+                print(f'      {line[:MAX_WIDTH]}' + ('...' if len(line) > MAX_WIDTH else ''))
+            if len(diff) - 2 > args.max_lines:
+                print(f'      ... {len(diff) - 2 - args.max_lines} more')
+        failures += len(missing) + sum(len(members) for members in groups.values())
+
+    print(f'\n{len(pages)} pages, {len(args.parts)} parts checked in {time.perf_counter() - started:.2f}s: '
+          + (f'{failures} problems' if failures else 'all consistent'))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Run a pipeline of transforms over the site pages.
+
+Every page is read once, all transforms that apply to it run in memory in
+order, and the file is written back at most once (only if it changed).
+Pages are independent, so with jobs > 1 they are fanned out over a process
+pool; results are always reported sorted by path so logs stay diffable.
+With the incremental cache (see cache.py) pages whose content and transforms
+are unchanged since the last run are skipped without being transformed.
+Runs that write pages snapshot them first (see snapshots.py), so any run
+can be rolled back.
+"""
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from . import cache
+from .profiling import profiled
+from .registry import get_pipeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+ERROR = 'error'
+SKIPPED = 'skipped'
+
+
+def site_pages(root=ROOT):
+    """All HTML pages the rewrite scripts operate on, relative to root."""
+    pages = glob.glob('*.html', root_dir=root) + glob.glob('blog/*.html', root_dir=root)
+    return sorted(p.replace(os.sep, '/') for p in pages)
+
+
+class Page:
+    def __init__(self, path, content, root=ROOT):
+        self.path = path
+        self.root = root
+        self.original = content
+        self.content = content
+        self.deps = set()  # other files this page's output was built from
+
+    def depends_on(self, path):
+        """Record that the output depends on `path` (relative to root); the
+        cache re-processes the page whenever that file changes."""
+        self.deps.add(path)
+
+    @classmethod
+    def load(cls, path, root=ROOT):
+        with open(os.path.join(root, path), 'r') as f:
+            return cls(path, f.read(), root)
+
+    @property
+    def changed(self):
+        return self.content != self.original
+
+    def save(self):
+        with open(os.path.join(self.root, self.path), 'w') as f:
+            f.write(self.content)
+
+
+class PageResult:
+    def __init__(self, path, status, bytes_in=0, bytes_out=0, error=None, hash=None, deps=(), profile=()):
+        self.path = path
+        self.status = status
+        self.bytes_in = bytes_in
+        self.bytes_out = bytes_out
+        self.error = error
+        self.hash = hash  # content hash of the page as left on disk
+        self.deps = tuple(deps)
+        self.profile = list(profile)  # one record per transform call, with profile=True
+
+    def __str__(self):
+        if self.status == ERROR:
+            return f'✗ {self.status:9}  {self.path}  {self.error}'
+        if self.status == SKIPPED:
+            return f'  {self.status:9}  {self.path}'
+        mark = '✓' if self.status == CHANGED else ' '
+        return f'{mark} {self.status:9}  {self.path}  {self.bytes_in} -> {self.bytes_out} bytes'
+
+
+def process_page(path, names, root=ROOT, dry_run=False, known_hash=None, profile=False):
+    """Apply the transforms named in `names` to one page.
+
+    If the page content hashes to known_hash (what the same transforms left
+    on disk last time) it is skipped. With profile=True every transform call
+    is measured (see profiling.py). Top-level so it can be shipped to pool
+    workers; never raises.
+    """
+    records = []
+    try:
+        page = Page.load(path, root)
+        digest = cache.content_hash(page.content)
+        if digest == known_hash:
+            size = len(page.content.encode())
+            return PageResult(path, SKIPPED, size, size, hash=digest)
+        for t in get_pipeline(names):
+            if not t.applies_to(path):
+                continue
+            if profile:
+                page.content, record = profiled(t, page)
+                records.append(record)
+            else:
+                page.content = t(page.content, page)
+        if page.changed and not dry_run:
+            page.save()
+    except Exception as e:
+        return PageResult(path, ERROR, error=f'{type(e).__name__}: {e}', profile=records)
+    if page.changed:
+        digest = cache.content_hash(page.content)
+    return PageResult(path, CHANGED if page.changed else UNCHANGED,
+                      len(page.original.encode()), len(page.content.encode()),
+                      hash=digest, deps=sorted(page.deps), profile=records)
+
+
+def run(pipeline, pages=None, root=ROOT, dry_run=False, jobs=1, use_cache=True, verbose=True, profile=False,
+        snapshot=True):
+    """Apply the transforms named in `pipeline` to `pages`.
+
+    jobs > 1 processes pages in a pool of that many workers (0 = one per CPU).
+    use_cache=False ignores .transform-cache.json and processes every page.
+    profile=True fills each PageResult's profile records.
+    snapshot=False skips the automatic snapshot of the pages before the run.
+    Returns the PageResult list sorted by path.
+    """
+    from . import snapshots
+
+    transforms = get_pipeline(pipeline)
+    names = tuple(t.name for t in transforms)
+    if pages is None:
+        pages = site_pages(root)
+    pages = [p for p in pages if any(t.applies_to(p) for t in transforms)]
+    before = snapshots.snapshot_before(pages, root)[0] if snapshot and not dry_run else None
+
+    # Shared work first (e.g. image variants), so fingerprints see its output
+    for t in transforms:
+        if t.prepare is not None:
+            t.prepare([p for p in pages if t.applies_to(p)], root=root, jobs=jobs, dry_run=dry_run)
+
+    # Cache entries are per page and per chain of transforms applied to it
+    fingerprints = {t.name: cache.fingerprint(t, root) for t in transforms}
+    chains = {path: [t.name for t in transforms if t.applies_to(path)] for path in pages}
+    manifest = cache.load(root)
+    file_hashes = cache.FileHashes(root)
+    known = []
+    for path in pages:
+        entry = manifest.get(path, {}).get(' '.join(chains[path]))
+        fresh = (use_cache and entry
+                 and entry['fingerprints'] == [fingerprints[n] for n in chains[path]]
+                 and all(file_hashes[dep] == h for dep, h in entry.get('deps', {}).items()))
+        known.append(entry['hash'] if fresh else None)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(pages) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pages))) as pool:
+            results = list(pool.map(process_page, pages, [names] * len(pages),
+                                    [root] * len(pages), [dry_run] * len(pages), known, [profile] * len(pages)))
+    else:
+        results = [process_page(path, names, root, dry_run, known_hash, profile)
+                   for path, known_hash in zip(pages, known)]
+    results.sort(key=lambda r: r.path)
+
+    if not dry_run:
+        for result in results:
+            entries = manifest.setdefault(result.path, {})
+            chain = ' '.join(chains[result.path])
+            if result.status == ERROR:
+                entries.pop(chain, None)
+            elif result.status != SKIPPED:
+                entries[chain] = {'hash': result.hash,
+                                  'fingerprints': [fingerprints[n] for n in chains[result.path]],
+                                  'deps': {dep: file_hashes[dep] for dep in result.deps}}
+        cache.save(root, manifest)
+
+    snapshot_id = None
+    if before and any(r.status == CHANGED for r in results):
+        snapshot_id = snapshots.record_run(before, ' '.join(pipeline), root)
+    if verbose:
+        report(results)
+        if snapshot_id:
+            print(f'  snapshot {snapshot_id} (undo: python3 -m transforms.snapshots restore {snapshot_id})')
+    return results
+
+
+def report(results):
+    for result in results:
+        print(result)
+    counts = {status: sum(r.status == status for r in results) for status in (CHANGED, UNCHANGED, SKIPPED, ERROR)}
+    print(f"\n{counts[CHANGED]} changed, {counts[UNCHANGED]} unchanged, {counts[SKIPPED]} cached, {counts[ERROR]} errors "
+          f"({sum(r.bytes_in for r in results)} -> {sum(r.bytes_out for r in results)} bytes)")
@@ -0,0 +1,314 @@
+"""
+Self-hosted, glyph-subsetted web fonts for the build output.
+
+Runs after vite build and transforms.assets (npm's postbuild hook). Pages
+load Dongle and Gabarito from fonts.googleapis.com; this replaces that with
+first-party WOFF2 files that hold only the glyphs the site uses:
+
+1. The text of every page in dist/ is collected: element text and the
+   rendered attributes (placeholder, value, alt, title), plus the non-ASCII
+   characters of every script and stylesheet, which covers the navbar and
+   footer strings injected at runtime (navbar-init.js, the main bundle) and
+   CSS content. Printable ASCII is always kept, for typed input and numbers
+   written by scripts.
+2. For every family and weight a page asks Google for, the font file under
+   fonts/ (Dongle-700.ttf, Dongle-Bold.ttf, or a variable
+   Gabarito[wght].ttf / Gabarito-VariableFont_wght.ttf, as downloaded from
+   Google Fonts) is subset to those characters and written to
+   dist/fonts/<Family>-<weight>.<hash>.woff2. Subsets are cached in
+   .fonts-cache/ by source file, weight and glyph set, so a build whose
+   text didn't change subsets nothing.
+3. Each page's Google Fonts <link>s (stylesheet, print-media swap,
+   <noscript> copy, preconnects) become an inline <style> of @font-face
+   rules with unicode-range, and <link rel="preload"> tags for the faces in
+   PRELOAD.
+
+Faces without a source file stay on Google Fonts (the page's css2 URL is
+narrowed to them). WOFF2 needs fontTools and brotli (pip install fonttools
+brotli); without brotli, WOFF is written instead.
+
+    npm run build                          # runs this as postbuild
+    python3 -m transforms.fonts --dry-run  # glyph counts and sizes only
+"""
+import argparse
+import hashlib
+import html
+import io
+import json
+import os
+import re
+import sys
+from urllib.parse import parse_qsl, quote, urlsplit
+
+from .assets import HASH_LENGTH, walk
+from .engine import ROOT
+from .sitemap import walk_pages
+
+try:
+    from fontTools import subset as ft_subset
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+except ImportError:
+    ft_subset = None
+
+try:
+    import brotli  # noqa: F401  (fontTools needs it for WOFF2)
+except ImportError:
+    brotli = None
+
+SOURCE_DIR = 'fonts'  # full font files, not served
+OUTPUT_DIR = 'fonts'  # under dist/
+CACHE_DIR = '.fonts-cache'
+CACHE_VERSION = 1
+WEIGHT_NAMES = {100: 'Thin', 200: 'ExtraLight', 300: 'Light', 400: 'Regular', 500: 'Medium',
+                600: 'SemiBold', 700: 'Bold', 800: 'ExtraBold', 900: 'Black'}
+# Where a face's source may be, in order; {name} is the WEIGHT_NAMES entry
+SOURCE_NAMES = ('{family}-{weight}.ttf', '{family}-{name}.ttf', '{family}-{weight}.otf', '{family}-{name}.otf',
+                'static/{family}-{name}.ttf', '{family}[wght].ttf', '{family}-VariableFont_wght.ttf')
+# Faces worth fetching before the @font-face rules are parsed (body text, bold headings)
+PRELOAD = (('Gabarito', 400), ('Gabarito', 700))
+BASE_TEXT = ''.join(chr(c) for c in range(0x20, 0x7f)) + '\u00a0'
+
+GOOGLE_CSS = 'https://fonts.googleapis.com/css2?'
+GOOGLE_HOSTS = ('fonts.googleapis.com', 'fonts.gstatic.com')
+LINK = re.compile(r'[ \t]*(?:<noscript>\s*)?<link\b[^>]*>(?:\s*</noscript>)?[ \t]*\n?', re.IGNORECASE)
+HREF = re.compile(r'\shref\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+SKIP_TEXT = re.compile(r'<(script|style)\b.*?</\1\s*>|<!--.*?-->', re.DOTALL | re.IGNORECASE)
+TAG = re.compile(r'<[^>]*>')
+TEXT_ATTR = re.compile(r'\s(?:placeholder|value|alt|title)\s*=\s*"([^"]*)"', re.IGNORECASE)
+CODE = re.compile(r'<(script|style)\b[^>]*>(.*?)</\1\s*>', re.DOTALL | re.IGNORECASE)
+NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+
+def google_faces(url):
+    """([(family, weight)], display) requested by a fonts.googleapis.com/css2 URL."""
+    faces = []
+    display = 'swap'
+    for key, value in parse_qsl(urlsplit(html.unescape(url)).query):
+        if key == 'display':
+            display = value
+        elif key == 'family':
+            family, _, axes = value.partition(':')
+            weights = axes.partition('@')[2].split(';') if axes.startswith('wght@') else ['400']
+            faces.extend((family, int(w)) for w in weights if w.isdigit())
+    return faces, display
+
+
+def google_url(faces, display):
+    """css2 URL for faces (what stays on Google when a source file is missing)."""
+    families = {}
+    for family, weight in faces:
+        families.setdefault(family, []).append(weight)
+    query = '&'.join(f"family={quote(family).replace('%20', '+')}:wght@{';'.join(map(str, sorted(weights)))}"
+                     for family, weights in families.items())
+    return f'{GOOGLE_CSS}{query}&display={display}'
+
+
+def page_text(page_html):
+    """Characters a page renders in its own markup."""
+    body = SKIP_TEXT.sub(' ', page_html)
+    text = html.unescape(TAG.sub(' ', body))
+    attrs = ''.join(html.unescape(value) for value in TEXT_ATTR.findall(body))
+    return set(text) | set(attrs)
+
+
+def site_text(directory, pages):
+    """All characters the site can render: page text, plus non-ASCII characters of scripts and styles."""
+    chars = set(BASE_TEXT)
+    for page in pages:
+        with open(os.path.join(directory, page), 'r', encoding='utf-8') as f:
+            page_html = f.read()
+        chars |= page_text(page_html)
+        for m in CODE.finditer(page_html):
+            chars.update(NON_ASCII.findall(m.group(2)))
+    for path in walk(directory):
+        if path.endswith(('.js', '.mjs', '.css')):
+            with open(os.path.join(directory, path), 'r', encoding='utf-8', errors='replace') as f:
+                chars.update(NON_ASCII.findall(f.read()))
+    chars -= set('�\t\n\r\x0b\x0c')
+    return ''.join(sorted(chars))
+
+
+def find_source(family, weight, root=ROOT):
+    """(path, variable) of the font file for a face, or (None, False)."""
+    base = os.path.join(root, SOURCE_DIR)
+    name = WEIGHT_NAMES.get(weight, str(weight))
+    for pattern in SOURCE_NAMES:
+        path = os.path.join(base, pattern.format(family=family.replace(' ', ''), weight=weight, name=name))
+        if os.path.isfile(path):
+            return path, '[wght]' in pattern or 'VariableFont' in pattern
+    return None, False
+
+
+def unicode_range(codepoints):
+    """'U+20-7E,U+A0,...' for a set of code points."""
+    ranges = []
+    for cp in sorted(codepoints):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return ','.join(f'U+{a:X}' if a == b else f'U+{a:X}-{b:X}' for a, b in ranges)
+
+
+def subset(source, weight, variable, text, flavor, root=ROOT):
+    """(font bytes, code points it covers) for source cut down to text; cached by input."""
+    with open(source, 'rb') as f:
+        source_hash = hashlib.sha256(f.read()).hexdigest()
+    key = hashlib.sha256(json.dumps([CACHE_VERSION, source_hash, weight, variable, flavor, text]).encode()).hexdigest()
+    cache = os.path.join(root, CACHE_DIR, key)
+    try:
+        with open(cache + '.' + flavor, 'rb') as f:
+            data = f.read()
+        with open(cache + '.json', 'r') as f:
+            return data, json.load(f)['codepoints'], True
+    except (OSError, ValueError, KeyError):
+        pass
+
+    font = TTFont(source)
+    if variable and 'fvar' in font:
+        font = instancer.instantiateVariableFont(font, {'wght': weight})
+    options = ft_subset.Options()
+    options.flavor = flavor
+    options.desubroutinize = True  # compresses better
+    subsetter = ft_subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    codepoints = sorted(font.getBestCmap() or ())
+    out = io.BytesIO()
+    font.flavor = flavor
+    font.save(out)
+    data = out.getvalue()
+
+    os.makedirs(os.path.dirname(cache), exist_ok=True)
+    with open(cache + '.' + flavor, 'wb') as f:
+        f.write(data)
+    with open(cache + '.json', 'w') as f:
+        json.dump({'codepoints': codepoints}, f)
+    return data, codepoints, False
+
+
+def font_face(family, weight, url, flavor, codepoints, display):
+    return (f"@font-face{{font-family:'{family}';font-style:normal;font-weight:{weight};font-display:{display};"
+            f"src:url({url}) format('{flavor}');unicode-range:{unicode_range(codepoints)}}}")
+
+
+def rewrite_page(page_html, faces):
+    """page_html with its Google Fonts links replaced; faces maps (family, weight) to (url, rule).
+
+    Returns (new html, local faces used, faces left on Google)."""
+    links = [(m, HREF.search(m.group())) for m in LINK.finditer(page_html)]
+    links = [(m, href.group(1)) for m, href in links if href and urlsplit(href.group(1)).netloc in GOOGLE_HOSTS]
+    stylesheets = [(m, href) for m, href in links if href.startswith(GOOGLE_CSS)]
+    if not stylesheets:
+        return page_html, [], []
+    requested, display = google_faces(stylesheets[0][1])
+    local = [face for face in requested if face in faces]
+    remote = [face for face in requested if face not in faces]
+    if not local:
+        return page_html, [], remote
+
+    indent = re.match(r'[ \t]*', stylesheets[0][0].group()).group()
+    tags = [f'<link rel="preload" href="{faces[face][0]}" as="font" type="font/{faces[face][2]}" crossorigin>'
+            for face in PRELOAD if face in local]
+    tags.append('<style>' + ''.join(faces[face][1] for face in local) + '</style>')
+    if remote:
+        # Keep Google (and its preconnects) for the faces we have no file for
+        tags.append(f'<link href="{html.escape(google_url(remote, display))}" rel="stylesheet">')
+        links = stylesheets
+    replacement = ''.join(f'{indent}{tag}\n' for tag in tags)
+    out = []
+    pos = 0
+    for m, _ in sorted(links, key=lambda item: item[0].start()):
+        out.append(page_html[pos:m.start()])
+        if m is stylesheets[0][0]:
+            out.append(replacement)
+        pos = m.end()
+    out.append(page_html[pos:])
+    return ''.join(out), local, remote
+
+
+def build(directory, dry_run=False, root=ROOT):
+    """Subset every requested face and rewrite the pages; returns a report dict."""
+    pages = list(walk_pages(directory))
+    requested = set()
+    display = 'swap'
+    for page in pages:
+        with open(os.path.join(directory, page), 'r', encoding='utf-8') as f:
+            for m in re.finditer(re.escape(GOOGLE_CSS) + r'[^"\'\s>]+', f.read()):
+                faces, display = google_faces(m.group())
+                requested.update(faces)
+    report = {'pages': len(pages), 'requested': sorted(requested), 'missing': [], 'faces': [], 'rewritten': []}
+    if not requested:
+        return report
+
+    text = site_text(directory, pages)
+    report['glyphs'] = len(text)
+    flavor = 'woff2' if brotli is not None else 'woff'
+    faces = {}
+    for family, weight in sorted(requested):
+        source, variable = find_source(family, weight, root)
+        if source is None:
+            report['missing'].append((family, weight))
+            continue
+        data, codepoints, cached = subset(source, weight, variable, text, flavor, root)
+        name = f"{family.replace(' ', '')}-{weight}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}.{flavor}"
+        url = f'/{OUTPUT_DIR}/{name}'
+        faces[(family, weight)] = (url, font_face(family, weight, url, flavor, codepoints, display), flavor)
+        report['faces'].append((family, weight, os.path.relpath(source, root), os.path.getsize(source),
+                                len(data), len(codepoints), cached, url))
+        if not dry_run:
+            os.makedirs(os.path.join(directory, OUTPUT_DIR), exist_ok=True)
+            with open(os.path.join(directory, OUTPUT_DIR, name), 'wb') as f:
+                f.write(data)
+
+    for page in pages:
+        path = os.path.join(directory, page)
+        with open(path, 'r', encoding='utf-8') as f:
+            page_html = f.read()
+        new, local, remote = rewrite_page(page_html, faces)
+        if new != page_html:
+            report['rewritten'].append((page, len(local), len(remote)))
+            if not dry_run:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(new)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.fonts', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default='dist', help='build output to rewrite (default: dist)')
+    parser.add_argument('--dry-run', action='store_true', help="subset and report, don't write to dist")
+    args = parser.parse_args(argv)
+
+    directory = os.path.normpath(os.path.join(ROOT, args.dir))
+    if not os.path.isdir(directory):
+        print(f'✗ {args.dir}/ not found (run npm run build first)')
+        return 1
+    if ft_subset is None:
+        print('⚠️  fontTools not installed, fonts stay on Google Fonts (pip install fonttools brotli)')
+        return 0
+    if brotli is None:
+        print('⚠️  brotli not installed, writing WOFF instead of WOFF2 (pip install brotli)')
+
+    report = build(directory, args.dry_run)
+    if not report['requested']:
+        print(f"✓ no Google Fonts links in {args.dir}/ ({report['pages']} pages)")
+        return 0
+    for family, weight, source, before, after, glyphs, cached, url in report['faces']:
+        print(f"✓ {family} {weight}: {source} {before / 1024:.0f} KB -> {after / 1024:.1f} KB, "
+              f"{glyphs} glyphs{' (cached)' if cached else ''}  {url}")
+    for family, weight in report['missing']:
+        names = ', '.join(p.format(family=family.replace(' ', ''), weight=weight, name=WEIGHT_NAMES.get(weight, weight))
+                          for p in SOURCE_NAMES[:2])
+        print(f'⚠️  {family} {weight}: no source in {SOURCE_DIR}/ ({names}, ...), stays on Google Fonts')
+    saved = sum(face[3] - face[4] for face in report['faces'])
+    print(f"\n{len(report['faces'])} of {len(report['requested'])} faces self-hosted from {report.get('glyphs', 0)} "
+          f"characters, {saved / 1024:.0f} KB smaller than the sources; {len(report['rewritten'])} of "
+          f"{report['pages']} pages rewritten" + (' (dry run)' if args.dry_run else ''))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""
+Footer transforms.
+
+full-footer       -- replace the simple subpage footer with partials/footer.html
+homepage-spacing  -- tighten section padding on the homepage
+"""
+from .includes import render_partial
+from .locator import locate, splice
+from .registry import transform
+
+# Class prefix of the simple footer to replace
+SIMPLE_FOOTER_CLASS = 'py-8'
+
+
+@transform('full-footer', exclude=['index.html'])
+def full_footer(content, page):
+    doc = locate(content)
+    footers = [el for el in doc.find_all('footer')
+               if el.attrs.get('class', '').startswith(SIMPLE_FOOTER_CLASS)]
+    if not footers:
+        return content
+    full_footer = render_partial('footer', root=page.root, page=page)
+    return splice(content, [(el.start, el.end, full_footer) for el in footers])
+
+
+@transform('homepage-spacing', pages=['index.html'])
+def homepage_spacing(content, page):
+    # Reduce section padding
+    content = content.replace('py-24 lg:py-32', 'py-16 lg:py-20')
+    content = content.replace('mb-20 scroll-item', 'mb-12 scroll-item')
+    content = content.replace('py-16 grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4', 'py-12 grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4')
+    return content
@@ -0,0 +1,67 @@
+"""
+Background gradient transforms.
+
+body-gradient      -- give every subpage the homepage body gradient
+homepage-gradient  -- single smooth body gradient on index.html, no section gradients
+"""
+import re
+
+from .registry import transform
+from .rules import Rule, apply_rules
+
+# The clean gradient from homepage
+BODY_GRADIENT = 'background: linear-gradient(180deg, #234966 0%, #1a3a4f 8%, #12222d 15%, #0a171e 30%, #050c11 50%, #050c11 70%, #0a171e 85%, #12222d 100%);'
+
+# Section-level gradients and decorative blur elements dropped from subpages
+SUBPAGE_RULES = [
+    Rule(r'(<section[^>]*) style="background:\s*linear-gradient\([^"]+\)"', r'\1', name='section gradient'),
+    Rule(r'<div class="absolute[^>]+blur-\[\d+px\][^>]+pointer-events-none"></div>\n?', name='blur-[Npx] element'),
+    Rule(r'<div class="absolute[^>]+blur-3xl[^>]+pointer-events-none"></div>\n?', name='blur-3xl element'),
+]
+
+# Section-level backgrounds cleared on the homepage, each within its @section
+SECTIONS_TO_CLEAR = [
+    Rule(r'(<section id="how-it-works"[^>]*) style="background:[^"]+"', r'\1', 'transformation', 'how-it-works'),
+    Rule(r'(<section id="award"[^>]*) style="background:[^"]+"', r'\1', 'award', 'award'),
+    Rule(r'(<section class="py-20"[^>]*) style="background:[^"]+"', r'\1', 'security', 'security'),
+    Rule(r'(<section id="faq"[^>]*) style="background:[^"]+"', r'\1', 'faq', 'faq'),
+    Rule(r'(<section id="pricing"[^>]*) style="background:[^"]+"', r'\1', 'pricing-beta', 'pricing'),
+    Rule(r'(<section class="py-24 relative overflow-hidden"[^>]*) style="background:[^"]+"', r'\1', 'final-cta',
+         'final-cta'),
+    Rule(r'(<footer[^>]*) style="background:[^"]+"', r'\1', 'footer', 'footer'),
+]
+
+
+@transform('body-gradient', exclude=['index.html'])
+def body_gradient(content, page):
+    # Update body gradient
+    content = re.sub(
+        r'<body[^>]*style="background:[^"]*"[^>]*>',
+        f'<body class="text-white min-h-screen font-sans" style="{BODY_GRADIENT}">',
+        content
+    )
+
+    # Also handle body without style
+    if 'style="background:' not in content and '<body' in content:
+        content = re.sub(
+            r'<body([^>]*)>',
+            f'<body\\1 style="{BODY_GRADIENT}">',
+            content
+        )
+
+    # Remove section-level background gradients and blur elements
+    return apply_rules(content, SUBPAGE_RULES)
+
+
+@transform('homepage-gradient', pages=['index.html'])
+def homepage_gradient(content, page):
+    # Set body to have smooth full-page gradient
+    content = re.sub(
+        r'<body class="text-white min-h-screen font-sans" style="background:[^"]+">',
+        f'<body class="text-white min-h-screen font-sans" style="{BODY_GRADIENT}">',
+        content
+    )
+
+    # Hero section keeps its gradient for the above-the-fold look,
+    # everything else inherits the body gradient
+    return apply_rules(content, SECTIONS_TO_CLEAR)
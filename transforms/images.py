@@ -0,0 +1,239 @@
+"""
+Responsive images: width-bucketed AVIF/WebP variants and srcset rewriting.
+
+responsive-images  -- wrap every local raster <img> in a <picture> with
+                      AVIF and WebP <source> srcsets built from its variants
+
+Before any page is processed, the transform's prepare step collects the
+images the pages reference (/name.png, /name.webp, ... under public/) and
+renders the missing variants into public/img/ in a process pool (--jobs).
+Variant names contain the source's content hash, so an unchanged image is
+never re-encoded and an edited one gets fresh URLs. image-variants.json maps
+each image to its variants; the transform only reads it, so pages are
+re-processed (through the transform cache) exactly when it changes.
+
+Encoding needs Pillow (pip install Pillow; AVIF needs Pillow 11.3+ or
+pillow-avif-plugin). Without it the existing variants are still used.
+
+    python3 -m transforms responsive-images --jobs 0
+"""
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from .engine import ROOT
+from .locator import locate, splice
+from .registry import transform
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+PUBLIC_DIR = 'public'
+VARIANTS_DIR = 'img'  # under public/, served at /img/
+MANIFEST = 'image-variants.json'
+
+WIDTHS = (400, 800, 1200, 1600)
+RASTER_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+# Best format first; the <img> keeps the original as the fallback
+FORMATS = {
+    'avif': {'quality': 50},
+    'webp': {'quality': 80, 'method': 6},
+}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+DEFAULT_SIZES = '100vw'
+# Opt out per image with <img data-no-responsive ...>
+OPT_OUT = 'data-no-responsive'
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()[:10]
+
+
+def is_local_raster(src):
+    return (src.startswith('/') and not src.startswith('//')
+            and not src.startswith(f'/{VARIANTS_DIR}/')
+            and src.lower().endswith(RASTER_EXTENSIONS))
+
+
+def formats_available():
+    if Image is None:
+        return []
+    return [fmt for fmt in FORMATS if features.check(fmt)]
+
+
+def variant_url(src, digest, width, fmt):
+    stem = os.path.splitext(os.path.basename(src))[0]
+    return f'/{VARIANTS_DIR}/{stem}-{digest}-{width}.{fmt}'
+
+
+def make_variants(src, root=ROOT):
+    """Render the missing variants of one image; returns (src, manifest entry).
+    Top-level so it can run in pool workers."""
+    path = os.path.join(root, PUBLIC_DIR, src.lstrip('/'))
+    digest = file_hash(path)
+    with Image.open(path) as im:
+        im.load()
+        width, height = im.size
+        if im.mode not in ('RGB', 'RGBA'):
+            im = im.convert('RGBA' if 'transparency' in im.info or im.mode in ('LA', 'P') else 'RGB')
+        widths = sorted({w for w in WIDTHS if w < width} | {min(width, WIDTHS[-1])})
+        variants = {}
+        # Nothing to gain from width buckets for icons and thumbnails
+        for fmt in formats_available() if width > WIDTHS[0] else ():
+            variants[fmt] = []
+            for w in widths:
+                url = variant_url(src, digest, w, fmt)
+                out = os.path.join(root, PUBLIC_DIR, url.lstrip('/'))
+                if not os.path.exists(out):
+                    resized = im if w == width else im.resize((w, round(height * w / width)), Image.LANCZOS)
+                    tmp = f'{out}.{os.getpid()}.tmp'
+                    resized.save(tmp, fmt.upper(), **FORMATS[fmt])
+                    os.replace(tmp, out)
+                variants[fmt].append([w, url])
+    return src, {'hash': digest, 'width': width, 'height': height, 'variants': variants}
+
+
+def load_manifest(root=ROOT):
+    path = os.path.join(root, MANIFEST)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    return _read_manifest(path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=4)
+def _read_manifest(path, mtime_ns, size):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _is_current(entry, root):
+    return all(os.path.exists(os.path.join(root, PUBLIC_DIR, url.lstrip('/')))
+               for urls in entry['variants'].values() for _, url in urls)
+
+
+def referenced_images(pages, root=ROOT):
+    """Local raster images used by <img src> on pages, that exist under public/."""
+    srcs = set()
+    for path in pages:
+        with open(os.path.join(root, path), 'r') as f:
+            doc = locate(f.read())
+        for img in doc.find_all('img'):
+            src = img.attrs.get('src', '')
+            if OPT_OUT not in img.attrs and is_local_raster(src) \
+                    and os.path.isfile(os.path.join(root, PUBLIC_DIR, src.lstrip('/'))):
+                srcs.add(src)
+    return sorted(srcs)
+
+
+def prepare(pages, root=ROOT, jobs=1, dry_run=False):
+    """Bring image-variants.json and public/img/ up to date for pages."""
+    manifest = dict(load_manifest(root))
+    srcs = referenced_images(pages, root)
+    if Image is None:
+        missing = [src for src in srcs if src not in manifest]
+        if missing:
+            print(f"⚠️  Pillow not installed; no variants for {', '.join(missing)} (pip install Pillow)")
+        return
+    formats = formats_available()
+    stale = []
+    for src in srcs:
+        entry = manifest.get(src)
+        path = os.path.join(root, PUBLIC_DIR, src.lstrip('/'))
+        if (entry is None or entry['hash'] != file_hash(path) or sorted(entry['variants']) != sorted(formats)
+                or not _is_current(entry, root)):
+            stale.append(src)
+    if not stale or dry_run:
+        if stale:
+            print(f"Would build variants for {', '.join(stale)}")
+        return
+
+    os.makedirs(os.path.join(root, PUBLIC_DIR, VARIANTS_DIR), exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(stale))) as pool:
+            built = list(pool.map(make_variants, stale, [root] * len(stale)))
+    else:
+        built = [make_variants(src, root) for src in stale]
+    for src, entry in built:
+        manifest[src] = entry
+        made = ', '.join(f'{fmt} x{len(v)}' for fmt, v in entry['variants'].items()) or 'too small, left as is'
+        print(f"✓ variants   {src}  ({made})")
+
+    # Remove variants no manifest entry points at any more (old hashes)
+    used = {url for entry in manifest.values() for urls in entry['variants'].values() for _, url in urls}
+    variants_dir = os.path.join(root, PUBLIC_DIR, VARIANTS_DIR)
+    for name in os.listdir(variants_dir):
+        if f'/{VARIANTS_DIR}/{name}' not in used and name.rsplit('.', 1)[-1] in FORMATS:
+            os.remove(os.path.join(variants_dir, name))
+
+    tmp = os.path.join(root, MANIFEST + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp, os.path.join(root, MANIFEST))
+
+
+def attr_value(value):
+    """value for a double-quoted attribute. The locator keeps values as
+    written, so entities are decoded first rather than escaped twice."""
+    return html.escape(html.unescape(value), quote=True)
+
+
+def picture(doc, img, entry, at, sizes):
+    """<picture> markup for img: one <source> per format, the <img> as fallback.
+    `at` is the element being replaced (img or its old <picture>)."""
+    attrs = dict(img.attrs)
+    attrs.pop('sizes', None)
+    attrs.pop('srcset', None)
+    attrs.setdefault('width', str(entry['width']))
+    attrs.setdefault('height', str(entry['height']))
+    line_start = doc.html.rfind('\n', 0, at.start) + 1
+    indent = doc.html[line_start:at.start]
+    if indent.strip():
+        indent = ''
+    lines = ['<picture>']
+    for fmt in FORMATS:
+        if fmt in entry['variants']:
+            srcset = ', '.join(f'{url} {w}w' for w, url in entry['variants'][fmt])
+            lines.append(f'    <source type="{MIME_TYPES[fmt]}" srcset="{attr_value(srcset)}" '
+                         f'sizes="{attr_value(sizes)}">')
+    rendered = ' '.join(f'{k}="{attr_value(v)}"' if v != '' or k in ('alt',) else k for k, v in attrs.items())
+    lines.append(f'    <img {rendered}>')
+    lines.append('</picture>')
+    return f'\n{indent}'.join(lines)
+
+
+@transform('responsive-images', sources=[MANIFEST], prepare=prepare)
+def responsive_images(content, page):
+    manifest = load_manifest(page.root)
+    if not manifest:
+        return content
+    doc = locate(content)
+    pictures = doc.find_all('picture')
+    edits = []
+    for img in doc.find_all('img'):
+        entry = manifest.get(img.attrs.get('src', ''))
+        if entry is None or OPT_OUT in img.attrs or not entry['variants']:
+            continue
+        # Re-render pictures we generated before; leave hand-written ones alone
+        outer = next((p for p in pictures if p.contains(img)), None)
+        sizes = img.attrs.get('sizes')
+        if outer is not None:
+            sources = doc.find_all('source', within=outer)
+            if not all(s.attrs.get('srcset', '').startswith(f'/{VARIANTS_DIR}/') for s in sources):
+                continue
+            sizes = sizes or next((s.attrs['sizes'] for s in sources if 'sizes' in s.attrs), None)
+        at = outer or img
+        edits.append((at.start, at.end, picture(doc, img, entry, at, sizes or DEFAULT_SIZES)))
+    return splice(content, edits)
@@ -0,0 +1,125 @@
+"""
+Partial includes: shared markup lives once in partials/<name>.html.
+
+A page references a partial with a directive comment; the includes
+transform renders the partial in place, between the directive and a
+matching end marker, so the page can be recompiled any number of times:
+
+    <!-- @include navbar anchor_prefix="/" -->
+    ...rendered partials/navbar.html...
+    <!-- @endinclude navbar -->
+
+A directive without an end marker is expanded on first compile. Partials
+use {{ name }} placeholders filled from the directive's parameters and may
+include other partials. Each partial is parsed once per process (re-parsed
+only when the file changes). Every page records the partials it used
+(Page.depends_on), which the transform cache keeps as the dependency graph:
+editing partials/footer.html recompiles only the pages that include it.
+
+    python3 -m transforms includes
+    python3 -m transforms --graph             # partial -> pages graph
+"""
+import os
+import re
+from functools import lru_cache
+
+from . import cache
+from .engine import ROOT
+from .locator import splice
+from .registry import transform
+
+PARTIALS_DIR = 'partials'
+
+INCLUDE = re.compile(r'<!--\s*@include\s+([\w-]+)((?:\s+[\w-]+="[^"]*")*)\s*-->')
+PARAM = re.compile(r'([\w-]+)="([^"]*)"')
+VARIABLE = re.compile(r'\{\{\s*([\w-]+)\s*\}\}')
+TOKEN = re.compile(f'{INCLUDE.pattern}|{VARIABLE.pattern}')
+
+
+def partial_path(name):
+    return f'{PARTIALS_DIR}/{name}.html'
+
+
+def parse_params(raw):
+    return dict(PARAM.findall(raw or ''))
+
+
+@lru_cache(maxsize=256)
+def _parse(path, mtime_ns, size):
+    """Split a partial into text, ('var', name) and ('include', name, params) tokens."""
+    with open(path, 'r') as f:
+        source = f.read()
+    if source.endswith('\n'):
+        source = source[:-1]
+    tokens = []
+    pos = 0
+    for m in TOKEN.finditer(source):
+        if m.start() > pos:
+            tokens.append(source[pos:m.start()])
+        if m.group(1):
+            tokens.append(('include', m.group(1), parse_params(m.group(2))))
+        else:
+            tokens.append(('var', m.group(3)))
+        pos = m.end()
+    tokens.append(source[pos:])
+    return tuple(tokens)
+
+
+def load_partial(name, root=ROOT):
+    path = os.path.join(root, partial_path(name))
+    try:
+        st = os.stat(path)
+    except OSError:
+        raise FileNotFoundError(f'No such partial: {partial_path(name)}') from None
+    return _parse(path, st.st_mtime_ns, st.st_size)
+
+
+def render_partial(name, params=None, root=ROOT, page=None, _stack=()):
+    """Render partials/<name>.html with params; records dependencies on page."""
+    if name in _stack:
+        raise ValueError(f"Include cycle: {' -> '.join(_stack + (name,))}")
+    if page is not None:
+        page.depends_on(partial_path(name))
+    params = params or {}
+    parts = []
+    for token in load_partial(name, root):
+        if isinstance(token, str):
+            parts.append(token)
+        elif token[0] == 'var':
+            if token[1] not in params:
+                raise KeyError(f'{partial_path(name)}: no value for {{{{ {token[1]} }}}}')
+            parts.append(params[token[1]])
+        else:
+            parts.append(render_partial(token[1], {**params, **token[2]}, root, page, _stack + (name,)))
+    return ''.join(parts)
+
+
+@transform('includes')
+def includes(content, page):
+    directives = list(INCLUDE.finditer(content))
+    edits = []
+    for i, m in enumerate(directives):
+        name = m.group(1)
+        limit = directives[i + 1].start() if i + 1 < len(directives) else len(content)
+        end_marker = f'<!-- @endinclude {name} -->'
+        end = content.find(end_marker, m.end(), limit)
+        end = m.end() if end == -1 else end + len(end_marker)
+
+        line_start = content.rfind('\n', 0, m.start()) + 1
+        indent = content[line_start:m.start()]
+        if indent.strip():
+            indent = ''
+        rendered = render_partial(name, parse_params(m.group(2)), page.root, page)
+        edits.append((m.start(), end, f'{m.group(0)}\n{rendered}\n{indent}{end_marker}'))
+    return splice(content, edits)
+
+
+def dependency_graph(root=ROOT):
+    """partial path -> sorted pages that include it, from the transform cache."""
+    graph = {}
+    for path, entries in cache.load(root).items():
+        for entry in entries.values():
+            for dep in entry.get('deps', {}):
+                if dep.startswith(PARTIALS_DIR + '/'):
+                    graph.setdefault(dep, set()).add(path)
+    return {dep: sorted(pages) for dep, pages in sorted(graph.items())}
@@ -0,0 +1,251 @@
+"""
+Offline link and anchor checker.
+
+Reads every page under dist/ (or the source tree with --dir .) once and
+builds a graph of links, ids and anchors, then checks it without a browser
+or the network:
+
+- broken links: an <a>/<area>/<link> href or <img>/<script>/<source> src
+  that no page or file would be served for
+- missing anchors: /#how-it-works, #award, /blog/post#intro where the target
+  page has no element with that id (or <a name>)
+- redirects: links that work only through a redirect, e.g. /about.html or
+  /blog/ with vercel.json's cleanUrls and trailingSlash: false
+- orphan pages: indexable pages no chain of links from / reaches
+
+URLs are resolved the way Vercel serves them (transforms/seo.py reads
+vercel.json). Each page's ids and links are indexed once and cached in
+.links-cache.json by mtime and size, so a rerun only re-reads edited pages
+and anchor checks are set lookups, however many blog pages there are.
+Exits with status 1 if there are broken links or missing anchors.
+
+    npm run build && python3 -m transforms.links
+    python3 -m transforms.links --dir .      # source pages, with public/
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from bisect import bisect_right
+from urllib.parse import unquote, urljoin, urlsplit
+
+from .engine import ROOT
+from .seo import SITE_URL, is_noindex, url_path, vercel_config
+from .sitemap import SITEMAP_EXCLUDE, walk_pages
+
+CACHE_FILE = '.links-cache.json'
+CACHE_VERSION = 1
+PUBLIC_DIR = 'public'  # also served, when checking the source tree
+SITE_HOSTS = (urlsplit(SITE_URL).netloc, 'www.' + urlsplit(SITE_URL).netloc)
+# Fragments browsers handle without a matching id
+IMPLICIT_ANCHORS = ('', 'top')
+ORPHAN_EXCLUDE = ['404.html']
+
+TAG = re.compile(r'<(a|area|link|img|script|source|iframe|video|audio)\b((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>',
+                 re.IGNORECASE)
+ATTR = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+ID = re.compile(r'<[a-zA-Z][^>]*?\s(?:id|name)\s*=\s*["\']([^"\']+)["\']')
+HEAD_END = re.compile(r'</head\s*>', re.IGNORECASE)
+# Template placeholders left in attribute values are not links
+TEMPLATE = re.compile(r'\$\{|\{\{|\{%')
+# Only navigation links count for anchors, redirects and reachability
+NAVIGATION = ('a', 'area')
+
+
+def attributes(raw):
+    return {m.group(1).lower(): m.group(2) if m.group(2) is not None else m.group(3) for m in ATTR.finditer(raw)}
+
+
+def index_page(html):
+    """Cache entry fields for one page: ids, links as [kind, url, line], noindex."""
+    newlines = [m.start() for m in re.finditer('\n', html)]
+    links = []
+    for m in TAG.finditer(html):
+        tag = m.group(1).lower()
+        attrs = attributes(m.group(2))
+        if tag == 'link' and attrs.get('rel', '').lower() in ('preconnect', 'dns-prefetch', 'canonical', 'alternate'):
+            continue
+        urls = [attrs[key] for key in ('href', 'src') if key in attrs]
+        if 'srcset' in attrs:
+            urls += [part.split()[0] for part in attrs['srcset'].split(',') if part.strip()]
+        kind = 'nav' if tag in NAVIGATION else 'res'
+        for url in urls:
+            url = url.strip()
+            if url and not TEMPLATE.search(url):
+                links.append([kind, url, bisect_right(newlines, m.start()) + 1])
+    head = HEAD_END.split(html, 1)[0]
+    return {'ids': sorted(set(ID.findall(html))), 'links': links, 'noindex': is_noindex(head)}
+
+
+def index_pages(directory, pages, name, use_cache=True, root=ROOT):
+    """Index entries by page; only pages whose mtime or size changed are read."""
+    path = os.path.join(root, CACHE_FILE)
+    cache = {}
+    if use_cache:
+        try:
+            with open(path, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            pass
+    if cache.get('version') != CACHE_VERSION:
+        cache = {'version': CACHE_VERSION, 'dirs': {}}
+    old = cache['dirs'].get(name, {})
+    entries = {}
+    read = 0
+    for page in pages:
+        st = os.stat(os.path.join(directory, page))
+        entry = old.get(page)
+        if entry is None or entry['mtime'] != st.st_mtime_ns or entry['size'] != st.st_size:
+            with open(os.path.join(directory, page), 'r', encoding='utf-8', errors='replace') as f:
+                entry = index_page(f.read())
+            entry.update(mtime=st.st_mtime_ns, size=st.st_size)
+            read += 1
+        entries[page] = entry
+    if read or set(old) != set(entries):
+        cache['dirs'][name] = entries
+        with open(path + '.tmp', 'w') as f:
+            json.dump(cache, f, separators=(',', ':'), sort_keys=True)
+        os.replace(path + '.tmp', path)
+    return entries, read
+
+
+class Site:
+    """What a deployment of directory would serve, following vercel.json."""
+
+    def __init__(self, directory, pages, source=False, root=ROOT):
+        self.directory = directory
+        self.pages = set(pages)
+        self.static_dirs = [directory] + ([os.path.join(directory, PUBLIC_DIR)] if source else [])
+        self.root = root
+        config = vercel_config(root)
+        self.clean_urls = config.get('cleanUrls', False)
+        self.trailing_slash = config.get('trailingSlash')
+        self.redirects = {r['source']: r['destination'] for r in config.get('redirects', [])
+                          if ':' not in r['source'] and '(' not in r['source']}
+        self.rewrites = {r['source']: r['destination'] for r in config.get('rewrites', [])
+                         if ':' not in r['source'] and '(' not in r['source']}
+        self._files = {}
+
+    def is_file(self, path):
+        if path not in self._files:
+            self._files[path] = any(os.path.isfile(os.path.join(d, path)) for d in self.static_dirs)
+        return self._files[path]
+
+    def page_for(self, path):
+        """Page served at an absolute URL path, ignoring redirects, or None."""
+        rel = path.lstrip('/')
+        if rel.endswith('/') or rel == '':
+            candidates = [rel + 'index.html']
+        elif rel.endswith('.html'):
+            candidates = [rel]
+        else:
+            candidates = ([rel + '.html'] if self.clean_urls else []) + [rel + '/index.html']
+        return next((c for c in candidates if c in self.pages), None)
+
+    def resolve(self, path):
+        """(page or file path, redirect target or None) for an absolute URL path; (None, None) if nothing is served."""
+        if path in self.redirects:
+            target, _ = self.resolve(self.redirects[path])
+            return target, self.redirects[path]
+        path = self.rewrites.get(path, path)
+        rel = path.lstrip('/')
+        if rel and not rel.endswith('/') and not rel.endswith('.html') and self.is_file(rel):
+            return rel, None
+        stripped = path.rstrip('/') or '/'
+        page = self.page_for(path) or self.page_for(stripped)
+        if page is None:
+            return (rel, None) if rel and self.is_file(rel) and not rel.endswith('/') else (None, None)
+        served = url_path(page, self.root)
+        if path == served:
+            return page, None
+        if self.trailing_slash is None and path.rstrip('/') == served.rstrip('/'):
+            return page, None
+        if not self.clean_urls and path.endswith('.html'):
+            return page, None
+        return page, served
+
+
+def check(directory, source=False, use_cache=True, root=ROOT):
+    """Returns (entries, errors, redirects, orphans, pages read)."""
+    name = os.path.relpath(directory, root).replace(os.sep, '/')
+    pages = list(walk_pages(directory))
+    entries, read = index_pages(directory, pages, name, use_cache, root)
+    ids = {page: set(entry['ids']) for page, entry in entries.items()}
+    site = Site(directory, pages, source, root)
+
+    errors = []  # (page, line, url, problem)
+    redirects = {}  # (url, target) -> [(page, line)]
+    edges = {page: set() for page in pages}
+    for page in pages:
+        base = SITE_URL + url_path(page, root)
+        for kind, url, line in entries[page]['links']:
+            parts = urlsplit(urljoin(base, url))
+            if parts.scheme not in ('http', 'https') or parts.netloc not in SITE_HOSTS:
+                continue
+            path = unquote(parts.path) or '/'
+            target, redirect = site.resolve(path)
+            if target is None:
+                errors.append((page, line, url, 'not found'))
+                continue
+            if kind != 'nav' or target not in ids:
+                continue
+            edges[page].add(target)
+            if redirect is not None:
+                redirects.setdefault((path, redirect), []).append((page, line))
+            anchor = unquote(parts.fragment)
+            if anchor not in IMPLICIT_ANCHORS and anchor not in ids[target]:
+                errors.append((page, line, url, f'no id="{anchor}" on {target}'))
+
+    home = site.page_for('/')
+    reached = set()
+    stack = [home] if home else []
+    while stack:
+        page = stack.pop()
+        if page not in reached:
+            reached.add(page)
+            stack.extend(edges[page] - reached)
+    orphans = [page for page in pages if page not in reached and not entries[page]['noindex']
+               and page not in SITEMAP_EXCLUDE and page not in ORPHAN_EXCLUDE]
+    return entries, errors, redirects, orphans, read
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.links', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default='dist', help='directory of pages to check (default: dist; . for the source)')
+    parser.add_argument('--no-cache', action='store_true', help=f'ignore {CACHE_FILE} and read every page')
+    parser.add_argument('--no-redirects', action='store_true', help="don't list links that go through a redirect")
+    args = parser.parse_args(argv)
+
+    directory = os.path.normpath(os.path.join(ROOT, args.dir))
+    if not os.path.isdir(directory):
+        print(f'✗ {args.dir}/ not found (run npm run build first, or pass --dir .)')
+        return 1
+    started = time.perf_counter()
+    entries, errors, redirects, orphans, read = check(directory, source=directory == ROOT,
+                                                       use_cache=not args.no_cache)
+    elapsed = time.perf_counter() - started
+
+    for page, line, url, problem in sorted(errors):
+        print(f'✗ {page}:{line}  {url}  ({problem})')
+    if not args.no_redirects:
+        for (path, target), where in sorted(redirects.items()):
+            pages = sorted({page for page, _ in where})
+            print(f"⚠️  {path} redirects to {target}  ({len(where)} links on {len(pages)} pages, e.g. "
+                  f"{pages[0]}:{min(line for page, line in where if page == pages[0])})")
+    for page in orphans:
+        print(f'⚠️  orphan {page}  (no links from / reach it)')
+
+    broken = sum(1 for *_, problem in errors if problem == 'not found')
+    links = sum(len(entry['links']) for entry in entries.values())
+    anchors = sum(len(entry['ids']) for entry in entries.values())
+    print(f"\n{len(entries)} pages ({read} read), {links} links, {anchors} ids in {elapsed:.2f}s: "
+          f"{broken} broken, {len(errors) - broken} missing anchors, {len(redirects)} redirects, "
+          f"{len(orphans)} orphans")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
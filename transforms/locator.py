@@ -0,0 +1,245 @@
+"""
+Linear-time HTML structure locator.
+
+One forward pass over the page with a hand-rolled tag scanner records the
+exact [start, end) offsets of every element and of every <!-- @name -->
+marker. Transforms use these spans to splice replacements instead of
+nested DOTALL regexes, which backtrack on large pages and can latch onto
+the wrong closing tag.
+
+    doc = locate(html)
+    nav = doc.find('nav', id='navbar')
+    html = splice(html, [(nav.start, nav.end, new_navbar)])
+"""
+import re
+
+# Elements that never have a closing tag
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr',
+])
+
+# Elements whose content is raw text, not markup
+RAW_TEXT_ELEMENTS = frozenset(['script', 'style', 'textarea'])
+
+# Every alternative starts with '<', so search() jumps from one '<' to the next.
+# There the alternatives are tried in order and the second character decides:
+# '<!--' is a comment (tried before the general '<!' declaration, e.g.
+# DOCTYPE), a letter or '/' is a start or end tag. Anything else, like a
+# stray '<' in text, fails after a character or two and the scan moves on.
+TOKEN = re.compile(
+    r'<!--(?P<comment>.*?)-->'
+    r'|<(?P<close>/)?(?P<tag>[a-zA-Z][\w:.-]*)(?P<attrs>(?:[^>"\']|"[^"]*"|\'[^\']*\')*)>'
+    r'|<!(?:[^>]*)>',
+    re.DOTALL,
+)
+ATTR = re.compile(r'([^\s"\'=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+MARKER = re.compile(r'\s*@([\w-]+)\s*$')
+RAW_TEXT_END = {tag: re.compile(rf'</{tag}\s*>', re.IGNORECASE) for tag in RAW_TEXT_ELEMENTS}
+
+
+class Element:
+    """A located element. start/end cover the whole element including its
+    tags; inner_start/inner_end cover just its content."""
+
+    def __init__(self, tag, attrs, start, inner_start, depth):
+        self.tag = tag
+        self.attrs = attrs
+        self.start = start
+        self.inner_start = inner_start
+        self.inner_end = inner_start
+        self.end = inner_start
+        self.depth = depth
+        self.closed = False
+
+    @property
+    def id(self):
+        return self.attrs.get('id')
+
+    @property
+    def classes(self):
+        return self.attrs.get('class', '').split()
+
+    def matches(self, tag=None, id=None, cls=None, **attrs):
+        if tag is not None and self.tag != tag:
+            return False
+        if id is not None and self.attrs.get('id') != id:
+            return False
+        if cls is not None and not set(cls.split()) <= set(self.classes):
+            return False
+        return all(self.attrs.get(k.replace('_', '-')) == v for k, v in attrs.items())
+
+    def contains(self, other):
+        return self.start <= other.start and other.end <= self.end
+
+    def __repr__(self):
+        return f'<Element {self.tag} {self.start}:{self.end}>'
+
+
+class Marker:
+    """A <!-- @name --> comment."""
+
+    def __init__(self, name, start, end):
+        self.name = name
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f'<Marker @{self.name} {self.start}:{self.end}>'
+
+
+class Document:
+    def __init__(self, html):
+        self.html = html
+        self.elements = []  # in document order
+        self.markers = []
+        self.comments = []  # (text, start, end)
+        self._scan()
+
+    def _scan(self):
+        html = self.html
+        stack = []
+        pos = 0
+        while True:
+            m = TOKEN.search(html, pos)
+            if not m:
+                break
+            pos = m.end()
+            if m.group('comment') is not None:
+                text = m.group('comment')
+                self.comments.append((text.strip(), m.start(), m.end()))
+                marker = MARKER.match(text)
+                if marker:
+                    self.markers.append(Marker(marker.group(1), m.start(), m.end()))
+                continue
+            tag = m.group('tag')
+            if tag is None:
+                continue  # <!DOCTYPE ...>
+            tag = tag.lower()
+
+            if m.group('close'):
+                # Close the nearest matching open element; stray end tags are ignored
+                for i in range(len(stack) - 1, -1, -1):
+                    if stack[i].tag == tag:
+                        for el in stack[i + 1:]:
+                            el.inner_end = el.end = m.start()  # implicitly closed
+                        el = stack[i]
+                        el.inner_end, el.end, el.closed = m.start(), m.end(), True
+                        del stack[i:]
+                        break
+                continue
+
+            raw_attrs = m.group('attrs')
+            el = Element(tag, _parse_attrs(raw_attrs), m.start(), m.end(), len(stack))
+            self.elements.append(el)
+            if tag in VOID_ELEMENTS or raw_attrs.rstrip().endswith('/'):
+                el.closed = True
+                continue
+            if tag in RAW_TEXT_ELEMENTS:
+                close = RAW_TEXT_END[tag].search(html, pos)
+                inner_end = close.start() if close else len(html)
+                el.inner_end = inner_end
+                el.end = close.end() if close else len(html)
+                el.closed = bool(close)
+                pos = el.end
+                continue
+            stack.append(el)
+
+        for el in stack:
+            el.inner_end = el.end = len(html)
+
+    def find_all(self, tag=None, id=None, cls=None, within=None, **attrs):
+        """Elements matching tag/id/classes/attributes, in document order.
+
+        cls is a space-separated list of classes that must all be present;
+        other keyword arguments match attributes exactly (data_x -> data-x).
+        """
+        return [el for el in self.elements
+                if el.matches(tag, id, cls, **attrs) and (within is None or within.contains(el))]
+
+    def find(self, tag=None, id=None, cls=None, within=None, **attrs):
+        for el in self.elements:
+            if el.matches(tag, id, cls, **attrs) and (within is None or within.contains(el)):
+                return el
+        return None
+
+    def marker(self, name):
+        for marker in self.markers:
+            if marker.name == name:
+                return marker
+        return None
+
+    def text(self, el):
+        return self.html[el.start:el.end]
+
+    def inner(self, el):
+        return self.html[el.inner_start:el.inner_end]
+
+
+def locate(html):
+    """Scan html once and return its Document index."""
+    return Document(html)
+
+
+def _parse_attrs(raw):
+    attrs = {}
+    for m in ATTR.finditer(raw):
+        name = m.group(1).lower()
+        if name == '/':
+            continue
+        value = next((v for v in m.group(2, 3, 4) if v is not None), '')
+        attrs.setdefault(name, value)
+    return attrs
+
+
+def with_leading_comment(html, start, labels):
+    """Extend start back over a preceding <!-- label --> comment (e.g. Navbar)."""
+    i = start
+    while i > 0 and html[i - 1].isspace():
+        i -= 1
+    for label in labels:
+        comment = f'<!-- {label} -->'
+        if html.endswith(comment, 0, i):
+            return i - len(comment)
+    return start
+
+
+def line_span(html, start, end, blank_lines=False):
+    """Widen [start, end) to whole lines when nothing else shares them, so
+    removing an element doesn't leave blank indentation behind.
+
+    With blank_lines=True the blank lines around the block are absorbed too,
+    which keeps remove-then-reinsert rewrites stable across reruns.
+    """
+    line_start = html.rfind('\n', 0, start) + 1
+    line_end = html.find('\n', end)
+    line_end = len(html) if line_end == -1 else line_end + 1
+    if html[line_start:start].strip() or html[end:line_end].strip():
+        return start, end
+    if blank_lines:
+        i = line_start
+        while i > 0 and html[i - 1].isspace():
+            i -= 1
+        line_start = html.find('\n', i, line_start) + 1 or line_start
+        j = line_end
+        while j < len(html) and html[j].isspace():
+            j += 1
+        line_end = html.rfind('\n', line_end, j) + 1 or line_end
+    return line_start, line_end
+
+
+def splice(html, edits):
+    """Apply (start, end, replacement) edits in a single join.
+
+    Edits must not overlap; they may be given in any order.
+    """
+    parts = []
+    pos = 0
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1])):
+        if start < pos:
+            raise ValueError(f'Overlapping edits at offset {start}')
+        parts.append(html[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(html[pos:])
+    return ''.join(parts)
@@ -0,0 +1,253 @@
+"""
+Small Markdown renderer for blog posts (no third-party dependencies).
+
+Covers what the posts use: ATX headings (with generated or {#explicit}
+ids), paragraphs, nested bullet/numbered lists, blockquotes, fenced code,
+horizontal rules, pipe tables and raw HTML blocks (CTA boxes are plain
+HTML); inline code, **strong**, *em*, links, images, <autolinks>, inline
+HTML and hard line breaks.
+
+    html, headings = render(text)   # headings: [(level, id, text), ...]
+"""
+import html as htmllib
+import re
+
+FENCE = re.compile(r'^(\s*)(`{3,}|~{3,})\s*([\w+-]*)\s*$')
+HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+HEADING_ID = re.compile(r'\s*\{#([\w-]+)\}$')
+RULE = re.compile(r'^\s{0,3}([-*_])(?:\s*\1){2,}\s*$')
+LIST_ITEM = re.compile(r'^(\s*)([-*+]|\d+[.)])\s+(.*)$')
+QUOTE = re.compile(r'^\s{0,3}>\s?(.*)$')
+TABLE_DIVIDER = re.compile(r'^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$')
+HTML_BLOCK = re.compile(r'^\s{0,3}<(/?[a-zA-Z][\w-]*|!--)')
+
+INLINE = re.compile(
+    r'(?P<code>`+)(?P<code_text>.+?)(?P=code)'
+    r'|!\[(?P<alt>[^\]]*)\]\((?P<src>[^)\s]+)(?:\s+"(?P<img_title>[^"]*)")?\)'
+    r'|\[(?P<text>(?:[^\]\\]|\\.)+)\]\((?P<href>[^)\s]+)(?:\s+"(?P<title>[^"]*)")?\)'
+    r'|<(?P<autolink>(?:https?://|mailto:)[^>\s]+)>'
+    r'|(?P<tag></?[a-zA-Z][\w-]*(?:\s+[^<>]*?)?/?>|<!--.*?-->)'
+    r'|(?P<strong>\*\*|__)(?P<strong_text>.+?)(?P=strong)'
+    r'|(?P<em>[*_])(?P<em_text>[^\s*_](?:.*?[^\s])?)(?P=em)'
+    r'|(?P<escape>\\[\\`*_{}\[\]()#+\-.!>|])'
+    r'|(?P<br> {2,}\n)'
+)
+SLUG_STRIP = re.compile(r'[^\w\s-]')
+SLUG_SPACE = re.compile(r'[\s_-]+')
+
+
+def slugify(text):
+    text = SLUG_STRIP.sub('', htmllib.unescape(re.sub(r'<[^>]+>', '', text)).lower())
+    return SLUG_SPACE.sub('-', text).strip('-') or 'section'
+
+
+def render_inline(text):
+    parts = []
+    pos = 0
+    for m in INLINE.finditer(text):
+        parts.append(htmllib.escape(text[pos:m.start()], quote=False))
+        pos = m.end()
+        if m.group('code'):
+            parts.append(f"<code>{htmllib.escape(m.group('code_text').strip(), quote=False)}</code>")
+        elif m.group('src') is not None:
+            title = f' title="{htmllib.escape(m.group("img_title"))}"' if m.group('img_title') else ''
+            parts.append(f'<img src="{htmllib.escape(m.group("src"))}" alt="{htmllib.escape(m.group("alt"))}"{title} loading="lazy">')
+        elif m.group('href') is not None:
+            title = f' title="{htmllib.escape(m.group("title"))}"' if m.group('title') else ''
+            parts.append(f'<a href="{htmllib.escape(m.group("href"))}"{title}>{render_inline(m.group("text"))}</a>')
+        elif m.group('autolink'):
+            url = htmllib.escape(m.group('autolink'))
+            parts.append(f'<a href="{url}">{url.replace("mailto:", "", 1)}</a>')
+        elif m.group('tag'):
+            parts.append(m.group('tag'))
+        elif m.group('strong'):
+            parts.append(f"<strong>{render_inline(m.group('strong_text'))}</strong>")
+        elif m.group('em'):
+            parts.append(f"<em>{render_inline(m.group('em_text'))}</em>")
+        elif m.group('escape'):
+            parts.append(htmllib.escape(m.group('escape')[1], quote=False))
+        else:
+            parts.append('<br>\n')
+    parts.append(htmllib.escape(text[pos:], quote=False))
+    return ''.join(parts)
+
+
+class Renderer:
+    def __init__(self):
+        self.headings = []
+        self.ids = set()
+
+    def heading_id(self, text):
+        m = HEADING_ID.search(text)
+        if m:
+            return text[:m.start()], m.group(1)
+        base = slug = slugify(text)
+        n = 2
+        while slug in self.ids:
+            slug = f'{base}-{n}'
+            n += 1
+        return text, slug
+
+    def blocks(self, lines):
+        out = []
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            if not line.strip():
+                i += 1
+                continue
+
+            fence = FENCE.match(line)
+            if fence:
+                end = i + 1
+                while end < len(lines) and not lines[end].strip().startswith(fence.group(2)):
+                    end += 1
+                code = htmllib.escape('\n'.join(lines[i + 1:end]), quote=False)
+                lang = f' class="language-{fence.group(3)}"' if fence.group(3) else ''
+                out.append(f'<pre><code{lang}>{code}</code></pre>')
+                i = end + 1
+                continue
+
+            heading = HEADING.match(line)
+            if heading:
+                level = len(heading.group(1))
+                text, slug = self.heading_id(heading.group(2))
+                self.ids.add(slug)
+                inner = render_inline(text)
+                self.headings.append((level, slug, inner))
+                out.append(f'<h{level} id="{slug}">{inner}</h{level}>')
+                i += 1
+                continue
+
+            if RULE.match(line):
+                out.append('<hr>')
+                i += 1
+                continue
+
+            if QUOTE.match(line):
+                quoted = []
+                while i < len(lines) and lines[i].strip() and QUOTE.match(lines[i]):
+                    quoted.append(QUOTE.match(lines[i]).group(1))
+                    i += 1
+                out.append(f"<blockquote>\n{self.blocks(quoted)}\n</blockquote>")
+                continue
+
+            if LIST_ITEM.match(line):
+                i = self.list_block(lines, i, out)
+                continue
+
+            if '|' in line and i + 1 < len(lines) and TABLE_DIVIDER.match(lines[i + 1]):
+                i = self.table(lines, i, out)
+                continue
+
+            if HTML_BLOCK.match(line):
+                end = i
+                while end < len(lines) and lines[end].strip():
+                    end += 1
+                out.append('\n'.join(lines[i:end]))
+                i = end
+                continue
+
+            para = []
+            while i < len(lines) and lines[i].strip():
+                if para and (HEADING.match(lines[i]) or FENCE.match(lines[i]) or QUOTE.match(lines[i])
+                             or RULE.match(lines[i]) or LIST_ITEM.match(lines[i])):
+                    break
+                para.append(lines[i].lstrip())
+                i += 1
+            out.append(f"<p>{render_inline(chr(10).join(para))}</p>")
+        return '\n\n'.join(out)
+
+    def list_block(self, lines, i, out):
+        first = LIST_ITEM.match(lines[i])
+        indent = len(first.group(1))
+        ordered = first.group(2)[0].isdigit()
+        tag = 'ol' if ordered else 'ul'
+        start = ''
+        if ordered and int(first.group(2)[:-1]) != 1:
+            start = f' start="{int(first.group(2)[:-1])}"'
+
+        items = []
+        while i < len(lines):
+            m = LIST_ITEM.match(lines[i])
+            if not m or len(m.group(1)) != indent or m.group(2)[0].isdigit() != ordered:
+                break
+            body = [m.group(3)]
+            i += 1
+            # Continuation lines, nested lists and indented paragraphs
+            while i < len(lines):
+                line = lines[i]
+                if not line.strip():
+                    if i + 1 < len(lines) and _indent(lines[i + 1]) > indent:
+                        body.append('')
+                        i += 1
+                        continue
+                    break
+                nested = LIST_ITEM.match(line)
+                if nested and len(nested.group(1)) <= indent:
+                    break
+                if not nested and _indent(line) <= indent and body[-1] == '':
+                    break
+                body.append(line[indent + 2:] if _indent(line) >= indent + 2 else line.lstrip())
+                i += 1
+            items.append(body)
+
+        rendered = []
+        for body in items:
+            if '' in body or any(LIST_ITEM.match(line) for line in body[1:]):
+                split = 1
+                while split < len(body) and body[split] and not LIST_ITEM.match(body[split]):
+                    split += 1
+                inner = render_inline('\n'.join(body[:split]))
+                rest = self.blocks(body[split:])
+                rendered.append(f'<li>{inner}\n{rest}</li>' if rest else f'<li>{inner}</li>')
+            else:
+                rendered.append(f"<li>{render_inline(chr(10).join(body))}</li>")
+        out.append(f'<{tag}{start}>\n' + '\n'.join(rendered) + f'\n</{tag}>')
+        return i
+
+    def table(self, lines, i, out):
+        header = _cells(lines[i])
+        aligns = []
+        for cell in _cells(lines[i + 1]):
+            if cell.startswith(':') and cell.endswith(':'):
+                aligns.append(' style="text-align: center"')
+            elif cell.endswith(':'):
+                aligns.append(' style="text-align: right"')
+            else:
+                aligns.append('')
+        i += 2
+        rows = []
+        while i < len(lines) and '|' in lines[i] and lines[i].strip():
+            rows.append(_cells(lines[i]))
+            i += 1
+
+        def row(cells, tag):
+            cells = (cells + [''] * len(header))[:len(header)]
+            return '<tr>' + ''.join(f'<{tag}{align}>{render_inline(cell)}</{tag}>'
+                                    for cell, align in zip(cells, aligns + [''] * len(cells))) + '</tr>'
+
+        body = '\n'.join(row(cells, 'td') for cells in rows)
+        out.append(f'<div class="overflow-x-auto">\n<table>\n<thead>\n{row(header, "th")}\n</thead>\n'
+                   f'<tbody>\n{body}\n</tbody>\n</table>\n</div>')
+        return i
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip())
+
+
+def _cells(line):
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|') and not line.endswith('\\|'):
+        line = line[:-1]
+    return [cell.strip().replace('\\|', '|') for cell in re.split(r'(?<!\\)\|', line)]
+
+
+def render(text):
+    """Markdown -> (html, headings), headings being [(level, id, inner html)]."""
+    renderer = Renderer()
+    lines = text.replace('\r\n', '\n').replace('\t', '    ').split('\n')
+    return renderer.blocks(lines), renderer.headings
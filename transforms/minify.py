@@ -0,0 +1,373 @@
+"""
+HTML minification and precompressed .gz/.br siblings for the build output.
+
+Runs after vite build and transforms.assets (npm's postbuild hook). Every
+HTML file in dist/ is minified in place:
+
+- whitespace runs collapse to one space (or one newline); whitespace next
+  to block-level tags and between SVG shapes is dropped. <pre>, <textarea>,
+  <script> and <style> bodies are left byte for byte (JSON-LD is compacted).
+- comments are removed, except <!-- @name --> section markers and
+  conditional comments.
+- whitespace inside tags collapses, including multi-line class lists and
+  SVG path data.
+
+Then every HTML, CSS, JS and SVG file gets a .gz (level 9) and a .br
+(quality 11) sibling for servers that serve precompressed files; a sibling
+that isn't smaller than the file is not written. Brotli needs the brotli
+package (pip install brotli); without it only .gz is written.
+
+Files are processed in a process pool (--jobs). .minify-cache.json records
+each file's hash before and after; a file still as the last run left it
+(siblings included) is not touched again. vite build rewrites dist/ with
+unminified files every time, so the minified file and its siblings are
+also kept in .minify-cache/ under the hash of the input: a file vite wrote
+the same as last time is restored from there instead of being minified
+and compressed again.
+
+    npm run build                          # runs this as postbuild
+    python3 -m transforms.minify --jobs 0  # one worker per CPU
+    python3 -m transforms.minify --dry-run # sizes only
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import ROOT
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CACHE_FILE = '.minify-cache.json'
+CACHE_DIR = '.minify-cache'  # <input hash>.min / .gz / .br
+CACHE_VERSION = 2
+COMPRESS_EXTENSIONS = ('.html', '.css', '.js', '.mjs', '.svg', '.json', '.xml', '.txt', '.webmanifest')
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+TOKEN = re.compile(r'''
+    (?P<comment><!--.*?-->)
+  | (?P<raw><(?P<rawname>pre|textarea|script|style)\b(?:[^>"']|"[^"]*"|'[^']*')*>.*?</(?P=rawname)\s*>)
+  | (?P<decl><![^>]*>)
+  | (?P<tag></?[a-zA-Z][^\s/>]*(?:[^>"']|"[^"]*"|'[^']*')*>)
+  | (?P<text>[^<]+|<)
+''', re.DOTALL | re.IGNORECASE | re.VERBOSE)
+ATTR = re.compile(r'''\s*([^\s=/>"']+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>"']+))?''')
+TAG_NAME = re.compile(r'</?([a-zA-Z][^\s/>]*)')
+WHITESPACE = re.compile(r'\s+')
+# Kept: section markers the transforms locate, and IE conditional comments
+KEEP_COMMENT = re.compile(r'<!--\s*@|<!--\[if|<!\[endif')
+LD_JSON = re.compile(r'(<script\b[^>]*\btype\s*=\s*["\']application/ld\+json["\'][^>]*>)(.*?)(</script\s*>)',
+                     re.DOTALL | re.IGNORECASE)
+
+# Attribute values whose whitespace never matters
+COLLAPSE_ATTRS = frozenset(['class', 'style', 'd', 'points', 'viewbox', 'transform', 'srcset', 'sizes'])
+# Whitespace next to these tags never renders. Inline elements (a, span,
+# img, svg itself, picture, ...) are not listed: a space next to them can.
+BLOCK_TAGS = frozenset('''
+    html head body meta link title base div section nav header footer main article aside address
+    ul ol li dl dt dd p h1 h2 h3 h4 h5 h6 form fieldset legend hr br table caption colgroup col
+    thead tbody tfoot tr td th figure figcaption blockquote details summary dialog option optgroup
+    g path circle rect line polyline polygon ellipse defs lineargradient radialgradient stop
+    clippath mask symbol use filter fegaussianblur feoffset feblend fecolormatrix femerge femergenode
+'''.split())
+
+
+def sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def collapse(text):
+    return WHITESPACE.sub(lambda m: '\n' if '\n' in m.group() else ' ', text)
+
+
+def minify_tag(tag):
+    """Tag with whitespace between attributes (and inside COLLAPSE_ATTRS values) collapsed."""
+    name = TAG_NAME.match(tag)
+    body = tag[name.end():-1]
+    closing = body.rstrip().endswith('/')
+    if closing:
+        body = body.rstrip()[:-1]
+    parts = [name.group()]
+    pos = 0
+    for m in ATTR.finditer(body):
+        if m.start() != pos:
+            return tag  # something we don't parse; leave it
+        pos = m.end()
+        attr, value = m.groups()
+        if value is None:
+            parts.append(attr)
+            continue
+        if attr.lower() in COLLAPSE_ATTRS and value[0] in '"\'':
+            value = value[0] + WHITESPACE.sub(' ', value[1:-1]).strip() + value[-1]
+        parts.append(f'{attr}={value}')
+    if body[pos:].strip():
+        return tag
+    return ' '.join(parts) + ('/>' if closing else '>')
+
+
+def _compact_json(m):
+    try:
+        data = json.loads(m.group(2))
+    except ValueError:
+        return m.group()
+    return m.group(1) + json.dumps(data, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/') + m.group(3)
+
+
+def minify_html(html):
+    tokens = []  # [kind, text, block]
+    for m in TOKEN.finditer(html):
+        kind = m.lastgroup if m.lastgroup != 'rawname' else 'raw'
+        text = m.group()
+        if kind == 'comment':
+            if not KEEP_COMMENT.match(text):
+                continue
+            tokens.append(['comment', text, True])
+        elif kind == 'raw':
+            name = m.group('rawname').lower()
+            open_end = text.index('>', len(name) + 1) + 1
+            text = minify_tag(text[:open_end]) + text[open_end:]
+            if name == 'script':
+                text = LD_JSON.sub(_compact_json, text)
+            tokens.append(['raw', text, name not in ('pre', 'textarea', 'script')])
+        elif kind == 'tag':
+            tokens.append(['tag', minify_tag(text), TAG_NAME.match(text).group(1).lower() in BLOCK_TAGS])
+        elif kind == 'decl':
+            tokens.append(['decl', text, True])
+        elif tokens and tokens[-1][0] == 'text':
+            # Text either side of a dropped comment is one run of text
+            tokens[-1][1] += text
+        else:
+            tokens.append(['text', text, False])
+
+    out = []
+    for i, (kind, text, block) in enumerate(tokens):
+        if kind == 'text':
+            text = collapse(text)
+            if i == 0 or tokens[i - 1][2]:
+                text = text.lstrip()
+            if i + 1 == len(tokens) or tokens[i + 1][2]:
+                text = text.rstrip()
+        out.append(text)
+    result = ''.join(out)
+    return result + '\n' if html.endswith('\n') else result
+
+
+def compressed(data):
+    """{'.gz': bytes, '.br': bytes} for the formats available."""
+    found = {'.gz': gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        found['.br'] = brotli.compress(data, quality=BROTLI_QUALITY)
+    return found
+
+
+def sibling_extensions():
+    return ('.gz', '.br') if brotli is not None else ('.gz',)
+
+
+def write_file(path, data):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def restore(store, digest, entry):
+    """{suffix: bytes} of what minifying and compressing the input with this hash gave, or None."""
+    if store is None or entry is None or entry.get('input') != digest:
+        return None
+    suffixes = ['.min'] if entry['hash'] != digest else []
+    for ext in sibling_extensions():
+        key = 'gzip' if ext == '.gz' else 'brotli'
+        if key not in entry:
+            return None  # brotli wasn't installed last time
+        if entry[key] is not None:
+            suffixes.append(ext)
+    found = {}
+    try:
+        for suffix in suffixes:
+            with open(os.path.join(store, digest + suffix), 'rb') as f:
+                found[suffix] = f.read()
+    except OSError:
+        return None
+    return found
+
+
+def process(directory, path, dry_run=False, store=None, previous=None):
+    """Minify (HTML) and compress one file; returns (path, cache entry).
+
+    store is the CACHE_DIR to reuse and keep outputs in (None: don't), and
+    previous the file's entry from the last run. Top-level so it can run in
+    pool workers.
+    """
+    full = os.path.join(directory, path)
+    with open(full, 'rb') as f:
+        original = f.read()
+    digest = sha(original)
+    stored = restore(store, digest, previous)
+    if stored is not None:
+        data = stored.get('.min', original)
+        packed_by_ext = {ext: stored[ext] for ext in sibling_extensions() if ext in stored}
+        entry = dict(previous)
+    else:
+        data = original
+        if path.endswith('.html'):
+            data = minify_html(original.decode('utf-8')).encode('utf-8')
+        packed_by_ext = {ext: packed for ext, packed in compressed(data).items() if len(packed) < len(data)}
+        entry = {'input': digest, 'hash': sha(data), 'original': len(original), 'minified': len(data)}
+        for ext in sibling_extensions():
+            entry['gzip' if ext == '.gz' else 'brotli'] = len(packed_by_ext[ext]) if ext in packed_by_ext else None
+        if store is not None and not dry_run:
+            os.makedirs(store, exist_ok=True)
+            for suffix, blob in list(packed_by_ext.items()) + ([('.min', data)] if data != original else []):
+                write_file(os.path.join(store, digest + suffix), blob)
+    if not dry_run:
+        for ext in sibling_extensions():
+            if ext in packed_by_ext:
+                write_file(full + ext, packed_by_ext[ext])
+            elif os.path.exists(full + ext):
+                os.remove(full + ext)
+        if data != original:
+            write_file(full, data)
+    return path, entry
+
+
+def walk(directory):
+    found = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        rel = os.path.relpath(dirpath, directory).replace(os.sep, '/')
+        for name in sorted(filenames):
+            if name.endswith(COMPRESS_EXTENSIONS) and not name.startswith('.'):
+                found.append(name if rel == '.' else f'{rel}/{name}')
+    return found
+
+
+def is_current(directory, path, entry):
+    """True if path is still what the last run left, siblings included."""
+    if entry is None:
+        return False
+    full = os.path.join(directory, path)
+    with open(full, 'rb') as f:
+        if sha(f.read()) != entry['hash']:
+            return False
+    keys = {'.gz': 'gzip', '.br': 'brotli'}
+    return all(key in entry and (entry[key] is None or os.path.exists(full + ext))
+               for ext, key in keys.items() if ext in sibling_extensions())
+
+
+def load_cache(root=ROOT):
+    try:
+        with open(os.path.join(root, CACHE_FILE), 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get('files', {}) if cache.get('version') == CACHE_VERSION else {}
+
+
+def save_cache(files, root=ROOT):
+    path = os.path.join(root, CACHE_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'version': CACHE_VERSION, 'files': files}, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(path + '.tmp', path)
+
+
+def prune_store(store, files):
+    """Remove stored outputs no cache entry points at any more."""
+    keep = {entry.get('input') for entry in files.values()}
+    try:
+        names = os.listdir(store)
+    except OSError:
+        return
+    for filename in names:
+        if filename.split('.', 1)[0] not in keep:
+            os.remove(os.path.join(store, filename))
+
+
+def run(directory, name, jobs=1, dry_run=False, force=False, root=ROOT):
+    """Process stale files under directory; returns (entries by path, paths processed)."""
+    cache = {} if force else load_cache(root)
+    store = os.path.join(root, CACHE_DIR)
+    paths = walk(directory)
+    entries = {}
+    stale = []
+    for path in paths:
+        entry = cache.get(f'{name}/{path}')
+        if is_current(directory, path, entry):
+            entries[path] = entry
+        else:
+            stale.append(path)
+
+    jobs = jobs or os.cpu_count() or 1
+    previous = [cache.get(f'{name}/{path}') for path in stale]
+    if jobs > 1 and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(stale))) as pool:
+            done = list(pool.map(process, [directory] * len(stale), stale, [dry_run] * len(stale),
+                                 [store] * len(stale), previous))
+    else:
+        done = [process(directory, path, dry_run, store, entry) for path, entry in zip(stale, previous)]
+    entries.update(done)
+
+    if not dry_run:
+        # Entries for other directories (e.g. --dir public) are kept
+        files = {key: value for key, value in cache.items() if not key.startswith(name + '/')}
+        files.update((f'{name}/{path}', entry) for path, entry in entries.items())
+        save_cache(files, root)
+        prune_store(store, files)
+    return entries, stale
+
+
+def kb(size):
+    return '-' if size is None else f'{size / 1024:.1f} KB'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.minify', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default='dist', help='build output to process (default: dist)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='process files in N worker processes (0 = one per CPU)')
+    parser.add_argument('--force', action='store_true', help=f'ignore {CACHE_FILE} and process every file')
+    parser.add_argument('--dry-run', action='store_true', help="report sizes, don't write")
+    args = parser.parse_args(argv)
+
+    directory = os.path.join(ROOT, args.dir)
+    if not os.path.isdir(directory):
+        print(f'✗ {args.dir}/ not found (run npm run build first)')
+        return 1
+    if brotli is None:
+        print('⚠️  brotli not installed; writing .gz only (pip install brotli)')
+    entries, stale = run(directory, args.dir.strip('/'), args.jobs, args.dry_run, args.force)
+
+    stale = set(stale)
+    pages = [path for path in entries if path.endswith('.html')]
+    width = max((len(path) for path in pages), default=4)
+    print(f"{'page':<{width}}  {'original':>10}  {'minified':>10}  {'gzip':>10}  {'brotli':>10}")
+    for path in pages:
+        entry = entries[path]
+        saved = 1 - entry['minified'] / entry['original'] if entry['original'] else 0
+        mark = '' if path in stale else '  (unchanged)'
+        print(f"{path:<{width}}  {kb(entry['original']):>10}  {kb(entry['minified']):>10}  "
+              f"{kb(entry['gzip']):>10}  {kb(entry.get('brotli')):>10}  -{saved:.0%}{mark}")
+
+    def total(key, paths):
+        return sum(entries[p].get(key) or entries[p]['minified'] for p in paths)
+    others = [path for path in entries if not path.endswith('.html')]
+    print(f"\n{len(pages)} pages: {kb(total('original', pages))} -> {kb(total('minified', pages))} minified, "
+          f"{kb(total('gzip', pages))} gzip" + (f", {kb(total('brotli', pages))} brotli" if brotli else ''))
+    print(f"{len(others)} other files: {kb(total('minified', others))} -> {kb(total('gzip', others))} gzip"
+          + (f", {kb(total('brotli', others))} brotli" if brotli else ''))
+    print(f"{len(stale)} processed, {len(entries) - len(stale)} unchanged" + (' (dry run)' if args.dry_run else ''))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
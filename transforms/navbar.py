@@ -0,0 +1,119 @@
+"""
+Navbar transforms: sync the shared navbar and patch its link lists.
+
+sync-navbar        -- replace each page's navbar with partials/navbar.html
+calculator-nav     -- add the ROI Calculator link after Features
+update-nav         -- swap the desktop/mobile link lists for the current set
+"""
+import re
+
+from .includes import render_partial
+from .locator import line_span, locate, splice, with_leading_comment
+from .registry import transform
+
+# Pages to update (all except blog/index.html which is the source)
+NAVBAR_PAGES = [
+    ("index.html", ""),  # Homepage uses # (empty prefix)
+    ("calculator.html", "/"),
+    ("privacy.html", "/"),
+    ("terms.html", "/"),
+    ("periochamp.html", "/"),
+    ("signup.html", "/"),
+    ("contact.html", "/"),
+    ("blog/best-ai-dental-companion-2025.html", "/"),
+    ("blog/dental-practice-ai-assistant-guide.html", "/"),
+    ("blog/patient-compliance-dental-apps.html", "/"),
+    ("blog/index.html", "/"),
+]
+
+
+def anchor_prefix(path):
+    """Homepage links to #anchor, every other page to /#anchor."""
+    return dict(NAVBAR_PAGES).get(path, '/')
+
+
+NAVBAR_LABELS = ('@navbar', 'Navbar')
+
+
+def navbar_removals(doc):
+    """(start, end, '') edits removing every navbar and orphaned mobile menu.
+
+    A navbar is nav#navbar, a fixed-position <nav>, or any <nav> directly
+    after a <!-- Navbar --> / <!-- @navbar --> comment.
+    """
+    html = doc.html
+    navs = []
+    for el in doc.find_all('nav'):
+        start = with_leading_comment(html, el.start, NAVBAR_LABELS)
+        if el.id == 'navbar' or el.attrs.get('class', '').startswith('fixed') or start != el.start:
+            if not any(nav.contains(el) for nav, _ in navs):
+                navs.append((el, start))
+    spans = [(start, el.end) for el, start in navs]
+    for menu in doc.find_all('div', id='mobile-menu'):
+        if not any(nav.contains(menu) for nav, _ in navs):
+            spans.append((menu.start, menu.end))
+    return [line_span(html, start, end, blank_lines=True) + ('',) for start, end in spans]
+
+
+@transform('sync-navbar', pages=[path for path, _ in NAVBAR_PAGES])
+def sync_navbar(content, page):
+    # Render the navbar partial with the correct anchor prefix
+    navbar = render_partial('navbar', {'anchor_prefix': anchor_prefix(page.path)}, page.root, page)
+
+    # Remove existing navbar (including mobile menu) and insert the new one after <body>
+    doc = locate(content)
+    edits = navbar_removals(doc)
+    body = doc.find('body')
+    if body:
+        edits.append((body.inner_start, body.inner_start, '\n\n' + navbar + '\n'))
+    return splice(content, edits)
+
+
+@transform('calculator-nav')
+def calculator_nav(content, page):
+    # Add calculator to desktop nav (after Features)
+    content = re.sub(
+        r'(<a href="/features\.html"[^>]+>Features</a>\s*)'
+        r'(<a href="/about\.html")',
+        r'\1<a href="/calculator.html" class="px-4 py-2 text-sm font-medium text-white/80 hover:text-white transition-all">ROI Calculator</a>\n                    \2',
+        content
+    )
+
+    # Add calculator to mobile nav (after Features)
+    content = re.sub(
+        r'(<a href="/features\.html"[^>]+rounded-lg">Features</a>\s*)'
+        r'(<a href="/about\.html"[^>]+rounded-lg">)',
+        r'\1<a href="/calculator.html" class="block px-4 py-3 text-sm font-medium text-white/80 hover:text-white hover:bg-white/10 rounded-lg">ROI Calculator</a>\n                \2',
+        content
+    )
+    return content
+
+
+# New desktop nav (no How It Works)
+NEW_DESKTOP_NAV = '''<div class="hidden md:flex items-center gap-1">
+                    <a href="/features.html" class="px-4 py-2 text-sm font-medium text-white/80 hover:text-white transition-all">Features</a>
+                    <a href="/about.html" class="px-4 py-2 text-sm font-medium text-white/80 hover:text-white transition-all">About</a>
+                    <a href="/blog/" class="px-4 py-2 text-sm font-medium text-white/80 hover:text-white transition-all">Blog</a>
+                    <a href="/contact.html" class="px-4 py-2 text-sm font-medium text-white/80 hover:text-white transition-all">Contact</a>
+                </div>'''
+
+# New mobile nav
+NEW_MOBILE_NAV = '''<div class="px-4 py-4 space-y-1">
+                <a href="/features.html" class="block px-4 py-3 text-sm font-medium text-white/80 hover:text-white hover:bg-white/10 rounded-lg">Features</a>
+                <a href="/about.html" class="block px-4 py-3 text-sm font-medium text-white/80 hover:text-white hover:bg-white/10 rounded-lg">About</a>
+                <a href="/blog/" class="block px-4 py-3 text-sm font-medium text-white/80 hover:text-white hover:bg-white/10 rounded-lg">Blog</a>
+                <a href="/contact.html" class="block px-4 py-3 text-sm font-medium text-white/80 hover:text-white hover:bg-white/10 rounded-lg">Contact</a>
+            </div>'''
+
+
+@transform('update-nav', exclude=['pricing.html'])
+def update_nav(content, page):
+    doc = locate(content)
+    edits = []
+    # Desktop link list, and the link list inside the mobile menu
+    for el in doc.find_all('div', cls='hidden md:flex items-center gap-1'):
+        edits.append((el.start, el.end, NEW_DESKTOP_NAV))
+    for menu in doc.find_all('div', id='mobile-menu'):
+        for el in doc.find_all('div', cls='px-4 py-4 space-y-1', within=menu):
+            edits.append((el.start, el.end, NEW_MOBILE_NAV))
+    return splice(content, edits)
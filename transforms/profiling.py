@@ -0,0 +1,278 @@
+"""
+Per-transform profiling for the engine (python3 -m transforms ... --profile FILE).
+
+Every transform call on every page is timed, with bytes in and out, whether
+it changed the page, and what its regular expressions did. While a
+transform runs, the re module functions (re.sub, re.search, re.finditer,
+...) and every compiled pattern held in a transforms.* module global are
+swapped for counting wrappers, so each pattern's calls, matches,
+substitutions and time are recorded without touching the transforms.
+Patterns kept inside lists or dicts are only seen when passed to re.*.
+
+FILE ending in .json gets a Chrome trace (chrome://tracing, Perfetto) with
+one lane per worker process; anything else gets one JSON object per line.
+A summary per transform is printed, flagging transforms that changed no
+page, transforms whose own patterns matched nothing, and substitutions
+that never fired: the usual signs of markup drift. Matches of patterns
+from other modules (the locator's tag scanner, sections, ...) are counted
+apart as helper matches, since they hit on every page whatever the
+transform finds.
+
+    python3 -m transforms homepage --no-cache --profile profile.jsonl
+    python3 -m transforms chrome --no-cache --jobs 0 --profile trace.json
+"""
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+
+FUNCTIONS = ('sub', 'subn', 'search', 'match', 'fullmatch', 'findall', 'finditer', 'split')
+_REAL = {name: getattr(re, name) for name in FUNCTIONS}
+KEY_LENGTH = 80
+TOP_PATTERNS = 5
+
+
+def pattern_key(pattern):
+    source = pattern if isinstance(pattern, (str, bytes)) else pattern.pattern
+    if isinstance(source, bytes):
+        source = source.decode('latin-1')
+    source = ' '.join(source.split())
+    return source if len(source) <= KEY_LENGTH else source[:KEY_LENGTH - 3] + '...'
+
+
+class Counter:
+    """Per-pattern calls, matches, substitutions and seconds for one transform call."""
+
+    def __init__(self):
+        self.patterns = {}
+
+    def add(self, key, module, seconds=0.0, matches=0, subs=0, calls=0, rewrites=False):
+        entry = self.patterns.setdefault(key, {'calls': 0, 'matches': 0, 'subs': 0, 'seconds': 0.0,
+                                               'rewrites': False, 'module': module})
+        entry['rewrites'] = entry['rewrites'] or rewrites
+        entry['calls'] += calls
+        entry['matches'] += matches
+        entry['subs'] += subs
+        entry['seconds'] += seconds
+
+    def call(self, kind, func, pattern, args, kwargs, module):
+        """Run func (the real re function or pattern method) and count what it did.
+
+        module is the one the pattern belongs to: where it is a global, or
+        where re.* was called with it.
+        """
+        key = pattern_key(pattern)
+        if kind == 'finditer':
+            self.add(key, module, calls=1)
+            return self._iterate(key, module, func(*args, **kwargs))
+        start = time.perf_counter()
+        value = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        subs = 0
+        if kind == 'sub':
+            value, subs = value  # func is subn
+            matches = subs
+        elif kind == 'subn':
+            matches = subs = value[1]
+        elif kind == 'findall':
+            matches = len(value)
+        elif kind == 'split':
+            groups = pattern.groups if isinstance(pattern, re.Pattern) else re.compile(pattern).groups
+            matches = (len(value) - 1) // (groups + 1)
+        else:
+            matches = int(value is not None)
+        self.add(key, module, seconds, matches, subs, calls=1, rewrites=kind in ('sub', 'subn'))
+        return value
+
+    def _iterate(self, key, module, iterator):
+        matches = 0
+        seconds = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    m = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    seconds += time.perf_counter() - start
+                matches += 1
+                yield m
+        finally:
+            self.add(key, module, seconds, matches)
+
+    def module_function(self, kind):
+        real = _REAL['subn'] if kind == 'sub' else _REAL[kind]
+
+        def counted(pattern, *args, **kwargs):
+            if isinstance(pattern, CountingPattern):
+                return getattr(pattern, kind)(*args, **kwargs)
+            module = sys._getframe(1).f_globals.get('__name__')
+            return self.call(kind, real, pattern, (pattern,) + args, kwargs, module)
+        return counted
+
+
+class CountingPattern:
+    """Stands in for a compiled pattern, counting through a Counter."""
+
+    def __init__(self, pattern, counter, module):
+        self._pattern = pattern
+        self._counter = counter
+        self._module = module
+
+    def __getattr__(self, name):
+        return getattr(self._pattern, name)
+
+    def _count(self, kind, args, kwargs):
+        func = self._pattern.subn if kind == 'sub' else getattr(self._pattern, kind)
+        return self._counter.call(kind, func, self._pattern, args, kwargs, self._module)
+
+    def sub(self, *args, **kwargs):
+        return self._count('sub', args, kwargs)
+
+    def subn(self, *args, **kwargs):
+        return self._count('subn', args, kwargs)
+
+    def search(self, *args, **kwargs):
+        return self._count('search', args, kwargs)
+
+    def match(self, *args, **kwargs):
+        return self._count('match', args, kwargs)
+
+    def fullmatch(self, *args, **kwargs):
+        return self._count('fullmatch', args, kwargs)
+
+    def findall(self, *args, **kwargs):
+        return self._count('findall', args, kwargs)
+
+    def finditer(self, *args, **kwargs):
+        return self._count('finditer', args, kwargs)
+
+    def split(self, *args, **kwargs):
+        return self._count('split', args, kwargs)
+
+
+@contextmanager
+def counting(counter):
+    """Route re.* and the transforms' module-level patterns through counter."""
+    patched = []
+    for name, module in list(sys.modules.items()):
+        if module is not None and (name == 'transforms' or name.startswith('transforms.')):
+            patched.extend((module, attr, value) for attr, value in vars(module).items()
+                           if isinstance(value, re.Pattern))
+    for module, attr, value in patched:
+        setattr(module, attr, CountingPattern(value, counter, module.__name__))
+    for kind in FUNCTIONS:
+        setattr(re, kind, counter.module_function(kind))
+    try:
+        yield
+    finally:
+        for kind, func in _REAL.items():
+            setattr(re, kind, func)
+        for module, attr, value in patched:
+            setattr(module, attr, value)
+
+
+def profiled(t, page):
+    """Apply transform t to page, returning (content, profile record)."""
+    counter = Counter()
+    before = page.content
+    start = time.perf_counter_ns()
+    with counting(counter):
+        content = t(before, page)
+    elapsed = time.perf_counter_ns() - start
+    own = [p for p in counter.patterns.values() if p['module'] == t.func.__module__]
+    helpers = [p for p in counter.patterns.values() if p['module'] != t.func.__module__]
+    return content, {
+        'page': page.path,
+        'transform': t.name,
+        'pid': os.getpid(),
+        'start_us': start // 1000,
+        'seconds': elapsed / 1e9,
+        'bytes_in': len(before.encode()),
+        'bytes_out': len(content.encode()),
+        'changed': content != before,
+        'calls': sum(p['calls'] for p in counter.patterns.values()),
+        'matches': sum(p['matches'] for p in own),
+        'helper_matches': sum(p['matches'] for p in helpers),
+        'subs': sum(p['subs'] for p in own),
+        'patterns': counter.patterns,
+    }
+
+
+def chrome_trace(records):
+    """Trace-event JSON: one event per page, with its transforms nested inside."""
+    if not records:
+        return {'traceEvents': []}
+    origin = min(r['start_us'] for r in records)
+    events = []
+    pages = {}
+    for r in records:
+        ts = r['start_us'] - origin
+        end = ts + r['seconds'] * 1e6
+        first, last, pid = pages.get(r['page'], (ts, end, r['pid']))
+        pages[r['page']] = (min(first, ts), max(last, end), pid)
+        top = sorted(r['patterns'].items(), key=lambda item: -item[1]['seconds'])[:TOP_PATTERNS]
+        events.append({
+            'name': r['transform'], 'cat': 'transform', 'ph': 'X', 'pid': 1, 'tid': r['pid'],
+            'ts': ts, 'dur': r['seconds'] * 1e6,
+            'args': {'page': r['page'], 'bytes_in': r['bytes_in'], 'bytes_out': r['bytes_out'],
+                     'changed': r['changed'], 'matches': r['matches'],
+                     'helper_matches': r['helper_matches'], 'subs': r['subs'],
+                     'patterns': {key: stats for key, stats in top}},
+        })
+    for page, (ts, end, pid) in pages.items():
+        events.append({'name': page, 'cat': 'page', 'ph': 'X', 'pid': 1, 'tid': pid, 'ts': ts, 'dur': end - ts})
+    events.sort(key=lambda e: (e['tid'], e['ts'], -e['dur']))
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def write(records, path):
+    with open(path, 'w') as f:
+        if path.endswith('.json'):
+            json.dump(chrome_trace(records), f)
+            f.write('\n')
+        else:
+            for r in records:
+                f.write(json.dumps(r, sort_keys=True) + '\n')
+
+
+def summary(records):
+    """Per-transform totals, slowest patterns, and transforms that did nothing."""
+    totals = {}
+    patterns = {}
+    for r in records:
+        t = totals.setdefault(r['transform'], {'pages': 0, 'seconds': 0.0, 'matches': 0, 'helper_matches': 0,
+                                               'subs': 0, 'changed': 0})
+        t['pages'] += 1
+        t['seconds'] += r['seconds']
+        t['matches'] += r['matches']
+        t['helper_matches'] += r['helper_matches']
+        t['subs'] += r['subs']
+        t['changed'] += r['changed']
+        for key, stats in r['patterns'].items():
+            p = patterns.setdefault((r['transform'], key), {'seconds': 0.0, 'matches': 0, 'rewrites': False})
+            p['seconds'] += stats['seconds']
+            p['matches'] += stats['matches']
+            p['rewrites'] = p['rewrites'] or stats['rewrites']
+
+    print(f"\n{'transform':20} {'pages':>6} {'ms':>9} {'matches':>9} {'helpers':>9} {'subs':>7} {'changed':>8}")
+    for name, t in sorted(totals.items(), key=lambda item: -item[1]['seconds']):
+        print(f"{name:20} {t['pages']:>6} {t['seconds'] * 1000:>9.1f} {t['matches']:>9} {t['helper_matches']:>9} "
+              f"{t['subs']:>7} {t['changed']:>8}")
+    slowest = sorted(patterns.items(), key=lambda item: -item[1]['seconds'])[:TOP_PATTERNS]
+    if slowest:
+        print('\nslowest patterns:')
+        for (name, key), p in slowest:
+            print(f"  {p['seconds'] * 1000:8.1f} ms  {p['matches']:>6} matches  {name}: {key}")
+    for name, t in totals.items():
+        if t['matches'] == 0 and t['changed'] == 0:
+            print(f"⚠️  {name} matched nothing on {t['pages']} pages (markup drift?)")
+        elif t['changed'] == 0:
+            print(f"⚠️  {name} changed none of {t['pages']} pages (already applied, or markup drift?)")
+    for (name, key), p in sorted(patterns.items()):
+        # Substitutions that never fire are dead rewrites; lookups that miss are often fine
+        if p['rewrites'] and p['matches'] == 0 and totals[name]['matches']:
+            print(f'⚠️  {name}: substitution never matched: {key}')
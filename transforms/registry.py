@@ -0,0 +1,67 @@
+"""
+Registry of page transforms.
+
+A transform is a plain function ``func(content, page) -> content`` plus the
+set of pages it applies to. Scripts register them with @transform and the
+engine looks them up by name.
+"""
+
+TRANSFORMS = {}
+
+# Named chains that can be run in one go (python3 -m transforms chrome)
+PIPELINES = {
+    'chrome': ['includes', 'sync-navbar', 'full-footer', 'body-gradient'],
+    'homepage': ['homepage-gradient', 'remove-blurs', 'homepage-spacing'],
+    'seo': ['canonical-urls'],
+    'css': ['tailwind'],
+}
+
+
+class Transform:
+    def __init__(self, name, func, pages=None, exclude=(), sources=(), prepare=None):
+        self.name = name
+        self.func = func
+        self.pages = tuple(pages) if pages is not None else None
+        self.exclude = tuple(exclude)
+        self.sources = tuple(sources)
+        self.prepare = prepare
+
+    def applies_to(self, path):
+        if path in self.exclude:
+            return False
+        return self.pages is None or path in self.pages
+
+    def __call__(self, content, page):
+        return self.func(content, page)
+
+    def __repr__(self):
+        return f'<Transform {self.name}>'
+
+
+def transform(name, pages=None, exclude=(), sources=(), prepare=None):
+    """Register func as transform `name`.
+
+    pages: only run on these paths (default: every site page)
+    exclude: never run on these paths
+    sources: other files the output depends on (e.g. blog/index.html);
+             editing them invalidates the incremental cache
+    prepare: prepare(pages, root, jobs, dry_run), run once in the main
+             process before any page, for work shared by all pages
+    """
+    def register(func):
+        if name in TRANSFORMS:
+            raise ValueError(f'Transform already registered: {name}')
+        TRANSFORMS[name] = Transform(name, func, pages, exclude, sources, prepare)
+        return func
+    return register
+
+
+def get_pipeline(names):
+    """Resolve transform and pipeline names into an ordered list of transforms."""
+    resolved = []
+    for name in names:
+        for step in PIPELINES.get(name, [name]):
+            if step not in TRANSFORMS:
+                raise KeyError(f'Unknown transform: {step}')
+            resolved.append(TRANSFORMS[step])
+    return resolved
@@ -0,0 +1,50 @@
+"""
+reorganize-sections -- reorder the homepage sections for better storytelling:
+
+1. Hero (keep first)
+2. See the Difference (transformation)
+3. Award (move up, merge testimonial)
+4. Security (move before FAQ)
+5. FAQ
+6. Pricing
+7. Final CTA
+
+Also fixes the gradient flow for a smooth transition between sections.
+"""
+from .registry import transform
+from .sections import SectionIndex
+
+# Testimonial is dropped: it's redundant with Award's founder quote
+NEW_ORDER = [
+    'hero',
+    'transformation',
+    'award',          # Moved up (already has founder quote)
+    'security',       # Moved before FAQ
+    'faq',
+    'pricing-beta',
+    'final-cta',
+]
+DROPPED = ['testimonial']
+
+# New gradient colors for smooth flow
+GRADIENTS = {
+    'hero': 'background: linear-gradient(180deg, #234966 0%, #12222d 100%);',
+    'transformation': 'background: linear-gradient(180deg, #12222d 0%, #0a171e 100%);',
+    'award': 'background: linear-gradient(180deg, #0a171e 0%, #0f1f2a 50%, #0a171e 100%);',  # slight highlight
+    'security': 'background: linear-gradient(180deg, #0a171e 0%, #050c11 100%);',
+    'faq': 'background: linear-gradient(180deg, #050c11 0%, #0a171e 100%);',
+    'pricing-beta': 'background: linear-gradient(180deg, #0a171e 0%, #050c11 100%);',
+    'final-cta': 'background: linear-gradient(180deg, #050c11 0%, #0a171e 50%, #12222d 100%);',
+}
+
+
+@transform('reorganize-sections', pages=['index.html'])
+def reorganize_sections(content, page):
+    index = SectionIndex(content)
+    layout = index.layout()
+    layout.reorder([name for name in NEW_ORDER if name in index])
+    layout.drop(*DROPPED)
+    for name, gradient in GRADIENTS.items():
+        if name in index:
+            layout.restyle(name, gradient)
+    return layout.render()
@@ -0,0 +1,410 @@
+"""
+Batch ROI calculator: calculator.html's model over thousands of clinics.
+
+The ROI model lives in calculator.html's inline calculate(). model() is the
+same arithmetic, written so it runs on plain numbers or on NumPy arrays
+(one element per clinic, broadcasting across a grid of constants). The
+constants (WORKING_DAYS, RELAPSE_RATE, ..., ESTIMATED_MONTHLY_COST) are
+read from the page itself, so a price change there flows through.
+
+Input is a CSV with one clinic per row and the calculator's slider
+columns: chairs, patients (per day), perio (% periodontal), noshow (%
+no-shows), revenue (EUR per visit). Other columns (name, region, ...) are
+passed through. The output adds each cost and saving, the annual software
+cost and roi (annual savings / software cost, 3.1 means 3.1x).
+
+--sweep NAME=START:STOP:STEPS varies a constant (repeat it for a grid) and
+writes one row per combination instead: median and quartile ROI, the share
+of clinics at or above break-even, and total savings over all clinics.
+
+--check keeps this module honest: it compares the constants with the page
+and runs the page's calculate() under node on a sample of slider settings,
+failing if any figure differs from model() on plain numbers or from the
+batch path (evaluate(), vectorized with NumPy). Exits with status 1 on
+drift; npm test runs it.
+
+    python3 -m transforms.roi clinics.csv -o roi.csv
+    python3 -m transforms.roi clinics.csv --sweep NOSHOW_REDUCTION=0.1:0.5:5 --sweep ESTIMATED_MONTHLY_COST=99:299:5
+    python3 -m transforms.roi --check
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import time
+from itertools import product
+
+from .engine import ROOT
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CALCULATOR_PAGE = 'calculator.html'
+# As in calculator.html; used when the page can't be read
+DEFAULTS = {
+    'WORKING_DAYS': 250,
+    'RELAPSE_RATE': 0.60,
+    'RELAPSE_COST_MULTIPLIER': 3,
+    'COACHING_MINUTES': 12,
+    'HOURLY_RATE': 50,
+    'NOSHOW_REDUCTION': 0.30,
+    'RELAPSE_REDUCTION': 0.40,
+    'TIME_REDUCTION': 0.67,
+    'ESTIMATED_MONTHLY_COST': 199,
+}
+INPUTS = ('chairs', 'patients', 'perio', 'noshow', 'revenue')
+# model() output -> element id calculate() writes it to
+OUTPUTS = {
+    'noshow_cost': 'noshow-cost',
+    'relapse_cost': 'relapse-cost',
+    'time_cost': 'time-cost',
+    'total_cost': 'total-cost',
+    'noshow_savings': 'noshow-savings',
+    'relapse_savings': 'relapse-savings',
+    'time_savings': 'time-savings',
+    'total_savings': 'total-savings',
+    'software_cost': None,
+    'roi': 'roi-value',
+}
+CONSTANT = re.compile(r'const ([A-Z][A-Z_]+) = (-?\d+(?:\.\d+)?);')
+RANGE_INPUT = re.compile(r'<input\b[^>]*type="range"[^>]*>')
+SCRIPT_START = 'const chairsInput'
+CALCULATE = 'function calculate() {'
+CHECK_SAMPLES = 500
+# Grid cells (combinations x clinics) computed at once in --sweep
+GRID_CHUNK = 4_000_000
+
+
+def read_page(root=ROOT):
+    with open(os.path.join(root, CALCULATOR_PAGE), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def page_constants(html):
+    """Model constants declared in the page's script, by name."""
+    return {name: float(value) for name, value in CONSTANT.findall(html) if name in DEFAULTS}
+
+
+def load_constants(root=ROOT):
+    try:
+        found = page_constants(read_page(root))
+    except OSError:
+        found = {}
+    constants = dict(DEFAULTS)
+    constants.update(found)
+    return constants
+
+
+def model(chairs, patients, perio, noshow, revenue, c):
+    """calculate() from calculator.html; perio and noshow in percent, c the constants.
+
+    Plain arithmetic only, so every argument (constants included) may be a
+    number or a NumPy array. chairs is shown on the page but not used by
+    the model.
+    """
+    perio = perio / 100
+    noshow = noshow / 100
+
+    annual_patients = patients * c['WORKING_DAYS']
+    annual_perio_patients = annual_patients * perio
+
+    noshow_cost = annual_patients * noshow * revenue
+    relapse_cost = annual_perio_patients * c['RELAPSE_RATE'] * revenue * c['RELAPSE_COST_MULTIPLIER']
+    time_cost = annual_perio_patients * (c['COACHING_MINUTES'] / 60) * c['HOURLY_RATE']
+
+    noshow_savings = noshow_cost * c['NOSHOW_REDUCTION']
+    relapse_savings = relapse_cost * c['RELAPSE_REDUCTION']
+    time_savings = time_cost * c['TIME_REDUCTION']
+    total_savings = noshow_savings + relapse_savings + time_savings
+
+    software_cost = c['ESTIMATED_MONTHLY_COST'] * 12
+    return {
+        'noshow_cost': noshow_cost,
+        'relapse_cost': relapse_cost,
+        'time_cost': time_cost,
+        'total_cost': noshow_cost + relapse_cost + time_cost,
+        'noshow_savings': noshow_savings,
+        'relapse_savings': relapse_savings,
+        'time_savings': time_savings,
+        'total_savings': total_savings,
+        'software_cost': software_cost,
+        'roi': total_savings / software_cost,
+    }
+
+
+def read_clinics(path):
+    """(header, rows, {input: column}) from a CSV; inputs as float arrays (lists without NumPy)."""
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader)]
+        rows = list(reader)
+    index = {name.lower(): i for i, name in enumerate(header)}
+    missing = [name for name in INPUTS if name not in index]
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(missing)} (need {', '.join(INPUTS)})")
+    columns = {}
+    for name in INPUTS:
+        i = index[name]
+        values = [row[i] for row in rows]
+        try:
+            columns[name] = np.array(values, dtype=float) if np is not None else [float(v) for v in values]
+        except ValueError as e:
+            raise ValueError(f'{path}: column {name}: {e}') from None
+    return header, rows, columns
+
+
+def evaluate(columns, constants):
+    """model() over every clinic: vectorized with NumPy, row by row without."""
+    if np is not None:
+        results = model(*(columns[name] for name in INPUTS), constants)
+        n = len(columns[INPUTS[0]])
+        return {key: np.broadcast_to(value, (n,)) for key, value in results.items()}
+    rows = [model(*values, constants) for values in zip(*(columns[name] for name in INPUTS))]
+    return {key: [row[key] for row in rows] for key in OUTPUTS}
+
+
+def write_results(path, header, rows, results):
+    keys = [key for key in OUTPUTS if key not in header]
+    # Rounded floats go to csv as repr(); much faster than formatting each one
+    if np is not None:
+        formatted = [np.round(results[key], 2).tolist() for key in keys]
+    else:
+        formatted = [[round(value, 2) for value in results[key]] for key in keys]
+    out = open(path, 'w', newline='') if path != '-' else sys.stdout
+    try:
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(header + keys)
+        writer.writerows(row + list(values) for row, values in zip(rows, zip(*formatted)))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def parse_sweep(spec, constants):
+    """NAME=START:STOP:STEPS -> (name, values)."""
+    name, _, span = spec.partition('=')
+    name = name.strip().upper()
+    if name not in constants:
+        raise ValueError(f"--sweep {spec}: unknown constant (one of {', '.join(constants)})")
+    try:
+        start, stop, steps = span.split(':')
+        start, stop, steps = float(start), float(stop), int(steps)
+    except ValueError:
+        raise ValueError(f'--sweep {spec}: expected NAME=START:STOP:STEPS') from None
+    if steps < 1:
+        raise ValueError(f'--sweep {spec}: STEPS must be at least 1')
+    return name, [start + (stop - start) * i / (steps - 1) for i in range(steps)] if steps > 1 else [start]
+
+
+def sensitivity(columns, constants, sweeps):
+    """One dict per combination of swept constants: its values and ROI statistics over all clinics."""
+    names = [name for name, _ in sweeps]
+    combos = list(product(*(values for _, values in sweeps)))
+    n = len(columns[INPUTS[0]])
+    inputs = [columns[name][np.newaxis, :] for name in INPUTS]
+    grid = []
+    chunk = max(1, GRID_CHUNK // max(n, 1))
+    for first in range(0, len(combos), chunk):
+        block = np.array(combos[first:first + chunk], dtype=float)
+        c = dict(constants)
+        for j, name in enumerate(names):
+            c[name] = block[:, j, np.newaxis]
+        results = model(*inputs, c)
+        roi = np.broadcast_to(results['roi'], (len(block), n))
+        savings = np.broadcast_to(results['total_savings'], (len(block), n))
+        q1, median, q3 = np.percentile(roi, [25, 50, 75], axis=1)
+        for k, values in enumerate(block.tolist()):
+            grid.append(dict(zip(names, values), roi_q1=q1[k], roi_median=median[k], roi_q3=q3[k],
+                             break_even=float((roi[k] >= 1).mean()), total_savings=float(savings[k].sum())))
+    return grid
+
+
+def write_grid(path, names, grid):
+    out = open(path, 'w', newline='') if path != '-' else sys.stdout
+    try:
+        writer = csv.writer(out, lineterminator='\n')
+        stats = ['roi_q1', 'roi_median', 'roi_q3', 'break_even', 'total_savings']
+        writer.writerow(names + stats)
+        for row in grid:
+            writer.writerow([f'{row[name]:g}' for name in names]
+                            + [f'{row[key]:.3f}' for key in stats[:4]] + [f"{row['total_savings']:.2f}"])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def slider_ranges(html):
+    """{input id: (min, max, step)} from the page's range inputs."""
+    ranges = {}
+    for m in RANGE_INPUT.finditer(html):
+        attrs = dict(re.findall(r'(\w+)="([^"]*)"', m.group()))
+        if attrs.get('id') in INPUTS:
+            ranges[attrs['id']] = (int(attrs['min']), int(attrs['max']), int(attrs.get('step', 1)))
+    return ranges
+
+
+def calculate_source(html):
+    """The page's script from the input lookups through the end of calculate()."""
+    start = html.find(SCRIPT_START)
+    body = html.find(CALCULATE, start)
+    if start == -1 or body == -1:
+        return None
+    depth = 0
+    for i in range(body + len(CALCULATE) - 1, len(html)):
+        if html[i] == '{':
+            depth += 1
+        elif html[i] == '}':
+            depth -= 1
+            if depth == 0:
+                return html[start:i + 1]
+    return None
+
+
+# Runs calculate() with stub elements; formatCurrency is swapped for the
+# identity so the raw figures come back (ROI only as roi.toFixed(1) + 'x').
+HARNESS = '''
+const elements = {};
+const document = { getElementById: id => (elements[id] = elements[id] || { id, value: '', textContent: '' }) };
+%s
+formatCurrency = value => value;
+const out = [];
+for (const sample of JSON.parse(require('fs').readFileSync(0, 'utf8'))) {
+    for (const [id, value] of Object.entries(sample)) document.getElementById(id).value = String(value);
+    calculate();
+    const row = {};
+    for (const id of %s) row[id] = elements[id].textContent;
+    out.push(row);
+}
+console.log(JSON.stringify(out));
+'''
+
+
+def check(root=ROOT, samples=CHECK_SAMPLES):
+    """Problems found comparing this module with calculator.html (empty list if in sync)."""
+    html = read_page(root)
+    problems = []
+    found = page_constants(html)
+    for name, value in DEFAULTS.items():
+        if name not in found:
+            problems.append(f'{name} not declared in {CALCULATOR_PAGE}')
+        elif found[name] != value:
+            problems.append(f'{name} is {found[name]:g} in {CALCULATOR_PAGE}, {value:g} in DEFAULTS')
+    extra = sorted({name for name, _ in CONSTANT.findall(html)} - set(DEFAULTS))
+    if extra:
+        problems.append(f"{CALCULATOR_PAGE} declares constants the model doesn't know: {', '.join(extra)}")
+
+    source = calculate_source(html)
+    ranges = slider_ranges(html)
+    if source is None or set(ranges) != set(INPUTS):
+        return problems + [f'calculate() or its sliders not found in {CALCULATOR_PAGE}']
+    node = shutil.which('node')
+    if node is None:
+        print('⚠️  node not found; only the constants were compared')
+        return problems
+
+    rng = random.Random(0)
+    cases = [{name: low for name, (low, _, _) in ranges.items()},
+             {name: high for name, (_, high, _) in ranges.items()}]
+    cases += [{name: rng.randrange(low, high + 1, step) for name, (low, high, step) in ranges.items()}
+              for _ in range(samples)]
+    ids = [element for element in OUTPUTS.values() if element]
+    out = subprocess.run([node, '-e', HARNESS % (source, json.dumps(ids))], input=json.dumps(cases),
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        return problems + [f'node failed: {out.stderr.strip().splitlines()[-1] if out.stderr.strip() else out.returncode}']
+    constants = dict(DEFAULTS)
+    constants.update(found)
+    page = json.loads(out.stdout)
+    mismatches = 0
+    # Each case goes through model() on plain numbers and through evaluate()
+    # (vectorized when NumPy is installed), as a CSV of clinics would
+    columns = {name: [float(case[name]) for case in cases] for name in INPUTS}
+    if np is not None:
+        columns = {name: np.array(values) for name, values in columns.items()}
+    batch = evaluate(columns, constants)
+    scalar = [model(*(case[name] for name in INPUTS), constants) for case in cases]
+    vectorized = [{key: float(batch[key][i]) for key in OUTPUTS} for i in range(len(cases))]
+    runs = [(label, case, js, py) for label, results in (('model()', scalar), ('evaluate()', vectorized))
+            for case, js, py in zip(cases, page, results)]
+    for label, case, js, py in runs:
+        for key, element in OUTPUTS.items():
+            if element is None:
+                continue
+            if key == 'roi':
+                expected, actual = f"{py['roi']:.1f}x", js[element]
+                same = expected == actual or abs(py['roi'] - float(actual.rstrip('x'))) <= 0.05 + 1e-9
+            else:
+                expected, actual = py[key], float(js[element])
+                same = abs(expected - actual) <= 1e-6 * max(1.0, abs(expected))
+            if not same:
+                mismatches += 1
+                if mismatches <= 10:
+                    problems.append(f'{key} for {case}: page {actual}, {label} {expected}')
+    if mismatches > 10:
+        problems.append(f'... {mismatches - 10} more mismatches')
+    path = 'NumPy' if np is not None else 'row-by-row'
+    print(f'  compared {len(cases)} slider settings x {len(ids)} figures with the page under node '
+          f'(model() on numbers and evaluate(), {path})')
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.roi', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv', nargs='?', help='clinics, one per row (columns: ' + ', '.join(INPUTS) + ')')
+    parser.add_argument('-o', '--output', default='-', help='where to write the results (default: stdout)')
+    parser.add_argument('--sweep', action='append', default=[], metavar='NAME=START:STOP:STEPS',
+                        help='vary a model constant; repeat for a grid')
+    parser.add_argument('--check', action='store_true', help=f'compare the model with {CALCULATOR_PAGE} and exit')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        problems = check()
+        for problem in problems:
+            print(f'✗ {problem}')
+        print('✓ model matches calculate() in ' + CALCULATOR_PAGE if not problems
+              else f'\n{len(problems)} problems: update transforms/roi.py to match {CALCULATOR_PAGE}')
+        return 1 if problems else 0
+    if not args.csv:
+        parser.error('a CSV of clinics is required (or --check)')
+    if args.sweep and np is None:
+        print('⚠️  --sweep requires NumPy: pip install numpy')
+        return 1
+    if np is None:
+        print('⚠️  NumPy not installed, computing row by row (pip install numpy for large files)', file=sys.stderr)
+
+    constants = load_constants()
+    started = time.perf_counter()
+    try:
+        sweeps = [parse_sweep(spec, constants) for spec in args.sweep]
+        header, rows, columns = read_clinics(args.csv)
+    except (OSError, ValueError) as e:
+        print(f'✗ {e}')
+        return 1
+    loaded = time.perf_counter()
+    if sweeps:
+        grid = sensitivity(columns, constants, sweeps)
+        computed = time.perf_counter()
+        write_grid(args.output, [name for name, _ in sweeps], grid)
+        what = f'{len(grid)} combinations x {len(rows)} clinics'
+    else:
+        results = evaluate(columns, constants)
+        computed = time.perf_counter()
+        write_results(args.output, header, rows, results)
+        what = f'{len(rows)} clinics'
+    done = time.perf_counter()
+    print(f'✓ {what}: read {(loaded - started) * 1000:.0f} ms, model {(computed - loaded) * 1000:.0f} ms, '
+          f'write {(done - computed) * 1000:.0f} ms' + (f' -> {args.output}' if args.output != '-' else ''),
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
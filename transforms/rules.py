@@ -0,0 +1,280 @@
+"""
+Declarative rewrite rules, applied to a page in one scan.
+
+A rule is a pattern, a replacement template (default: delete the match),
+an optional scope and a name:
+
+    Rule(r'<div class="absolute inset-0 bg-mint/20 blur-3xl[^"]*"></div>\\n?', scope='security')
+
+apply_rules(html, rules) compiles the list once (cached) and rewrites the
+page in one scan: a single regex built from the rules' literal prefixes
+(a trie, so '<div class="absolute' is matched once for every rule that
+starts with it) finds each place a rule can start, the rules with that
+prefix are tried there, and all replacements are spliced in with a single
+join. Rules with a scope only match inside that <!-- @name --> section
+(see sections.py).
+
+Rules see the original page, not each other's output. The result is the
+same as re.sub with one alternation of every rule: scanning left to right,
+the leftmost non-empty match is replaced, at the same offset the earlier
+rule wins, and the scan resumes where that match ended. Replacements may
+use \\1, \\g<name> and \\g<0>.
+
+Two things differ from the one-re.sub-per-rule scripts this replaced: a
+rule never matches text an earlier rule wrote, and a scoped rule never
+matches outside its section. --rules checks that neither changes the
+output of the rule lists in the tree, on every page and on the copies in
+PRE_CLEANUP, which still have the markup the cleanups remove (the pages
+themselves have been cleaned, so every rule is at 0 hits there).
+
+    python3 -m transforms --rules          # hit counts, checked against sequential_apply()
+"""
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+from .locator import splice
+from .sections import SectionIndex
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+Rule = namedtuple('Rule', 'pattern replacement scope name', defaults=('', None, None))
+
+TEMPLATE = re.compile(r'\\(?:\d|g<)')
+
+# Page -> a copy of it from before the cleanups ran
+PRE_CLEANUP = {'index.html': 'index.html.bak'}
+
+
+def literal_prefix(pattern):
+    """The literal text every match of pattern starts with ('' if none)."""
+    parsed = sre_parse.parse(pattern)
+    if parsed.state.flags & re.IGNORECASE:
+        return ''
+    prefix = []
+
+    def walk(items):
+        for op, av in items:
+            if op is sre_parse.LITERAL:
+                prefix.append(chr(av))
+            elif op is sre_parse.SUBPATTERN and not av[1] and not av[2]:
+                if not walk(av[-1]):
+                    return False
+            else:
+                return False
+        return True
+    walk(parsed)
+    return ''.join(prefix)
+
+
+def trie_regex(words):
+    """Regex matching the longest of words at a position, shared prefixes factored out."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def render(node):
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+    return re.compile(render(trie))
+
+
+class RuleSet:
+    """A compiled rule list; hits[i] counts rule i's replacements so far.
+
+    Rules are indexed by their literal prefix: one trie-shaped regex finds
+    the next offset where any rule can start, and only the rules whose
+    prefix is there are tried. The scan skips text the way a single
+    literal-prefixed pattern does, so it costs about the same for one rule
+    as for fifty. Rules without a literal prefix get a scan of their own.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.hits = [0] * len(self.rules)
+        self.regexes = [re.compile(rule.pattern) for rule in self.rules]
+        # Replacement templates that need the rule's own groups
+        self.expand = [bool(TEMPLATE.search(rule.replacement)) for rule in self.rules]
+        self.by_prefix = {}
+        self.unindexed = []
+        for i, rule in enumerate(self.rules):
+            prefix = literal_prefix(rule.pattern)
+            if prefix:
+                self.by_prefix.setdefault(prefix, []).append(i)
+            else:
+                self.unindexed.append(i)
+        self.prefilter = trie_regex(self.by_prefix) if self.by_prefix else None
+        self.scoped = any(rule.scope for rule in self.rules)
+
+    def name(self, i):
+        return self.rules[i].name or self.rules[i].pattern
+
+    def _bounds(self, i, spans, length):
+        """(start, end) rule i may match within, or None if its scope isn't on the page."""
+        scope = self.rules[i].scope
+        if scope is None:
+            return 0, length
+        return spans.get(scope)
+
+    def _next_indexed(self, html, spans, pos):
+        """(match, rule index) of the leftmost prefix-indexed match at or after pos, or None."""
+        while True:
+            found = self.prefilter.search(html, pos)
+            if found is None:
+                return None
+            at, text = found.start(), found.group()
+            candidates = sorted(i for n in range(1, len(text) + 1) for i in self.by_prefix.get(text[:n], ()))
+            for i in candidates:
+                bounds = self._bounds(i, spans, len(html))
+                if bounds is None or not bounds[0] <= at < bounds[1]:
+                    continue
+                m = self.regexes[i].match(html, at, bounds[1])
+                if m and m.end() > at:
+                    return m, i
+            pos = at + 1
+
+    def _next_unindexed(self, i, html, spans, pos):
+        """Rule i's first non-empty match at or after pos, or None."""
+        bounds = self._bounds(i, spans, len(html))
+        if bounds is None:
+            return None
+        start = max(pos, bounds[0])
+        while start <= bounds[1]:
+            m = self.regexes[i].search(html, start, bounds[1])
+            if m is None or m.end() > m.start():
+                return m
+            start = m.start() + 1
+        return None
+
+    def _matches(self, html, spans):
+        """Yield (match, rule index) left to right, as a single alternation would.
+
+        Each rule's next match is kept until the scan passes its start; only
+        then is that rule searched again, from the end of the last match taken.
+        """
+        pending = {}  # None: rule exhausted; (match, i) for the indexed rules as one
+        pos = 0
+        while True:
+            best = None
+            for key in ['indexed'] * (self.prefilter is not None) + self.unindexed:
+                found = pending.get(key, False)
+                if found is False or (found is not None and found[0].start() < pos):
+                    if key == 'indexed':
+                        found = self._next_indexed(html, spans, pos)
+                    else:
+                        m = self._next_unindexed(key, html, spans, pos)
+                        found = (m, key) if m is not None else None
+                    pending[key] = found
+                if found is not None and (best is None or (found[0].start(), found[1]) < (best[0].start(), best[1])):
+                    best = found
+            if best is None:
+                return
+            yield best
+            pos = best[0].end()
+
+    def apply(self, html):
+        """(new html, hits per rule) for one page."""
+        spans = SectionIndex(html).spans if self.scoped else {}
+        hits = [0] * len(self.rules)
+        edits = []
+        for m, i in self._matches(html, spans):
+            replacement = self.rules[i].replacement
+            edits.append((m.start(), m.end(), m.expand(replacement) if self.expand[i] else replacement))
+            hits[i] += 1
+        for i, count in enumerate(hits):
+            self.hits[i] += count
+        return (splice(html, edits) if edits else html), hits
+
+
+def sequential_apply(html, rules):
+    """The cleanup scripts' original behaviour: one re.sub per rule, in order, scopes ignored.
+
+    report() checks RuleSet against this, so a rule whose scope or overlap
+    with another rule changes what a page ends up as shows as a difference.
+    """
+    for rule in rules:
+        html = re.sub(rule.pattern, rule.replacement, html)
+    return html
+
+
+@lru_cache(maxsize=None)
+def compile_rules(rules):
+    return RuleSet(rules)
+
+
+def apply_rules(html, rules):
+    """html with every rule applied in one scan."""
+    return compile_rules(tuple(rules)).apply(html)[0]
+
+
+def rule_lists():
+    """(transform name, constant name, rules) for every Rule list a registered transform uses."""
+    from . import TRANSFORMS
+    from .cache import _global_names
+    found = []
+    for t in TRANSFORMS.values():
+        module = sys.modules[t.func.__module__]
+        for name in sorted(_global_names(t.func.__code__)):
+            value = getattr(module, name, None)
+            if isinstance(value, list) and value and all(isinstance(r, Rule) for r in value):
+                found.append((t, name, value))
+    return found
+
+
+def report(pages=None):
+    """Print every rule list's per-rule hit counts over the site (or pages).
+
+    Each page and every PRE_CLEANUP copy is also rewritten by
+    sequential_apply(); returns False if any output differs.
+    """
+    from .engine import ROOT, Page, site_pages
+
+    pages = pages or site_pages(ROOT)
+    ok = True
+    for t, name, rules in rule_lists():
+        ruleset = RuleSet(rules)
+        applied = [p for p in pages if t.applies_to(p)]
+        started = time.perf_counter()
+        per_page = {}
+        for path in applied:
+            _, hits = ruleset.apply(Page.load(path, ROOT).content)
+            per_page[path] = hits
+        elapsed = time.perf_counter() - started
+        print(f'{t.name} / {name}  ({len(rules)} rules, {len(applied)} pages, {elapsed * 1000:.1f} ms)')
+        # The pre-cleanup copies are checked by every list, whatever pages it runs on
+        checked = applied + [copy for copy in PRE_CLEANUP.values() if os.path.exists(os.path.join(ROOT, copy))]
+        differ = []
+        matched = 0
+        for path in checked:
+            with open(os.path.join(ROOT, path), 'r', encoding='utf-8') as f:
+                content = f.read()
+            output, hits = RuleSet(rules).apply(content)
+            matched += sum(hits)
+            if output != sequential_apply(content, rules):
+                differ.append(path)
+        if differ:
+            ok = False
+            print(f"  ✗ differs from one re.sub per rule on {', '.join(differ)}")
+        elif matched:
+            print(f'  ✓ same output as one re.sub per rule on {len(checked)} pages ({matched} replacements)')
+        else:
+            print(f'  ⚠️  no rule matches {len(checked)} pages, so nothing was compared with one re.sub per rule')
+        for i, rule in enumerate(rules):
+            where = [f'{path} x{hits[i]}' for path, hits in per_page.items() if hits[i]]
+            mark = '✓' if where else '·'
+            scope = f' @{rule.scope}' if rule.scope else ''
+            print(f"  {mark} {ruleset.hits[i]:>4}  {ruleset.name(i)[:70]}{scope}"
+                  + (f"  ({', '.join(where[:3])}{', ...' if len(where) > 3 else ''})" if where else ''))
+    return ok
@@ -0,0 +1,389 @@
+"""
+Prebuilt client-side search index for the blog.
+
+Every post in blog/*.html (the listing pages are skipped) is reduced to
+its title, description, headings and article text; the navbar, footer,
+breadcrumbs, related-post cards, scripts and SVGs are left out. The text
+is tokenized and stemmed (a light suffix stripper, shipped in the index so
+public/blog-search.js stems queries the same way) and written to
+public/search/, which Vite copies into dist/. The search box on the blog
+listing (partials/blog-index.html) queries it through blog-search.js.
+
+    search/index.json             docs [url, title, excerpt], shard names,
+                                  stemmer rules, stop words
+    search/<prefix>.<hash>.json   {"terms": ..., "postings": [...]}
+
+Shards split the terms by their first --shard-prefix characters, so a query
+only fetches the shards for its words. Within a shard the terms are sorted
+and front-coded: each entry is one base-36 digit giving how many characters
+it shares with the previous term, then the rest ("3ment" after "treat" is
+"treatment"). Each posting list is [doc gap, weight, doc gap, weight, ...]
+with doc ids delta-encoded, and the weight sums the term's occurrences with
+the title, headings and description counting extra. Shard names carry a
+content hash, so they are cached as immutable and a rebuild only changes
+the shards whose terms moved.
+
+Builds are incremental: .search-cache.json keeps each post's content hash
+and extracted terms, so only new or edited posts are re-read. Doc ids are
+stable across builds; a removed post leaves a null slot until --force.
+
+    python3 -m transforms.search
+    python3 -m transforms.search --query "patient compliance"
+"""
+import argparse
+import glob
+import gzip
+import hashlib
+import html
+import json
+import math
+import os
+import re
+import sys
+import unicodedata
+from collections import Counter
+
+from . import cache
+from .assets import HASH_LENGTH
+from .engine import ROOT
+from .locator import locate
+from .seo import url_path
+
+PAGES = 'blog/*.html'
+LISTING = re.compile(r'(^|/)(index|page-\d+)\.html$')
+OUTPUT_DIR = 'public/search'
+INDEX_FILE = 'index.json'
+CACHE_FILE = '.search-cache.json'
+SHARD_PREFIX = 1
+EXCERPT_LENGTH = 160
+MAX_WEIGHT = 255
+
+# Field weights: a word in the title counts as TITLE occurrences in the body
+TITLE = 10
+HEADING = 4
+DESCRIPTION = 2
+BODY = 1
+
+# Elements whose text is never indexed
+SKIP_TAGS = ('nav', 'footer', 'script', 'style', 'svg', 'noscript', 'template', 'button', 'form')
+SKIP_IDS = ('navbar', 'navbar-placeholder', 'mobile-menu', 'footer-placeholder')
+
+WORD = re.compile(r'[a-z0-9]+')
+TAG = re.compile(r'<[^>]+>')
+MIN_WORD = 2
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+# (suffix, replacement), first match wins; a stem keeps at least MIN_STEM characters.
+# ss/us/is map to themselves so 'class', 'focus' and 'analysis' keep their s.
+SUFFIXES = (
+    ('sses', 'ss'), ('ies', 'y'), ('ness', ''), ('ments', 'ment'), ('ingly', ''), ('edly', ''),
+    ('ings', ''), ('ing', ''), ('ied', 'y'), ('ed', ''), ('ly', ''), ('ss', 'ss'), ('us', 'us'),
+    ('is', 'is'), ('s', ''),
+)
+MIN_STEM = 3
+STOP_WORDS = frozenset('''
+    a an and are as at be been but by can do does for from has have how i if in into is it its
+    just more most not of on or our so than that the their them then there these they this to
+    was we were what when where which who why will with you your
+'''.split())
+
+
+def stem(word):
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix):
+            if len(word) - len(suffix) + len(replacement) >= MIN_STEM:
+                word = word[:-len(suffix)] + replacement
+            break
+    # practice / practicing / practices -> practic
+    if word.endswith('e') and len(word) > MIN_STEM + 1:
+        word = word[:-1]
+    return word
+
+
+def tokens(text):
+    """Stemmed index terms of text, in order (stop words and 1-letter words dropped)."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return [stem(w) for w in WORD.findall(text) if len(w) >= MIN_WORD and w not in STOP_WORDS]
+
+
+def visible_text(doc, start, end, skip):
+    """Text of doc.html[start:end] outside the skip spans."""
+    pieces = []
+    pos = start
+    for s, e in skip:
+        if e <= pos or s >= end:
+            continue
+        pieces.append(doc.html[pos:max(s, pos)])
+        pos = max(pos, e)
+    pieces.append(doc.html[pos:end])
+    return ' '.join(html.unescape(TAG.sub(' ', piece)) for piece in pieces)
+
+
+def squash(text):
+    return ' '.join(text.split())
+
+
+def extract(content):
+    """{'title', 'description', 'terms': {term: weight}} for one page."""
+    doc = locate(content)
+    skip = sorted((el.start, el.end) for el in doc.elements
+                  if el.tag in SKIP_TAGS or el.id in SKIP_IDS or el.attrs.get('aria-hidden') == 'true')
+    region = doc.find('main') or doc.find('body')
+    start, end = (region.inner_start, region.inner_end) if region else (0, len(content))
+
+    h1 = doc.find('h1')
+    title = squash(visible_text(doc, h1.inner_start, h1.inner_end, skip)) if h1 else ''
+    if not title:
+        head_title = doc.find('title')
+        title = squash(html.unescape(doc.inner(head_title))).split(' | ')[0] if head_title else ''
+    meta = doc.find('meta', name='description')
+    description = squash(html.unescape(meta.attrs.get('content', ''))) if meta else ''
+    headings = ' '.join(visible_text(doc, el.inner_start, el.inner_end, skip)
+                        for el in doc.elements if el.tag in ('h2', 'h3')
+                        and not any(s <= el.start < e for s, e in skip))
+
+    terms = Counter()
+    for text, weight in ((title, TITLE), (headings, HEADING), (description, DESCRIPTION),
+                         (visible_text(doc, start, end, skip), BODY)):
+        for term in tokens(text):
+            terms[term] += weight
+    return {'title': title, 'description': description,
+            'terms': {term: min(weight, MAX_WEIGHT) for term, weight in terms.items()}}
+
+
+def excerpt(text):
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    return text[:EXCERPT_LENGTH].rsplit(' ', 1)[0].rstrip(',.;:') + '…'
+
+
+def front_code(terms):
+    """Sorted terms as space-separated [shared prefix length in base 36][suffix] entries."""
+    out = []
+    previous = ''
+    for term in terms:
+        shared = 0
+        limit = min(len(previous), len(term), len(DIGITS) - 1)
+        while shared < limit and previous[shared] == term[shared]:
+            shared += 1
+        out.append(DIGITS[shared] + term[shared:])
+        previous = term
+    return ' '.join(out)
+
+
+def front_decode(data):
+    terms = []
+    previous = ''
+    for entry in data.split(' ') if data else ():
+        term = previous[:int(entry[0], 36)] + entry[1:]
+        terms.append(term)
+        previous = term
+    return terms
+
+
+def shard_key(term, prefix):
+    return term[:prefix] if prefix else 'all'
+
+
+def build_shards(docs, prefix):
+    """{shard key: JSON text} for docs ({id: {'terms': ...}})."""
+    postings = {}
+    for doc_id in sorted(docs):
+        for term, weight in docs[doc_id]['terms'].items():
+            postings.setdefault(term, []).append((doc_id, weight))
+    shards = {}
+    for term in sorted(postings):
+        shards.setdefault(shard_key(term, prefix), []).append(term)
+    out = {}
+    for key, terms in shards.items():
+        lists = []
+        for term in terms:
+            flat = []
+            last = 0
+            for doc_id, weight in postings[term]:
+                flat += [doc_id - last, weight]
+                last = doc_id
+            lists.append(flat)
+        out[key] = json.dumps({'terms': front_code(terms), 'postings': lists}, separators=(',', ':'))
+    return out
+
+
+def generator_hash():
+    with open(__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def load_manifest(root):
+    try:
+        with open(os.path.join(root, CACHE_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(root, manifest):
+    path = os.path.join(root, CACHE_FILE)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp, path)
+
+
+def blog_pages(root):
+    return sorted(os.path.relpath(path, root).replace(os.sep, '/')
+                  for path in glob.glob(os.path.join(root, PAGES)) if not LISTING.search(path))
+
+
+def build(root=ROOT, output=OUTPUT_DIR, prefix=SHARD_PREFIX, force=False, verbose=True):
+    """Update output/ for the current posts; returns {'indexed': [...], 'cached': [...], 'removed': [...]}."""
+    manifest = load_manifest(root)
+    if force or manifest.get('generator') != generator_hash() or manifest.get('prefix') != prefix:
+        manifest = {}
+    previous = manifest.get('pages', {})
+    hashes = cache.FileHashes(root)
+    pages = blog_pages(root)
+
+    results = {'indexed': [], 'cached': [], 'removed': sorted(set(previous) - set(pages))}
+    entries = {}
+    for path in pages:
+        entry = previous.get(path)
+        if entry is not None and entry['hash'] == hashes[path]:
+            entries[path] = entry
+            results['cached'].append(path)
+            continue
+        with open(os.path.join(root, path), 'r', encoding='utf-8') as f:
+            entries[path] = dict(extract(f.read()), hash=hashes[path], url=url_path(path, root))
+        results['indexed'].append(path)
+
+    # Stable doc ids: kept pages keep theirs, new pages take the next free slot
+    slots = list(manifest.get('slots', []))
+    slots = [path if path in entries else None for path in slots]
+    for path in pages:
+        if path not in slots:
+            slots.append(path)
+    while slots and slots[-1] is None:
+        slots.pop()
+    docs = {i: entries[path] for i, path in enumerate(slots) if path is not None}
+
+    out_dir = os.path.join(root, output)
+    os.makedirs(out_dir, exist_ok=True)
+    shards = {}
+    written = []
+    for key, text in sorted(build_shards(docs, prefix).items()):
+        name = f'{key}.{hashlib.sha256(text.encode()).hexdigest()[:HASH_LENGTH]}.json'
+        shards[key] = name
+        if not os.path.exists(os.path.join(out_dir, name)):
+            with open(os.path.join(out_dir, name), 'w') as f:
+                f.write(text)
+            written.append(name)
+    index = json.dumps({
+        'docs': [[entries[path]['url'], entries[path]['title'], excerpt(entries[path]['description'])]
+                 if path else None for path in slots],
+        'shards': shards,
+        'prefix': prefix,
+        'suffixes': SUFFIXES,
+        'minStem': MIN_STEM,
+        'minWord': MIN_WORD,
+        'stop': sorted(STOP_WORDS),
+    }, ensure_ascii=False, separators=(',', ':'))
+    index_path = os.path.join(out_dir, INDEX_FILE)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index_changed = f.read() != index
+    except OSError:
+        index_changed = True
+    if index_changed:
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write(index)
+    stale = [name for name in os.listdir(out_dir)
+             if name.endswith('.json') and name != INDEX_FILE and name not in shards.values()]
+    for name in stale:
+        os.remove(os.path.join(out_dir, name))
+    save_manifest(root, {'generator': generator_hash(), 'prefix': prefix, 'slots': slots,
+                         'pages': {path: entries[path] for path in pages}})
+
+    if verbose:
+        for path in results['indexed']:
+            print(f'✓ indexed  {path}')
+        for path in results['removed']:
+            print(f'✓ removed  {path}')
+        sizes = [len(index.encode())] + [os.path.getsize(os.path.join(out_dir, name)) for name in shards.values()]
+        total = sum(sizes)
+        packed = len(gzip.compress(index.encode())) + sum(
+            len(gzip.compress(open(os.path.join(out_dir, name), 'rb').read())) for name in shards.values())
+        terms = sum(len(entry['terms']) for entry in docs.values())
+        print(f"\n{len(docs)} posts, {terms} postings in {len(shards)} shards: {len(results['indexed'])} indexed, "
+              f"{len(results['cached'])} cached, {len(results['removed'])} removed; "
+              f"{len(written)} shards written, {len(stale)} deleted")
+        print(f'{output}/: {total / 1024:.1f} KB ({packed / 1024:.1f} KB gzipped), '
+              f'largest shard {max(sizes[1:], default=0) / 1024:.1f} KB')
+    return results
+
+
+def search(query, directory, limit=10):
+    """[(score, url, title)] from the index files in directory, ranked the way blog-search.js ranks them."""
+    with open(os.path.join(directory, INDEX_FILE), 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    count = sum(1 for doc in index['docs'] if doc)
+    loaded = {}
+
+    def postings(key):
+        if key not in loaded:
+            name = index['shards'].get(key)
+            if name is None:
+                loaded[key] = {}
+            else:
+                with open(os.path.join(directory, name), 'r') as f:
+                    shard = json.load(f)
+                loaded[key] = dict(zip(front_decode(shard['terms']), shard['postings']))
+        return loaded[key]
+
+    words = tokens(query)
+    scores = {}
+    matched = {}
+    for n, term in enumerate(words):
+        # The last word may still be being typed: it also matches as a prefix
+        last = n == len(words) - 1 and not query[-1:].isspace()
+        shard = postings(shard_key(term, index['prefix']))
+        hits = {term: 1.0} if not last else {t: 1.0 if t == term else 0.5 for t in shard if t.startswith(term)}
+        for t, factor in hits.items():
+            flat = shard.get(t)
+            if not flat:
+                continue
+            idf = math.log(1 + count / (len(flat) // 2))
+            doc_id = 0
+            for i in range(0, len(flat), 2):
+                doc_id += flat[i]
+                scores[doc_id] = scores.get(doc_id, 0) + flat[i + 1] * idf * factor
+                matched.setdefault(doc_id, set()).add(n)
+    ranked = sorted(scores, key=lambda d: (-len(matched[d]), -scores[d], d))[:limit]
+    return [(round(scores[d], 1), index['docs'][d][0], index['docs'][d][1]) for d in ranked]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.search', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default=OUTPUT_DIR, help=f'index directory (default: {OUTPUT_DIR})')
+    parser.add_argument('--shard-prefix', type=int, default=SHARD_PREFIX,
+                        help=f'shard terms by their first N characters, 0 = one shard (default: {SHARD_PREFIX})')
+    parser.add_argument('--force', action='store_true', help=f'ignore {CACHE_FILE} and re-read every post')
+    parser.add_argument('--query', help='search the built index instead of building it')
+    args = parser.parse_args(argv)
+
+    if args.query is not None:
+        directory = os.path.join(ROOT, args.output)
+        if not os.path.exists(os.path.join(directory, INDEX_FILE)):
+            print(f'✗ {args.output}/{INDEX_FILE} not found (run python3 -m transforms.search first)')
+            return 1
+        results = search(args.query, directory)
+        for score, url, title in results:
+            print(f'{score:>8}  {url}  {title}')
+        if not results:
+            print('no matches')
+        return 0
+    build(output=args.output, prefix=args.shard_prefix, force=args.force)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
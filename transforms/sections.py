@@ -0,0 +1,134 @@
+"""
+Section index for pages built from <!-- @name --> markers (index.html).
+
+SectionIndex scans the markers once and keeps every section as an offset
+range into the original page: a section runs from its marker to the next
+marker (the last one to the end of the page), and everything before the
+first marker is the head. A Layout is a cheap plan of reorder / drop /
+replace / restyle operations on those ranges; render() assembles the page
+with a single join, so trying many variants costs almost nothing.
+
+    index = SectionIndex(html)
+    html = (index.layout()
+            .reorder(['hero', 'transformation', 'award', 'security'])
+            .drop('testimonial')
+            .restyle('award', 'background: #0a171e;')
+            .render())
+
+See transforms/variants.py for the command line.
+"""
+import re
+
+MARKER_COMMENT = re.compile(r'<!--\s*@([\w-]+)\s*-->')
+SECTION_BACKGROUND = re.compile(r'style="background:\s*linear-gradient\([^"]+\)"')
+
+
+class SectionIndex:
+    def __init__(self, html):
+        self.html = html
+        self.spans = {}  # name -> (start, end)
+        self.names = []  # document order
+        starts = [(m.group(1), m.start()) for m in MARKER_COMMENT.finditer(html)]
+        for i, (name, start) in enumerate(starts):
+            if name in self.spans:
+                raise ValueError(f'Duplicate section marker: @{name}')
+            end = starts[i + 1][1] if i + 1 < len(starts) else len(html)
+            self.spans[name] = (start, end)
+            self.names.append(name)
+        self.head_end = starts[0][1] if starts else len(html)
+
+    def __contains__(self, name):
+        return name in self.spans
+
+    def __getitem__(self, name):
+        start, end = self.spans[name]
+        return self.html[start:end]
+
+    def size(self, name):
+        start, end = self.spans[name]
+        return end - start
+
+    def layout(self):
+        return Layout(self)
+
+
+class Layout:
+    """Ordered plan of sections; each is a list of pieces, where a piece is
+    either a (start, end) range of the original page or a replacement string."""
+
+    def __init__(self, index):
+        self.index = index
+        self.order = list(index.names)
+        self.pieces = {name: [index.spans[name]] for name in index.names}
+
+    def _check(self, name):
+        if name not in self.order:
+            raise KeyError(f'Dropped section: @{name}' if name in self.pieces else f'Unknown section: @{name}')
+
+    def reorder(self, names):
+        """Put `names` into the slots they currently occupy, in the given order.
+        Sections not listed stay where they are."""
+        for name in names:
+            self._check(name)
+        wanted = set(names)
+        queue = iter(names)
+        self.order = [next(queue) if name in wanted else name for name in self.order]
+        return self
+
+    def move(self, name, before=None, after=None):
+        """Move one section before/after another (or to the end)."""
+        for other in (name, before, after):
+            if other is not None:
+                self._check(other)
+        self.order.remove(name)
+        if before is not None:
+            self.order.insert(self.order.index(before), name)
+        elif after is not None:
+            self.order.insert(self.order.index(after) + 1, name)
+        else:
+            self.order.append(name)
+        return self
+
+    def drop(self, *names):
+        for name in names:
+            if name in self.order:
+                self.order.remove(name)
+        return self
+
+    def keep(self, names):
+        """Drop every section not in names, keeping document order."""
+        names = set(names)
+        self.order = [name for name in self.order if name in names]
+        return self
+
+    def replace(self, name, text):
+        self._check(name)
+        self.pieces[name] = [text]
+        return self
+
+    def restyle(self, name, style, pattern=SECTION_BACKGROUND):
+        """Replace the first background gradient style in a section."""
+        self._check(name)
+        pieces = []
+        replaced = False
+        for piece in self.pieces[name]:
+            if replaced or isinstance(piece, str):
+                pieces.append(piece)
+                continue
+            start, end = piece
+            m = pattern.search(self.index.html, start, end)
+            if not m:
+                pieces.append(piece)
+                continue
+            pieces += [(start, m.start()), f'style="{style}"', (m.end(), end)]
+            replaced = True
+        self.pieces[name] = pieces
+        return self
+
+    def render(self):
+        html = self.index.html
+        parts = [html[:self.index.head_end]]
+        for name in self.order:
+            for piece in self.pieces[name]:
+                parts.append(piece if isinstance(piece, str) else html[piece[0]:piece[1]])
+        return ''.join(parts)
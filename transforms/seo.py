@@ -0,0 +1,84 @@
+"""
+Canonical URLs derived from vercel.json instead of hand-kept tables.
+
+canonical-urls  -- point <link rel="canonical"> and og:url at the page's
+                   clean URL, dropping duplicate canonical tags
+
+With cleanUrls, about.html is served at /about and blog/index.html at /blog
+(or /blog/ with trailingSlash). The same rules drive the sitemap
+(python3 -m transforms.sitemap).
+"""
+import json
+import os
+import re
+from functools import lru_cache
+
+from .engine import ROOT
+from .registry import transform
+
+SITE_URL = 'https://perioskoup.com'
+VERCEL_CONFIG = 'vercel.json'
+
+HEAD_END = re.compile(r'</head\s*>', re.IGNORECASE)
+CANONICAL = re.compile(r'[ \t]*<link\s+rel="canonical"\s+href="([^"]*)"\s*/?>\n?')
+OG_URL = re.compile(r'(<meta\s+property="og:url"\s+content=")([^"]*)(")')
+ROBOTS = re.compile(r'<meta\s+name="robots"\s+content="([^"]*)"', re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def vercel_config(root=ROOT):
+    try:
+        with open(os.path.join(root, VERCEL_CONFIG), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def url_path(path, root=ROOT):
+    """Site path a page is served at, e.g. 'blog/index.html' -> '/blog'."""
+    config = vercel_config(root)
+    path = path.replace(os.sep, '/')
+    if path == 'index.html':
+        return '/'
+    if path.endswith('/index.html'):
+        url = '/' + path[:-len('/index.html')]
+        return url + '/' if config.get('trailingSlash') else url
+    if config.get('cleanUrls') and path.endswith('.html'):
+        path = path[:-len('.html')]
+    return '/' + path
+
+
+def canonical_url(path, root=ROOT):
+    return SITE_URL + url_path(path, root)
+
+
+def is_noindex(head):
+    m = ROBOTS.search(head)
+    return bool(m and 'noindex' in m.group(1).lower())
+
+
+@transform('canonical-urls', sources=[VERCEL_CONFIG])
+def canonical_urls(content, page):
+    head_end = HEAD_END.search(content)
+    if not head_end:
+        return content
+    head, rest = content[:head_end.start()], content[head_end.start():]
+    if is_noindex(head):
+        return content
+    url = canonical_url(page.path, page.root)
+    tag = f'<link rel="canonical" href="{url}">'
+
+    seen = []
+
+    def keep_first(m):
+        seen.append(m)
+        if len(seen) > 1:
+            return ''
+        indent = m.group(0)[:len(m.group(0)) - len(m.group(0).lstrip(' \t'))]
+        return f'{indent}{tag}\n' if m.group(0).endswith('\n') else f'{indent}{tag}'
+
+    head = CANONICAL.sub(keep_first, head)
+    if not seen:
+        head = head.rstrip() + f'\n    {tag}\n'
+    head = OG_URL.sub(lambda m: f'{m.group(1)}{url}{m.group(3)}', head)
+    return head + rest
@@ -0,0 +1,327 @@
+"""
+Local static server for dist/ that behaves like the Vercel deployment.
+
+URLs resolve the way vercel.json says (transforms/links.py's Site):
+cleanUrls serves /about from about.html and 308-redirects /about.html to
+/about, trailingSlash: false redirects /blog/ to /blog, and literal
+redirects and rewrites apply. The "headers" rules are sent too, so
+Cache-Control matches production. Missing paths get 404.html if there is
+one.
+
+Responses carry a strong ETag and Last-Modified and answer If-None-Match
+and If-Modified-Since with 304 and single-range requests with 206. When
+the client accepts it, the .br or .gz sibling written by
+transforms/minify.py is sent instead of the file (Content-Encoding, Vary:
+Accept-Encoding); range requests always get the identity bytes. File
+contents are kept in an LRU cache bounded by --cache-mb and checked
+against mtime and size on each request, so a rebuild is picked up without
+a restart (new pages need one). Connections are kept alive and handled
+by a thread each, which is enough for thousands of requests per second
+from localhost.
+
+Point the Playwright specs at it with BASE_URL:
+
+    npm run build && python3 -m transforms.serve
+    BASE_URL=http://127.0.0.1:8000 npx playwright test --workers 8
+"""
+import argparse
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from .engine import ROOT
+from .links import Site
+from .seo import vercel_config
+from .sitemap import walk_pages
+
+NOT_FOUND_PAGE = '404.html'
+# Accept-Encoding token -> sibling suffix written by minify.py, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+TEXT_TYPES = ('application/javascript', 'application/json', 'application/xml', 'image/svg+xml')
+RESOLVE_CACHE = 4096
+
+Entry = namedtuple('Entry', 'data etag last_modified mtime stamp')
+
+
+class FileCache:
+    """Bounded LRU of file contents (by total bytes), revalidated against mtime and size."""
+
+    def __init__(self, max_bytes, max_entry=None):
+        self.max_bytes = max_bytes
+        self.max_entry = max_entry if max_entry is not None else max_bytes // 8
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        """Entry for path; raises OSError if it can't be read."""
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry.stamp == stamp:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        with open(path, 'rb') as f:
+            data = f.read()
+        entry = Entry(data, '"%s"' % hashlib.blake2b(data, digest_size=10).hexdigest(),
+                      formatdate(st.st_mtime, usegmt=True), int(st.st_mtime), stamp)
+        if len(data) <= self.max_entry:
+            with self.lock:
+                old = self.entries.pop(path, None)
+                if old is not None:
+                    self.size -= len(old.data)
+                self.entries[path] = entry
+                self.size += len(data)
+                while self.size > self.max_bytes:
+                    _, evicted = self.entries.popitem(last=False)
+                    self.size -= len(evicted.data)
+        return entry
+
+
+def header_rules(config):
+    """[(compiled source, [(key, value)])] from vercel.json "headers"."""
+    rules = []
+    for rule in config.get('headers', []):
+        # path-to-regexp parameters; the (...) groups are already regexes
+        source = re.sub(r':\w+\*', '.*', rule['source'])
+        source = re.sub(r':\w+', '[^/]+', source)
+        rules.append((re.compile(f'^{source}$'), [(h['key'], h['value']) for h in rule.get('headers', [])]))
+    return rules
+
+
+def accepted_encodings(header):
+    """Tokens from ENCODINGS the Accept-Encoding header allows, best first."""
+    weights = {}
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.strip().lower()] = q
+    return [name for name, _ in ENCODINGS if weights.get(name, weights.get('*', 0)) > 0]
+
+
+def byte_range(header, size):
+    """(first, last) inclusive for a single bytes range; None to ignore it; False if unsatisfiable."""
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None  # multiple ranges: send the whole file
+    first, _, last = spec.strip().partition('-')
+    try:
+        if first == '':
+            length = int(last)
+            if length == 0:
+                return False
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def content_type(path):
+    kind = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if kind.startswith('text/') or kind in TEXT_TYPES:
+        kind += '; charset=utf-8'
+    return kind
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    server_version = 'transforms.serve'
+
+    def do_GET(self):
+        self.serve(body=True)
+
+    def do_HEAD(self):
+        self.serve(body=False)
+
+    def log_message(self, format, *args):
+        if self.server.log:
+            super().log_message(format, *args)
+
+    def serve(self, body):
+        parts = urlsplit(self.path)
+        path = unquote(parts.path) or '/'
+        if '..' in path.split('/') or '\0' in path:
+            return self.not_found(body)
+        target, redirect = self.server.resolve(path)
+        if target is None:
+            return self.not_found(body)
+        if redirect is not None:
+            self.send_response(HTTPStatus.PERMANENT_REDIRECT)
+            self.send_header('Location', redirect + (f'?{parts.query}' if parts.query else ''))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_file(os.path.join(self.server.directory, target), path, body)
+
+    def send_file(self, file, path, body, status=HTTPStatus.OK):
+        range_header = self.headers.get('Range') if status == HTTPStatus.OK else None
+        encoding = None
+        entry = None
+        vary = False
+        accepted = accepted_encodings(self.headers.get('Accept-Encoding')) if range_header is None else ()
+        for name, suffix in ENCODINGS:
+            if os.path.exists(file + suffix):
+                vary = True
+                if entry is None and name in accepted:
+                    try:
+                        entry, encoding = self.server.cache.get(file + suffix), name
+                    except OSError:
+                        pass
+        if entry is None:
+            try:
+                entry = self.server.cache.get(file)
+            except OSError:
+                return self.not_found(body) if status == HTTPStatus.OK else self.send_error(status)
+
+        headers = [('Content-Type', content_type(file)), ('ETag', entry.etag), ('Last-Modified', entry.last_modified)]
+        headers += self.server.headers_for(path)
+        if vary:
+            headers.append(('Vary', 'Accept-Encoding'))
+        if status == HTTPStatus.OK and self.not_modified(entry):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            for key, value in headers[1:]:
+                self.send_header(key, value)
+            self.end_headers()
+            return
+
+        data = entry.data
+        size = len(data)
+        span = None
+        if range_header is not None:
+            if_range = self.headers.get('If-Range')
+            if if_range is None or if_range.strip() in (entry.etag, entry.last_modified):
+                span = byte_range(range_header, size)
+        if span is False:
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header('Content-Range', f'bytes */{size}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if span is not None:
+            status = HTTPStatus.PARTIAL_CONTENT
+            headers.append(('Content-Range', f'bytes {span[0]}-{span[1]}/{size}'))
+            data = memoryview(data)[span[0]:span[1] + 1]
+        if encoding is not None:
+            headers.append(('Content-Encoding', encoding))
+        headers += [('Accept-Ranges', 'bytes'), ('Content-Length', str(len(data)))]
+
+        self.send_response(status)
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(data)
+
+    def not_modified(self, entry):
+        match = self.headers.get('If-None-Match')
+        if match is not None:
+            tags = [tag.strip().removeprefix('W/') for tag in match.split(',')]
+            return '*' in tags or entry.etag in tags
+        since = self.headers.get('If-Modified-Since')
+        if since is not None:
+            try:
+                return entry.mtime <= parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def not_found(self, body):
+        page = os.path.join(self.server.directory, NOT_FOUND_PAGE)
+        if os.path.isfile(page):
+            return self.send_file(page, '/' + NOT_FOUND_PAGE, body, HTTPStatus.NOT_FOUND)
+        data = b'Not found\n'
+        self.send_response(HTTPStatus.NOT_FOUND)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if body:
+            self.wfile.write(data)
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, directory, cache_bytes, log=False, root=ROOT):
+        super().__init__(address, Handler)
+        self.directory = directory
+        self.log = log
+        self.cache = FileCache(cache_bytes)
+        self.site = Site(directory, list(walk_pages(directory)), root=root)
+        self.rules = header_rules(vercel_config(root))
+        self.resolve = lru_cache(maxsize=RESOLVE_CACHE)(self.site.resolve)
+        self._headers = lru_cache(maxsize=RESOLVE_CACHE)(self._headers_for)
+
+    def _headers_for(self, path):
+        headers = {}
+        for pattern, values in self.rules:
+            if pattern.match(path):
+                headers.update(values)  # later rules win, as on Vercel
+        return tuple(headers.items())
+
+    def headers_for(self, path):
+        return list(self._headers(path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.serve', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default='dist', help='directory to serve (default: dist)')
+    parser.add_argument('--host', default='127.0.0.1', help='address to bind (default: 127.0.0.1)')
+    parser.add_argument('-p', '--port', type=int, default=8000, help='port (default: 8000)')
+    parser.add_argument('--cache-mb', type=float, default=64, help='in-memory file cache size (default: 64)')
+    parser.add_argument('--log', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+
+    directory = os.path.normpath(os.path.join(ROOT, args.dir))
+    if not os.path.isdir(directory):
+        print(f'✗ {args.dir}/ not found (run npm run build first)')
+        return 1
+    try:
+        server = Server((args.host, args.port), directory, int(args.cache_mb * 1024 * 1024), args.log)
+    except OSError as e:
+        print(f'✗ cannot listen on {args.host}:{args.port}: {e.strerror}')
+        return 1
+    config = vercel_config()
+    print(f"✓ serving {args.dir}/ ({len(server.site.pages)} pages) at http://{args.host}:{args.port}  "
+          f"(cleanUrls: {str(config.get('cleanUrls', False)).lower()}, "
+          f"trailingSlash: {str(config.get('trailingSlash')).lower()}, {len(server.rules)} header rules)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f'\n{server.cache.hits} cache hits, {server.cache.misses} misses, '
+              f'{server.cache.size / 1024 / 1024:.1f} MB cached')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
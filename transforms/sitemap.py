@@ -0,0 +1,245 @@
+"""
+Streaming sitemap generator.
+
+Walks the site's pages (the source tree by default, the same pages vite.config.js
+builds) once, in sorted order, and writes one <url> per indexable page
+straight to disk: the canonical URL follows
+vercel.json (transforms/seo.py) and lastmod is the date the page's content
+hash last changed. Those dates live in sitemap-state.tsv (path, hash,
+lastmod; sorted by path, committed), which is merge-joined against the walk
+and rewritten line by line, so unchanged pages keep their date and memory
+use doesn't grow with the number of pages.
+
+Past 50,000 URLs (or 50 MB) the output is split into sitemap-1.xml,
+sitemap-2.xml, ... with sitemap.xml as the sitemap index.
+
+It runs in npm's prebuild hook and writes public/sitemap.xml, which Vite
+copies into dist/. Source pages are scanned rather than dist/ so lastmod
+only moves when a page's own markup does, not whenever a bundle hash does.
+
+    python3 -m transforms.sitemap                    # pages -> public/
+    python3 -m transforms.sitemap --dir dist --out dist --dry-run
+"""
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import sys
+import tempfile
+from datetime import date
+from xml.sax.saxutils import escape
+
+from .engine import ROOT
+from .seo import SITE_URL, canonical_url, is_noindex
+
+STATE_FILE = 'sitemap-state.tsv'
+SITEMAP = 'sitemap.xml'
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+HEAD_LIMIT = 256 * 1024  # bytes scanned for <meta name="robots">
+CHUNK = 64 * 1024
+
+# Never descended into (matters when scanning the source tree with --dir .)
+SKIP_DIRS = frozenset(['node_modules', 'dist', 'public', 'partials', 'components', 'content', 'test-results'])
+CHUNK_NAME = re.compile(r'^sitemap-\d+\.xml$')
+
+# Pages that are deployed but not meant for search engines
+SITEMAP_EXCLUDE = [
+    'seo-geo-strategy.html',  # internal SEO planning doc
+    '404.html',
+]
+
+URLSET_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = '</urlset>\n'
+INDEX_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_CLOSE = '</sitemapindex>\n'
+
+
+def walk_pages(directory, prefix=''):
+    """Yield .html paths under directory in plain string order of the path.
+
+    Siblings are sorted with a trailing '/' on directories, which makes the
+    depth-first walk come out in the same order as sorting the full paths;
+    only one directory listing is held at a time.
+    """
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+    keyed = sorted((e.name + '/' if e.is_dir() else e.name, e) for e in entries)
+    del entries
+    for key, entry in keyed:
+        if key.endswith('/'):
+            if not entry.name.startswith('.') and entry.name not in SKIP_DIRS:
+                yield from walk_pages(entry.path, f'{prefix}{entry.name}/')
+        elif entry.name.endswith('.html'):
+            yield prefix + entry.name
+
+
+def scan_page(path):
+    """(content hash, noindex) of one page, reading it in chunks."""
+    h = hashlib.sha256()
+    head = b''
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK), b''):
+            h.update(chunk)
+            if len(head) < HEAD_LIMIT and b'</head' not in head:
+                head += chunk
+    head = head.split(b'</head', 1)[0].decode('utf-8', 'replace')
+    return h.hexdigest()[:16], is_noindex(head)
+
+
+def read_state(path):
+    """Yield (path, hash, lastmod) from a sorted state file."""
+    try:
+        f = open(path, 'r')
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) == 3:
+                yield tuple(fields)
+
+
+def dated_pages(directory, state_path, new_state, today):
+    """Yield (path, lastmod) for indexable pages, writing the new state as it goes."""
+    old = read_state(state_path)
+    previous = next(old, None)
+    for path in walk_pages(directory):
+        while previous is not None and previous[0] < path:
+            previous = next(old, None)
+        digest, noindex = scan_page(os.path.join(directory, path))
+        if noindex or path in SITEMAP_EXCLUDE:
+            continue
+        if previous is not None and previous[0] == path and previous[1] == digest:
+            lastmod = previous[2]
+        else:
+            lastmod = today
+        new_state.write(f'{path}\t{digest}\t{lastmod}\n')
+        yield path, lastmod
+
+
+class SitemapWriter:
+    """Writes <url> entries into numbered chunk files, starting a new one at
+    MAX_URLS entries or MAX_BYTES."""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.chunks = []  # file names
+        self.latest = []  # newest lastmod in each chunk
+        self.file = None
+        self.count = 0
+        self.size = 0
+        self.total = 0
+
+    def _open(self):
+        name = f'sitemap-{len(self.chunks) + 1}.xml'
+        self.chunks.append(name)
+        self.latest.append('')
+        self.file = open(os.path.join(self.out_dir, name + '.tmp'), 'w')
+        self.file.write(URLSET_OPEN)
+        self.count = 0
+        self.size = len(URLSET_OPEN) + len(URLSET_CLOSE)
+
+    def _close(self):
+        if self.file:
+            self.file.write(URLSET_CLOSE)
+            self.file.close()
+            self.file = None
+
+    def add(self, loc, lastmod):
+        entry = f'  <url>\n    <loc>{escape(loc)}</loc>\n    <lastmod>{lastmod}</lastmod>\n  </url>\n'
+        if self.file is None or self.count >= MAX_URLS or self.size + len(entry.encode()) > MAX_BYTES:
+            self._close()
+            self._open()
+        self.file.write(entry)
+        self.latest[-1] = max(self.latest[-1], lastmod)
+        self.count += 1
+        self.size += len(entry.encode())
+        self.total += 1
+
+    def finish(self):
+        """Move the chunks into place; returns the files written."""
+        if self.file is None:
+            self._open()
+        self._close()
+        tmp = lambda name: os.path.join(self.out_dir, name + '.tmp')
+        if len(self.chunks) == 1:
+            os.replace(tmp(self.chunks[0]), os.path.join(self.out_dir, SITEMAP))
+            return [SITEMAP]
+        for name in self.chunks:
+            os.replace(tmp(name), os.path.join(self.out_dir, name))
+        with open(tmp(SITEMAP), 'w') as f:
+            f.write(INDEX_OPEN)
+            for name, lastmod in zip(self.chunks, self.latest):
+                f.write(f'  <sitemap>\n    <loc>{SITE_URL}/{name}</loc>\n    <lastmod>{lastmod}</lastmod>\n  </sitemap>\n')
+            f.write(INDEX_CLOSE)
+        os.replace(tmp(SITEMAP), os.path.join(self.out_dir, SITEMAP))
+        return [SITEMAP] + self.chunks
+
+
+def remove_stale_chunks(out_dir, keep):
+    """Delete sitemap-N.xml files left over from a bigger previous run."""
+    for name in os.listdir(out_dir):
+        if CHUNK_NAME.match(name) and name not in keep:
+            os.remove(os.path.join(out_dir, name))
+
+
+def generate(directory, out_dirs, root=ROOT, today=None, dry_run=False):
+    """Write the sitemap for the pages under directory into each of out_dirs.
+    Returns (url count, files written)."""
+    today = today or date.today().isoformat()
+    state_path = os.path.join(root, STATE_FILE)
+    build_dir = out_dirs[0]
+    os.makedirs(build_dir, exist_ok=True)
+    writer = SitemapWriter(build_dir)
+    with open(state_path + '.tmp', 'w') as new_state:
+        for path, lastmod in dated_pages(directory, state_path, new_state, today):
+            writer.add(canonical_url(path, root), lastmod)
+    files = writer.finish()
+    if dry_run:
+        os.remove(state_path + '.tmp')
+        return writer.total, files
+    os.replace(state_path + '.tmp', state_path)
+    remove_stale_chunks(build_dir, files)
+    for out_dir in out_dirs[1:]:
+        os.makedirs(out_dir, exist_ok=True)
+        for name in files:
+            shutil.copyfile(os.path.join(build_dir, name), os.path.join(out_dir, name))
+        remove_stale_chunks(out_dir, files)
+    return writer.total, files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.sitemap', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default='.', help='directory of pages to scan (default: the source tree)')
+    parser.add_argument('--out', action='append',
+                        help='directory to write sitemap files to; repeatable (default: public)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='generate into a temporary directory and leave the state file alone')
+    args = parser.parse_args(argv)
+
+    directory = os.path.join(ROOT, args.dir)
+    if not os.path.isdir(directory):
+        print(f'✗ {args.dir}/ not found')
+        return 1
+    out_dirs = [os.path.join(ROOT, d) for d in (args.out or ['public'])]
+    if args.dry_run:
+        tmp = tempfile.mkdtemp(prefix='sitemap-')
+        try:
+            count, files = generate(directory, [tmp], dry_run=True)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        print(f"{count} URLs would be written to {', '.join(files)} (dry run)")
+        return 0
+    count, files = generate(directory, out_dirs)
+    where = ', '.join(os.path.relpath(d, ROOT) for d in out_dirs)
+    print(f"✓ {count} URLs in {', '.join(files)} ({where})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
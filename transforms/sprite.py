@@ -0,0 +1,180 @@
+"""
+Shared SVG sprite for the icons every page repeats inline.
+
+Runs in npm's postbuild hook after transforms.fonts and before minification.
+The footer's LinkedIn/Instagram/X logos, the navbar hamburger, breadcrumb
+chevrons and check marks are inline <svg>s, so every HTML response ships
+the same vector data again. This finds the inline <svg>s that occur at
+least MIN_USES times across dist/ and whose content is at least MIN_BYTES
+long, keys each by a hash of its viewBox and whitespace-normalized content,
+and writes them as <symbol>s to one fingerprinted dist/icons.<hash>.svg,
+which vercel.json caches as immutable. Each occurrence keeps its own <svg>
+tag (class, aria-*, role, fill/stroke, viewBox) and only its content
+becomes <use href="/icons.<hash>.svg#<id>"/>; fill and stroke still
+inherit through <use>, so currentColor and Tailwind text colours work as
+before.
+
+SVGs that reference ids or url(#...) (gradients, clip paths, masks) or
+contain <style>, <script>, <use> or <foreignObject> stay inline, because
+those don't resolve the same way in an external sprite. Icons injected by
+navbar-init.js and the main bundle are in cached scripts already and are
+left alone.
+
+Rerunning on a rewritten dist/ is safe: symbols the pages already use are
+read back from the old sprite and the pages are pointed at the new one.
+
+    npm run build                           # runs this as postbuild
+    python3 -m transforms.sprite --dry-run  # what would move, and the savings
+"""
+import argparse
+import glob
+import hashlib
+import os
+import re
+import sys
+
+from .assets import HASH_LENGTH
+from .engine import ROOT
+from .locator import locate, splice
+from .sitemap import walk_pages
+
+SPRITE_NAME = 'icons'  # dist/icons.<hash>.svg
+MIN_USES = 2
+MIN_BYTES = 120  # a <use> reference costs about 45
+ID_LENGTH = 8
+# Attributes that position the drawing inside the viewport; copied to the <symbol>
+SYMBOL_ATTRS = ('viewBox', 'preserveAspectRatio')
+UNSAFE = re.compile(r'\sid\s*=|url\(\s*#|[\s:]href\s*=|<(?:style|script|use|foreignObject)\b', re.IGNORECASE)
+SPRITE_FILE = re.compile(re.escape(SPRITE_NAME) + r'\.[0-9a-f]{%d}\.svg$' % HASH_LENGTH)
+REFERENCE = re.compile(r'/' + re.escape(SPRITE_NAME) + r'\.[0-9a-f]{%d}\.svg#([\w-]+)' % HASH_LENGTH)
+SYMBOL = re.compile(r'<symbol id="([\w-]+)"([^>]*)>(.*?)</symbol>', re.DOTALL)
+
+
+def normalize(inner):
+    return ' '.join(inner.split())
+
+
+def symbol_attrs(el):
+    # locator lowercases attribute names; SVG's are case-sensitive
+    return ''.join(f' {name}="{el.attrs[name.lower()]}"' for name in SYMBOL_ATTRS if el.attrs.get(name.lower()))
+
+
+def inline_svgs(page_html):
+    """[(element, symbol attributes, normalized content)] for the outermost inline <svg>s worth sharing."""
+    doc = locate(page_html)
+    svgs = doc.find_all('svg')
+    found = []
+    for el in svgs:
+        if not el.closed or el.inner_end <= el.inner_start:
+            continue
+        if any(other is not el and other.contains(el) for other in svgs):
+            continue
+        content = normalize(doc.inner(el))
+        if len(content) < MIN_BYTES or UNSAFE.search(content):
+            continue
+        found.append((el, symbol_attrs(el), content))
+    return found
+
+
+def symbol_id(attrs, content):
+    return 'i' + hashlib.sha256(f'{attrs}\n{content}'.encode()).hexdigest()[:ID_LENGTH]
+
+
+def render_sprite(symbols):
+    body = ''.join(f'<symbol id="{id}"{attrs}>{content}</symbol>' for id, (attrs, content) in sorted(symbols.items()))
+    return f'<svg xmlns="http://www.w3.org/2000/svg">{body}</svg>\n'
+
+
+def old_symbols(directory):
+    """{id: (attrs, content)} from sprites a previous run wrote, and their paths."""
+    symbols = {}
+    paths = [path for path in glob.glob(os.path.join(directory, f'{SPRITE_NAME}.*.svg'))
+             if SPRITE_FILE.search(os.path.basename(path))]
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for m in SYMBOL.finditer(f.read()):
+                symbols[m.group(1)] = (m.group(2), m.group(3))
+    return symbols, paths
+
+
+def build(directory, dry_run=False):
+    """Move repeated inline SVGs into the sprite and rewrite the pages; returns a report dict."""
+    pages = list(walk_pages(directory))
+    contents = {}
+    found = {}
+    uses = {}
+    for page in pages:
+        with open(os.path.join(directory, page), 'r', encoding='utf-8') as f:
+            contents[page] = f.read()
+        found[page] = [(el, symbol_id(attrs, content), attrs, content)
+                       for el, attrs, content in inline_svgs(contents[page])]
+        for _, id, _, _ in found[page]:
+            uses[id] = uses.get(id, 0) + 1
+
+    previous, old_paths = old_symbols(directory)
+    referenced = {m.group(1) for page_html in contents.values() for m in REFERENCE.finditer(page_html)}
+    symbols = {id: previous[id] for id in referenced if id in previous}
+    for page in pages:
+        for _, id, attrs, content in found[page]:
+            if uses[id] >= MIN_USES:
+                symbols[id] = (attrs, content)
+    report = {'pages': len(pages), 'symbols': len(symbols), 'moved': 0, 'saved': 0, 'rewritten': [],
+              'missing': sorted(referenced - set(symbols)), 'sprite': None}
+    if not symbols:
+        return report
+
+    sprite = render_sprite(symbols)
+    name = f'{SPRITE_NAME}.{hashlib.sha256(sprite.encode()).hexdigest()[:HASH_LENGTH]}.svg'
+    url = f'/{name}'
+    report['sprite'] = (url, len(sprite.encode()))
+    for page in pages:
+        page_html = contents[page]
+        edits = []
+        for el, id, _, _ in found[page]:
+            if id in symbols:
+                edits.append((el.inner_start, el.inner_end, f'<use href="{url}#{id}"/>'))
+                report['moved'] += 1
+        new = splice(page_html, edits) if edits else page_html
+        new = REFERENCE.sub(lambda m: f'{url}#{m.group(1)}', new)
+        if new != page_html:
+            report['saved'] += len(page_html.encode()) - len(new.encode())
+            report['rewritten'].append(page)
+            if not dry_run:
+                with open(os.path.join(directory, page), 'w', encoding='utf-8') as f:
+                    f.write(new)
+    if not dry_run:
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            f.write(sprite)
+        for path in old_paths:
+            if os.path.basename(path) != name:
+                os.remove(path)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.sprite', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default='dist', help='build output to rewrite (default: dist)')
+    parser.add_argument('--dry-run', action='store_true', help="report, don't write to dist")
+    args = parser.parse_args(argv)
+
+    directory = os.path.normpath(os.path.join(ROOT, args.dir))
+    if not os.path.isdir(directory):
+        print(f'✗ {args.dir}/ not found (run npm run build first)')
+        return 1
+    report = build(directory, args.dry_run)
+    if report['sprite'] is None:
+        print(f"✓ no inline SVG repeats in {args.dir}/ ({report['pages']} pages)")
+        return 0
+    url, size = report['sprite']
+    print(f"✓ {report['symbols']} symbols -> {url} ({size / 1024:.1f} KB)")
+    for id in report['missing']:
+        print(f'⚠️  #{id} is referenced but no longer in any sprite')
+    print(f"\n{report['moved']} inline SVGs replaced with <use> in {len(report['rewritten'])} of "
+          f"{report['pages']} pages, {report['saved'] / 1024:.1f} KB less HTML"
+          + (' (dry run)' if args.dry_run else ''))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
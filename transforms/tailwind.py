@@ -0,0 +1,263 @@
+"""
+Static Tailwind stylesheets instead of the in-browser Play CDN.
+
+tailwind  -- replace <script src="https://cdn.tailwindcss.com"> and the
+             page's tailwind.config script with a <link> to the stylesheet
+             built for its theme
+
+Pages share a handful of tailwind.config blocks; each distinct one is a
+named theme in tailwind.themes.json and gets its own stylesheet,
+public/css/tailwind-<theme>.css, holding preflight plus only the utilities
+used by that theme's pages (transforms/tailwind_css.py generates them).
+Besides the pages' class attributes and inline scripts, the scan covers
+the partials (the navbar, footer and blog templates) and the site's
+JavaScript, so classes added at runtime are kept. Python sources are not
+scanned: their docstrings and rule names would leak into the CSS.
+
+Class sets are cached per file in .tailwind-cache.json, keyed on mtime,
+size and content hash, so after editing one page only that page is read
+again before the stylesheets are regenerated.
+
+    python3 -m transforms tailwind
+"""
+import glob
+import json
+import os
+import re
+
+from .cache import content_hash
+from .engine import ROOT
+from .locator import line_span, splice, with_leading_comment
+from .registry import transform
+from .tailwind_css import generate
+
+THEMES_FILE = 'tailwind.themes.json'
+CACHE_FILE = '.tailwind-cache.json'
+CACHE_VERSION = 1
+PUBLIC_DIR = 'public'
+CSS_DIR = 'css'  # under public/, served at /css/
+
+# Scanned for classes on top of the pages; they count for every theme
+SCAN_SOURCES = ['partials/*.html', '*.js', 'public/*.js', 'components/*.js']
+
+CDN_SCRIPT = re.compile(r'<script\s+src="https://cdn\.tailwindcss\.com[^"]*"\s*>\s*</script>')
+CONFIG_SCRIPT = re.compile(r'<script>\s*tailwind\.config\s*=\s*(\{.*?\})\s*;?\s*</script>', re.DOTALL)
+STYLESHEET = re.compile(r'<link\s+rel="stylesheet"\s+href="/css/tailwind-([\w-]+)\.css"\s*/?>')
+HEAD_END = re.compile(r'\n?[ \t]*</head\s*>', re.IGNORECASE)
+CLASS_ATTR = re.compile(r'\bclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+SCRIPT = re.compile(r'<script\b([^>]*)>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+# Same idea as Tailwind's default extractor: any run of non-quote,
+# non-space characters is a candidate; non-utilities are dropped later
+CANDIDATE = re.compile(r'[^<>"\'`\s]*[^<>"\'`\s:]')
+JS_TOKEN = re.compile(r'''\s+|//[^\n]*|/\*.*?\*/|'((?:[^'\\]|\\.)*)'|"((?:[^"\\]|\\.)*)"|([\w$.+-]+)|([{}\[\]:,])''',
+                      re.DOTALL)
+
+CDN_LABELS = ('Tailwind CSS',)
+CONFIG_LABELS = ('Tailwind Config',)
+
+
+def parse_config(js):
+    """tailwind.config object literal -> dict (quotes keys, drops comments and trailing commas)."""
+    tokens = []
+    pos = 0
+    while pos < len(js):
+        m = JS_TOKEN.match(js, pos)
+        if not m:
+            raise ValueError(f'Unexpected {js[pos:pos + 20]!r} in tailwind.config')
+        pos = m.end()
+        single, double, word, punct = m.groups()
+        if single is not None or double is not None:
+            tokens.append(json.dumps(single if single is not None else double))
+        elif word is not None:
+            tokens.append(word)
+        elif punct is not None:
+            tokens.append(punct)
+    out = []
+    for i, token in enumerate(tokens):
+        following = tokens[i + 1] if i + 1 < len(tokens) else ''
+        if token == ',' and following in ('}', ']'):
+            continue
+        if token[0] not in '"{}[]:,' and (following == ':' or token not in ('true', 'false', 'null')
+                                          and not re.match(r'^-?[\d.]+$', token)):
+            token = json.dumps(token)
+        out.append(token)
+    return json.loads(''.join(out))
+
+
+def page_classes(html):
+    """Classes in class attributes, plus candidates in inline scripts."""
+    classes = set()
+    for m in CLASS_ATTR.finditer(html):
+        classes.update((m.group(1) if m.group(1) is not None else m.group(2)).split())
+    for m in SCRIPT.finditer(html):
+        if 'ld+json' in m.group(1) or 'tailwind.config' in m.group(2):
+            continue
+        classes.update(CANDIDATE.findall(m.group(2)))
+    return classes
+
+
+def scan(path, html):
+    """Cache entry fields for one file: its classes and, for pages, its theme."""
+    if not path.endswith('.html'):
+        return {'classes': sorted(set(CANDIDATE.findall(html))), 'theme': None, 'config': None}
+    linked = STYLESHEET.search(html)
+    config = None
+    if not linked and CDN_SCRIPT.search(html):
+        m = CONFIG_SCRIPT.search(html)
+        config = parse_config(m.group(1)) if m else {}
+    return {'classes': sorted(page_classes(html)), 'theme': linked.group(1) if linked else None, 'config': config}
+
+
+def load_json(path, default):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp, path)
+
+
+def load_themes(root=ROOT):
+    return load_json(os.path.join(root, THEMES_FILE), {})
+
+
+def theme_for(config, themes):
+    """Name of the theme with exactly this config, or None."""
+    return next((name for name, theme in sorted(themes.items()) if theme == config), None)
+
+
+def stylesheet_url(name):
+    return f'/{CSS_DIR}/tailwind-{name}.css'
+
+
+def scan_files(paths, root=ROOT):
+    """Cache entries for paths; only files whose mtime or size changed are read."""
+    cache_path = os.path.join(root, CACHE_FILE)
+    cache = load_json(cache_path, {})
+    if cache.get('version') != CACHE_VERSION:
+        cache = {'version': CACHE_VERSION, 'files': {}}
+    files = cache['files']
+    entries = {}
+    rescanned = []
+    for path in paths:
+        full = os.path.join(root, path)
+        try:
+            st = os.stat(full)
+        except OSError:
+            continue
+        entry = files.get(path)
+        if entry is None or entry['mtime'] != st.st_mtime_ns or entry['size'] != st.st_size:
+            with open(full, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+            digest = content_hash(text)
+            if entry is None or entry['hash'] != digest:
+                entry = scan(path, text)
+                rescanned.append(path)
+            entry.update(mtime=st.st_mtime_ns, size=st.st_size, hash=digest)
+        entries[path] = entry
+    cache['files'] = entries
+    return entries, rescanned, cache
+
+
+def source_files(root=ROOT):
+    paths = set()
+    for pattern in SCAN_SOURCES:
+        paths.update(p.replace(os.sep, '/') for p in glob.glob(pattern, root_dir=root))
+    return sorted(paths)
+
+
+def prepare(pages, root=ROOT, jobs=1, dry_run=False):
+    """Rescan changed files and regenerate the stylesheet of every theme in use."""
+    themes = load_themes(root)
+    known = dict(themes)
+    sources = source_files(root)
+    entries, rescanned, cache = scan_files(list(pages) + sources, root)
+
+    used = {}
+    for path in pages:
+        entry = entries.get(path)
+        if entry is None:
+            continue
+        name = entry['theme']
+        if name is None and entry['config'] is not None:
+            name = theme_for(entry['config'], themes)
+            if name is None:
+                name = 'theme-' + content_hash(json.dumps(entry['config'], sort_keys=True))[:8]
+                themes[name] = entry['config']
+                print(f'✓ new theme  {name}  (from {path}; rename it in {THEMES_FILE} before committing)')
+        if name is not None:
+            used.setdefault(name, set()).update(entry['classes'])
+    shared = set()
+    for path in sources:
+        if path in entries:
+            shared.update(entries[path]['classes'])
+
+    css_dir = os.path.join(root, PUBLIC_DIR, CSS_DIR)
+    for name, classes in sorted(used.items()):
+        if name not in themes:
+            print(f'✗ tailwind   unknown theme {name!r}; add it to {THEMES_FILE}')
+            continue
+        header = f'/* Generated by python3 -m transforms tailwind (theme "{name}" in {THEMES_FILE}); do not edit. */\n'
+        css, count = generate(classes | shared, themes[name], header)
+        out = os.path.join(css_dir, f'tailwind-{name}.css')
+        old = load_text(out)
+        if css == old:
+            continue
+        if dry_run:
+            print(f'Would write {stylesheet_url(name)}  ({count} utilities, {len(css.encode())} bytes)')
+            continue
+        os.makedirs(css_dir, exist_ok=True)
+        with open(out + '.tmp', 'w') as f:
+            f.write(css)
+        os.replace(out + '.tmp', out)
+        print(f'✓ tailwind   {stylesheet_url(name)}  ({count} utilities, {len(css.encode())} bytes)')
+
+    if not dry_run:
+        if themes != known:
+            write_json(os.path.join(root, THEMES_FILE), themes)
+        write_json(os.path.join(root, CACHE_FILE), cache)
+    if rescanned and len(rescanned) < len(entries):
+        print(f"  rescanned {', '.join(rescanned)}")
+
+
+def load_text(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+@transform('tailwind', sources=[THEMES_FILE], prepare=prepare)
+def tailwind(content, page):
+    head_end = HEAD_END.search(content)
+    if not head_end:
+        return content
+    head, rest = content[:head_end.start()], content[head_end.start():]
+    cdn = CDN_SCRIPT.search(head)
+    if not cdn:
+        return content
+    config = CONFIG_SCRIPT.search(head)
+    name = theme_for(parse_config(config.group(1)) if config else {}, load_themes(page.root))
+    if name is None:
+        return content  # theme not recorded yet (prepare runs first unless --dry-run)
+
+    edits = []
+    for m, labels in ((cdn, CDN_LABELS), (config, CONFIG_LABELS)):
+        if m:
+            start, end = line_span(head, with_leading_comment(head, m.start(), labels), m.end())
+            # Don't leave two blank lines where the block was
+            blank = re.match(r'[ \t]*\n', head[end:])
+            if blank and head.endswith('\n\n', 0, start):
+                end += blank.end()
+            edits.append((start, end, ''))
+    head = splice(head, edits)
+    # The CDN appends its <style> to the end of <head>; keep that cascade order
+    return f'{head.rstrip()}\n\n    <!-- Tailwind CSS -->\n    <link rel="stylesheet" href="{stylesheet_url(name)}">{rest}'
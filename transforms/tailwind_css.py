@@ -0,0 +1,1209 @@
+"""
+Tailwind v3 utility CSS generator (the subset this site uses, and then some).
+
+generate(classes, config) returns the stylesheet for a set of class names
+under a page's tailwind.config: preflight, the --tw-* defaults, keyframes
+and one rule per class that is a Tailwind utility. Anything else (custom
+classes like hero-badge, template placeholders, prose words picked up from
+scripts) is silently ignored, the same as the Play CDN does.
+
+Supported: variants (sm: md: lg: xl: 2xl: max-*: hover: focus: active:
+group-hover: group-open: placeholder: dark: ...), ! and - prefixes, /NN
+opacity modifiers, arbitrary values (w-[500px], blur-[120px], text-[10px],
+shadow-[0_0_8px_rgba(...)], bg-[#fff]) and arbitrary properties
+([mask-type:luminance]). Rules come out in Tailwind's plugin order with the
+responsive variants last, so cascades like "p-4 px-6 md:px-8" behave the
+same as with the CDN.
+"""
+import re
+
+SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px', '2xl': '1536px'}
+
+# Tailwind v3 default palette, shades 50-950
+SHADES = ('50', '100', '200', '300', '400', '500', '600', '700', '800', '900', '950')
+PALETTE = {
+    'slate': 'f8fafc f1f5f9 e2e8f0 cbd5e1 94a3b8 64748b 475569 334155 1e293b 0f172a 020617',
+    'gray': 'f9fafb f3f4f6 e5e7eb d1d5db 9ca3af 6b7280 4b5563 374151 1f2937 111827 030712',
+    'zinc': 'fafafa f4f4f5 e4e4e7 d4d4d8 a1a1aa 71717a 52525b 3f3f46 27272a 18181b 09090b',
+    'neutral': 'fafafa f5f5f5 e5e5e5 d4d4d4 a3a3a3 737373 525252 404040 262626 171717 0a0a0a',
+    'stone': 'fafaf9 f5f5f4 e7e5e4 d6d3d1 a8a29e 78716c 57534e 44403c 292524 1c1917 0c0a09',
+    'red': 'fef2f2 fee2e2 fecaca fca5a5 f87171 ef4444 dc2626 b91c1c 991b1b 7f1d1d 450a0a',
+    'orange': 'fff7ed ffedd5 fed7aa fdba74 fb923c f97316 ea580c c2410c 9a3412 7c2d12 431407',
+    'amber': 'fffbeb fef3c7 fde68a fcd34d fbbf24 f59e0b d97706 b45309 92400e 78350f 451a03',
+    'yellow': 'fefce8 fef9c3 fef08a fde047 facc15 eab308 ca8a04 a16207 854d0e 713f12 422006',
+    'lime': 'f7fee7 ecfccb d9f99d bef264 a3e635 84cc16 65a30d 4d7c0f 3f6212 365314 1a2e05',
+    'green': 'f0fdf4 dcfce7 bbf7d0 86efac 4ade80 22c55e 16a34a 15803d 166534 14532d 052e16',
+    'emerald': 'ecfdf5 d1fae5 a7f3d0 6ee7b7 34d399 10b981 059669 047857 065f46 064e3b 022c22',
+    'teal': 'f0fdfa ccfbf1 99f6e4 5eead4 2dd4bf 14b8a6 0d9488 0f766e 115e59 134e4a 042f2e',
+    'cyan': 'ecfeff cffafe a5f3fc 67e8f9 22d3ee 06b6d4 0891b2 0e7490 155e75 164e63 083344',
+    'sky': 'f0f9ff e0f2fe bae6fd 7dd3fc 38bdf8 0ea5e9 0284c7 0369a1 075985 0c4a6e 082f49',
+    'blue': 'eff6ff dbeafe bfdbfe 93c5fd 60a5fa 3b82f6 2563eb 1d4ed8 1e40af 1e3a8a 172554',
+    'indigo': 'eef2ff e0e7ff c7d2fe a5b4fc 818cf8 6366f1 4f46e5 4338ca 3730a3 312e81 1e1b4b',
+    'violet': 'f5f3ff ede9fe ddd6fe c4b5fd a78bfa 8b5cf6 7c3aed 6d28d9 5b21b6 4c1d95 2e1065',
+    'purple': 'faf5ff f3e8ff e9d5ff d8b4fe c084fc a855f7 9333ea 7e22ce 6b21a8 581c87 3b0764',
+    'fuchsia': 'fdf4ff fae8ff f5d0fe f0abfc e879f9 d946ef c026d3 a21caf 86198f 701a75 4a044e',
+    'pink': 'fdf2f8 fce7f3 fbcfe8 f9a8d4 f472b6 ec4899 db2777 be185d 9d174d 831843 500724',
+    'rose': 'fff1f2 ffe4e6 fecdd3 fda4af fb7185 f43f5e e11d48 be123c 9f1239 881337 4c0519',
+}
+
+SPACING_STEPS = ('0 px 0.5 1 1.5 2 2.5 3 3.5 4 5 6 7 8 9 10 11 12 14 16 20 24 28 32 36 40 44 48 52 '
+                 '56 60 64 72 80 96').split()
+
+
+def _spacing():
+    scale = {}
+    for step in SPACING_STEPS:
+        scale[step] = {'0': '0px', 'px': '1px'}.get(step) or f'{float(step) * 0.25:g}rem'
+    return scale
+
+
+def _fractions(*denominators):
+    return {f'{a}/{b}': f'{a / b * 100:.6f}'.rstrip('0').rstrip('.') + '%'
+            for b in denominators for a in range(1, b)}
+
+
+def _steps(values, unit='', scale=1):
+    return {str(v): f'{v * scale:g}{unit}' for v in values}
+
+
+SANS = 'ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", "Noto Color Emoji"'
+MONO = 'ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace'
+
+
+def default_theme():
+    spacing = _spacing()
+    sizes = {'auto': 'auto', 'full': '100%', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'}
+    return {
+        'screens': dict(SCREENS),
+        'colors': {
+            'inherit': 'inherit', 'current': 'currentColor', 'transparent': 'transparent',
+            'black': '#000', 'white': '#fff',
+            **{name: dict(zip(SHADES, ('#' + c for c in hexes.split()))) for name, hexes in PALETTE.items()},
+        },
+        'spacing': spacing,
+        'fontFamily': {
+            'sans': SANS,
+            'serif': 'ui-serif, Georgia, Cambria, "Times New Roman", Times, serif',
+            'mono': MONO,
+        },
+        'fontSize': {
+            'xs': ['0.75rem', '1rem'], 'sm': ['0.875rem', '1.25rem'], 'base': ['1rem', '1.5rem'],
+            'lg': ['1.125rem', '1.75rem'], 'xl': ['1.25rem', '1.75rem'], '2xl': ['1.5rem', '2rem'],
+            '3xl': ['1.875rem', '2.25rem'], '4xl': ['2.25rem', '2.5rem'], '5xl': ['3rem', '1'],
+            '6xl': ['3.75rem', '1'], '7xl': ['4.5rem', '1'], '8xl': ['6rem', '1'], '9xl': ['8rem', '1'],
+        },
+        'fontWeight': {
+            'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500',
+            'semibold': '600', 'bold': '700', 'extrabold': '800', 'black': '900',
+        },
+        'lineHeight': {
+            **_steps(range(3, 11), 'rem', 0.25),
+            'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2',
+        },
+        'letterSpacing': {
+            'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em',
+            'wide': '0.025em', 'wider': '0.05em', 'widest': '0.1em',
+        },
+        'borderRadius': {
+            'none': '0px', 'sm': '0.125rem', 'DEFAULT': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem',
+            'xl': '0.75rem', '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px',
+        },
+        'borderWidth': {'DEFAULT': '1px', '0': '0px', '2': '2px', '4': '4px', '8': '8px'},
+        'boxShadow': {
+            'sm': '0 1px 2px 0 rgb(0 0 0 / 0.05)',
+            'DEFAULT': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+            'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+            'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+            'xl': '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+            '2xl': '0 25px 50px -12px rgb(0 0 0 / 0.25)',
+            'inner': 'inset 0 2px 4px 0 rgb(0 0 0 / 0.05)',
+            'none': 'none',
+        },
+        'opacity': _steps(range(0, 101, 5), '', 0.01),
+        'zIndex': {'auto': 'auto', **_steps(range(0, 51, 10))},
+        'order': {**_steps(range(1, 13)), 'first': '-9999', 'last': '9999', 'none': '0'},
+        'inset': {**spacing, 'auto': 'auto', 'full': '100%', **_fractions(2, 3, 4)},
+        'margin': {**spacing, 'auto': 'auto'},
+        'width': {**spacing, **sizes, **_fractions(2, 3, 4, 5, 6, 12),
+                  'screen': '100vw', 'svw': '100svw', 'lvw': '100lvw', 'dvw': '100dvw'},
+        'height': {**spacing, **sizes, **_fractions(2, 3, 4, 5, 6),
+                   'screen': '100vh', 'svh': '100svh', 'lvh': '100lvh', 'dvh': '100dvh'},
+        'size': {**spacing, **sizes, **_fractions(2, 3, 4, 5, 6, 12)},
+        'minWidth': {**spacing, **sizes, '0': '0px', 'screen': '100vw'},
+        'minHeight': {**spacing, **sizes, '0': '0px', 'screen': '100vh', 'svh': '100svh', 'dvh': '100dvh'},
+        'maxHeight': {**spacing, **sizes, 'none': 'none', 'screen': '100vh', 'svh': '100svh', 'dvh': '100dvh'},
+        'maxWidth': {
+            **spacing, **sizes, 'none': 'none', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem',
+            'xl': '36rem', '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem',
+            '7xl': '80rem', 'prose': '65ch', **{f'screen-{k}': v for k, v in SCREENS.items()},
+        },
+        'flexBasis': {**spacing, **sizes, **_fractions(2, 3, 4, 5, 6, 12)},
+        'translate': {**spacing, 'full': '100%', **_fractions(2, 3, 4)},
+        'scale': _steps((0, 50, 75, 90, 95, 100, 105, 110, 125, 150), '', 0.01),
+        'rotate': _steps((0, 1, 2, 3, 6, 12, 45, 90, 180), 'deg'),
+        'skew': _steps((0, 1, 2, 3, 6, 12), 'deg'),
+        'flex': {'1': '1 1 0%', 'auto': '1 1 auto', 'initial': '0 1 auto', 'none': 'none'},
+        'gridTemplateColumns': {**{str(n): f'repeat({n}, minmax(0, 1fr))' for n in range(1, 13)},
+                                'none': 'none', 'subgrid': 'subgrid'},
+        'gridTemplateRows': {**{str(n): f'repeat({n}, minmax(0, 1fr))' for n in range(1, 13)},
+                             'none': 'none', 'subgrid': 'subgrid'},
+        'aspectRatio': {'auto': 'auto', 'square': '1 / 1', 'video': '16 / 9'},
+        'blur': {'0': '0', 'none': '0', 'sm': '4px', 'DEFAULT': '8px', 'md': '12px', 'lg': '16px',
+                 'xl': '24px', '2xl': '40px', '3xl': '64px'},
+        'brightness': _steps((0, 50, 75, 90, 95, 100, 105, 110, 125, 150, 200), '', 0.01),
+        'contrast': _steps((0, 50, 75, 100, 125, 150, 200), '', 0.01),
+        'saturate': _steps((0, 50, 100, 150, 200), '', 0.01),
+        'grayscale': {'0': '0', 'DEFAULT': '100%'},
+        'invert': {'0': '0', 'DEFAULT': '100%'},
+        'sepia': {'0': '0', 'DEFAULT': '100%'},
+        'transitionProperty': {
+            'none': 'none', 'all': 'all',
+            'DEFAULT': 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, '
+                       'box-shadow, transform, filter, backdrop-filter',
+            'colors': 'color, background-color, border-color, text-decoration-color, fill, stroke',
+            'opacity': 'opacity', 'shadow': 'box-shadow', 'transform': 'transform',
+        },
+        'transitionDuration': _steps((0, 75, 100, 150, 200, 300, 500, 700, 1000), 'ms'),
+        'transitionTimingFunction': {
+            'linear': 'linear', 'in': 'cubic-bezier(0.4, 0, 1, 1)', 'out': 'cubic-bezier(0, 0, 0.2, 1)',
+            'in-out': 'cubic-bezier(0.4, 0, 0.2, 1)',
+        },
+        'animation': {
+            'none': 'none', 'spin': 'spin 1s linear infinite',
+            'ping': 'ping 1s cubic-bezier(0, 0, 0.2, 1) infinite',
+            'pulse': 'pulse 2s cubic-bezier(0.4, 0, 0.6, 1) infinite', 'bounce': 'bounce 1s infinite',
+        },
+        'keyframes': {
+            'spin': {'to': {'transform': 'rotate(360deg)'}},
+            'ping': {'75%, 100%': {'transform': 'scale(2)', 'opacity': '0'}},
+            'pulse': {'50%': {'opacity': '.5'}},
+            'bounce': {
+                '0%, 100%': {'transform': 'translateY(-25%)', 'animation-timing-function': 'cubic-bezier(0.8,0,1,1)'},
+                '50%': {'transform': 'none', 'animation-timing-function': 'cubic-bezier(0,0,0.2,1)'},
+            },
+        },
+        'ringWidth': {'DEFAULT': '3px', '0': '0px', '1': '1px', '2': '2px', '4': '4px', '8': '8px'},
+        'ringOffsetWidth': {'0': '0px', '1': '1px', '2': '2px', '4': '4px', '8': '8px'},
+        'outlineWidth': {'0': '0px', '1': '1px', '2': '2px', '4': '4px', '8': '8px'},
+        'outlineOffset': {'0': '0px', '1': '1px', '2': '2px', '4': '4px', '8': '8px'},
+        'strokeWidth': {'0': '0', '1': '1', '2': '2'},
+        'textUnderlineOffset': {'auto': 'auto', '0': '0px', '1': '1px', '2': '2px', '4': '4px', '8': '8px'},
+        'lineClamp': _steps(range(1, 7)),
+        'gridColumnSpan': _steps(range(1, 13)),
+        'gridLine': _steps(range(1, 14)),
+        'cursor': {k: k for k in ('auto', 'default', 'pointer', 'wait', 'text', 'move', 'help', 'not-allowed',
+                                  'none', 'progress', 'crosshair', 'grab', 'grabbing', 'zoom-in', 'zoom-out',
+                                  'col-resize', 'row-resize', 'copy', 'context-menu')},
+        'objectPosition': {k: k.replace('-', ' ') for k in ('bottom', 'center', 'left', 'left-bottom', 'left-top',
+                                                            'right', 'right-bottom', 'right-top', 'top')},
+        'transformOrigin': {k: k.replace('-', ' ') for k in ('center', 'top', 'top-right', 'right', 'bottom-right',
+                                                             'bottom', 'bottom-left', 'left', 'top-left')},
+    }
+
+
+# tailwind.config handling ---------------------------------------------------
+
+def _merge(base, extra):
+    merged = dict(base)
+    for key, value in extra.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def resolve_theme(config):
+    """Default theme with config['theme'] (replacing) and theme.extend (deep-merged) applied."""
+    theme = default_theme()
+    overrides = dict((config or {}).get('theme', {}))
+    extend = overrides.pop('extend', {})
+    theme.update(overrides)
+    theme = _merge(theme, extend)
+    theme['colors'] = _flatten_colors(theme['colors'])
+    for key, value in theme['fontFamily'].items():
+        if isinstance(value, list):
+            theme['fontFamily'][key] = ', '.join(v if ' ' not in v or v[0] in '"\'' else f'"{v}"' for v in value)
+    return theme
+
+
+def _flatten_colors(colors, prefix=''):
+    flat = {}
+    for name, value in colors.items():
+        key = prefix if name == 'DEFAULT' else f'{prefix}-{name}' if prefix else name
+        if isinstance(value, dict):
+            flat.update(_flatten_colors(value, key))
+        else:
+            flat[key] = value
+    return flat
+
+
+# Values ---------------------------------------------------------------------
+
+LENGTH = re.compile(r'^-?(?:\d*\.)?\d+(?:px|r?em|%|vh|vw|vmin|vmax|ch|ex|[sld]v[hw]|cm|mm|in|pt|pc)?$')
+CSS_FUNCTION = re.compile(r'^(?:calc|min|max|clamp|var|env)\(')
+COLOR = re.compile(r'^(?:#[0-9a-fA-F]{3,8}|(?:rgba?|hsla?|hwb|oklch|oklab|color-mix)\(.*\)|transparent|currentColor)$')
+HEX = re.compile(r'^#([0-9a-fA-F]{3}|[0-9a-fA-F]{6})$')
+RGB = re.compile(r'^rgba?\(\s*(\d+)[\s,]+(\d+)[\s,]+(\d+)\s*(?:[/,]\s*[\d.]+%?\s*)?\)$')
+SHADOW_COLOR = re.compile(r'rgba?\([^)]*\)|hsla?\([^)]*\)|#[0-9a-fA-F]{3,8}\b')
+
+
+def arbitrary(value):
+    """'[500px]' -> '500px' (underscores are spaces, \\_ is a literal underscore)."""
+    if value and len(value) > 2 and value[0] == '[' and value[-1] == ']':
+        inner = value[1:-1]
+        return re.sub(r'\\_|_', lambda m: '_' if m.group(0) == '\\_' else ' ', inner)
+    return None
+
+
+def _hinted(value, hint):
+    """Strip a type hint like length:... from an arbitrary value; None if it's a different type."""
+    m = re.match(r'^([a-z-]+):(?!//)(.*)$', value)
+    if not m or m.group(1) in ('url',):
+        return value
+    return m.group(2) if m.group(1) == hint else None
+
+
+def is_length(value):
+    return bool(LENGTH.match(value) or CSS_FUNCTION.match(value))
+
+
+def is_color(value):
+    return bool(COLOR.match(value))
+
+
+def split_modifier(value):
+    """'white/10' -> ('white', '10'); slashes inside [...] don't count."""
+    depth = 0
+    for i in range(len(value) - 1, -1, -1):
+        c = value[i]
+        if c == ']':
+            depth += 1
+        elif c == '[':
+            depth -= 1
+        elif c == '/' and depth == 0:
+            return value[:i], value[i + 1:]
+    return value, None
+
+
+def _alpha(modifier, theme):
+    if modifier is None:
+        return None
+    value = arbitrary(modifier)
+    if value is None:
+        value = theme['opacity'].get(modifier)
+    return value
+
+
+def with_alpha(color, alpha):
+    if alpha is None:
+        return color
+    m = HEX.match(color)
+    if m:
+        digits = m.group(1)
+        if len(digits) == 3:
+            digits = ''.join(c * 2 for c in digits)
+        r, g, b = (int(digits[i:i + 2], 16) for i in (0, 2, 4))
+        return f'rgb({r} {g} {b} / {alpha})'
+    m = RGB.match(color)
+    if m:
+        return f'rgb({m.group(1)} {m.group(2)} {m.group(3)} / {alpha})'
+    if color in ('transparent', 'currentColor', 'inherit'):
+        return color
+    percent = f'{float(alpha) * 100:g}%' if re.match(r'^[\d.]+$', alpha) else alpha
+    return f'color-mix(in srgb, {color} {percent}, transparent)'
+
+
+def color_value(value, theme):
+    if value is None:
+        return None
+    value, modifier = split_modifier(value)
+    arb = arbitrary(value)
+    if arb is not None:
+        color = _hinted(arb, 'color')
+        if color is None or not (is_color(color) or color.startswith('var(')):
+            return None
+    else:
+        color = theme['colors'].get(value)
+        if color is None:
+            return None
+    alpha = _alpha(modifier, theme)
+    if modifier is not None and alpha is None:
+        return None
+    return with_alpha(color, alpha)
+
+
+def theme_value(theme, section, value, check=None):
+    """Look value up in theme[section]; arbitrary values pass through (if check accepts them)."""
+    if value is None:
+        return theme[section].get('DEFAULT')
+    arb = arbitrary(value)
+    if arb is not None:
+        arb = _hinted(arb, 'length') if check is is_length else arb
+        if arb is None or (check is not None and not check(arb)):
+            return None
+        return arb
+    found = theme[section].get(value)
+    return found if isinstance(found, str) else None
+
+
+def negate(value):
+    if value in ('0', '0px', 'auto'):
+        return value
+    if LENGTH.match(value):
+        return value[1:] if value.startswith('-') else '-' + value
+    return f'calc({value} * -1)'
+
+
+# Utilities ------------------------------------------------------------------
+
+TRANSFORM = ('translate(var(--tw-translate-x), var(--tw-translate-y)) rotate(var(--tw-rotate)) '
+             'skewX(var(--tw-skew-x)) skewY(var(--tw-skew-y)) scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))')
+FILTER = ('var(--tw-blur) var(--tw-brightness) var(--tw-contrast) var(--tw-grayscale) var(--tw-hue-rotate) '
+          'var(--tw-invert) var(--tw-saturate) var(--tw-sepia) var(--tw-drop-shadow)')
+BACKDROP = ('var(--tw-backdrop-blur) var(--tw-backdrop-brightness) var(--tw-backdrop-contrast) '
+            'var(--tw-backdrop-grayscale) var(--tw-backdrop-hue-rotate) var(--tw-backdrop-invert) '
+            'var(--tw-backdrop-opacity) var(--tw-backdrop-saturate) var(--tw-backdrop-sepia)')
+COMPOSITES = {'transform': TRANSFORM, 'filter': FILTER}
+BOX_SHADOW = 'var(--tw-ring-offset-shadow, 0 0 #0000), var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)'
+RING_SHADOW = 'var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)'
+EASE = 'cubic-bezier(0.4, 0, 0.2, 1)'
+BETWEEN_CHILDREN = ' > :not([hidden]) ~ :not([hidden])'
+SIDES = {'t': ('top',), 'r': ('right',), 'b': ('bottom',), 'l': ('left',),
+         'x': ('left', 'right'), 'y': ('top', 'bottom')}
+CORNERS = {'t': ('top-left', 'top-right'), 'r': ('top-right', 'bottom-right'),
+           'b': ('bottom-right', 'bottom-left'), 'l': ('top-left', 'bottom-left'),
+           'tl': ('top-left',), 'tr': ('top-right',), 'br': ('bottom-right',), 'bl': ('bottom-left',)}
+
+
+def scale(section, *props, negative=False, check=is_length, extra=()):
+    """Handler mapping a theme scale (or arbitrary value) onto props."""
+    def handler(value, theme, neg):
+        if neg and not negative:
+            return None
+        v = theme_value(theme, section, value, check)
+        if v is None:
+            return None
+        return [(p, negate(v) if neg else v) for p in props] + list(extra)
+    return handler
+
+
+def colors(*props, extra=()):
+    def handler(value, theme, neg):
+        c = None if neg else color_value(value, theme)
+        return None if c is None else [(p, c) for p in props] + list(extra)
+    return handler
+
+
+def composite(section, variables, prop, fmt='{}', negative=False):
+    """Handler setting --tw-* variables and the composite property reading them."""
+    def handler(value, theme, neg):
+        if neg and not negative:
+            return None
+        v = theme_value(theme, section, value)
+        if v is None:
+            return None
+        v = fmt.format(negate(v) if neg else v)
+        return [(var, v) for var in variables] + [(prop, COMPOSITES[prop])]
+    return handler
+
+
+def _backdrop(section, var, fmt):
+    def handler(value, theme, neg):
+        v = None if neg else theme_value(theme, section, value)
+        if v is None:
+            return None
+        return [(var, fmt.format(v)), ('-webkit-backdrop-filter', BACKDROP), ('backdrop-filter', BACKDROP)]
+    return handler
+
+
+def font_size(value, theme, neg):
+    if neg or value is None:
+        return None
+    value, modifier = split_modifier(value)
+    arb = arbitrary(value)
+    if arb is not None:
+        arb = _hinted(arb, 'length')
+        return [('font-size', arb)] if arb and is_length(arb) and modifier is None else None
+    size = theme['fontSize'].get(value)
+    if size is None:
+        return None
+    size, leading = (size, None) if isinstance(size, str) else (size[0], size[1] if len(size) > 1 else None)
+    if isinstance(leading, dict):
+        leading = leading.get('lineHeight')
+    if modifier is not None:
+        leading = arbitrary(modifier) or theme['lineHeight'].get(modifier) or theme['spacing'].get(modifier)
+        if leading is None:
+            return None
+    return [('font-size', size)] + ([('line-height', leading)] if leading else [])
+
+
+def font_family(value, theme, neg):
+    family = None if neg or value is None else theme['fontFamily'].get(value)
+    return None if family is None else [('font-family', family)]
+
+
+def font_weight(value, theme, neg):
+    weight = None if neg else theme_value(theme, 'fontWeight', value, lambda v: v.isdigit())
+    return None if weight is None else [('font-weight', weight)]
+
+
+def box_shadow(value, theme, neg):
+    if neg:
+        return None
+    shadow = theme_value(theme, 'boxShadow', value, lambda v: not is_color(v))
+    if shadow is None:
+        return None
+    if shadow == 'none':
+        return [('--tw-shadow', '0 0 #0000'), ('--tw-shadow-colored', '0 0 #0000'), ('box-shadow', BOX_SHADOW)]
+    colored = SHADOW_COLOR.sub('var(--tw-shadow-color)', shadow)
+    return [('--tw-shadow', shadow), ('--tw-shadow-colored', colored), ('box-shadow', BOX_SHADOW)]
+
+
+def shadow_color(value, theme, neg):
+    c = None if neg else color_value(value, theme)
+    return None if c is None else [('--tw-shadow-color', c), ('--tw-shadow', 'var(--tw-shadow-colored)')]
+
+
+def ring_width(value, theme, neg):
+    width = None if neg else theme_value(theme, 'ringWidth', value, is_length)
+    if width is None:
+        return None
+    return [('--tw-ring-offset-shadow', 'var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color)'),
+            ('--tw-ring-shadow', f'var(--tw-ring-inset) 0 0 0 calc({width} + var(--tw-ring-offset-width)) var(--tw-ring-color)'),
+            ('box-shadow', RING_SHADOW)]
+
+
+def _transparent(color):
+    if color == 'transparent':
+        return 'rgb(0 0 0 / 0)'
+    faded = with_alpha(color, '0')
+    return 'transparent' if faded == color or faded.startswith('color-mix') else faded
+
+
+def gradient_from(value, theme, neg):
+    c = None if neg else color_value(value, theme)
+    if c is None:
+        return None
+    return [('--tw-gradient-from', f'{c} var(--tw-gradient-from-position)'),
+            ('--tw-gradient-to', f'{_transparent(c)} var(--tw-gradient-to-position)'),
+            ('--tw-gradient-stops', 'var(--tw-gradient-from), var(--tw-gradient-to)')]
+
+
+def gradient_via(value, theme, neg):
+    c = None if neg else color_value(value, theme)
+    if c is None:
+        return None
+    return [('--tw-gradient-to', f'{_transparent(c)} var(--tw-gradient-to-position)'),
+            ('--tw-gradient-stops', f'var(--tw-gradient-from), {c} var(--tw-gradient-via-position), var(--tw-gradient-to)')]
+
+
+def gradient_to(value, theme, neg):
+    c = None if neg else color_value(value, theme)
+    return None if c is None else [('--tw-gradient-to', f'{c} var(--tw-gradient-to-position)')]
+
+
+def background(value, theme, neg):
+    """bg-[url(...)] and bg-[length:...]; colours are handled by the colour rule."""
+    arb = None if neg else arbitrary(value or '')
+    if arb is None:
+        return None
+    if arb.startswith(('url(', 'linear-gradient(', 'radial-gradient(', 'conic-gradient(')):
+        return [('background-image', arb)]
+    size = _hinted(arb, 'length')
+    if size is not None and size != arb:
+        return [('background-size', size)]
+    return None
+
+
+def transition(value, theme, neg):
+    prop = None if neg else theme_value(theme, 'transitionProperty', value)
+    if prop is None:
+        return None
+    if prop == 'none':
+        return [('transition-property', 'none')]
+    return [('transition-property', prop), ('transition-timing-function', EASE), ('transition-duration', '150ms')]
+
+
+def animation(value, theme, neg):
+    anim = None if neg else theme_value(theme, 'animation', value)
+    return None if anim is None else [('animation', anim)]
+
+
+def space(axis):
+    def handler(value, theme, neg):
+        v = theme_value(theme, 'spacing', value, is_length)
+        if v is None:
+            return None
+        v = negate(v) if neg else v
+        rev = f'var(--tw-space-{axis}-reverse)'
+        if axis == 'x':
+            return [('--tw-space-x-reverse', '0'), ('margin-right', f'calc({v} * {rev})'),
+                    ('margin-left', f'calc({v} * calc(1 - {rev}))')]
+        return [('--tw-space-y-reverse', '0'), ('margin-top', f'calc({v} * calc(1 - {rev}))'),
+                ('margin-bottom', f'calc({v} * {rev})')]
+    return handler
+
+
+def divide(axis):
+    def handler(value, theme, neg):
+        w = None if neg else theme_value(theme, 'borderWidth', value, is_length)
+        if w is None:
+            return None
+        rev = f'var(--tw-divide-{axis}-reverse)'
+        first, second = ('left', 'right') if axis == 'x' else ('top', 'bottom')
+        return [(f'--tw-divide-{axis}-reverse', '0'), (f'border-{second}-width', f'calc({w} * {rev})'),
+                (f'border-{first}-width', f'calc({w} * calc(1 - {rev}))')]
+    return handler
+
+
+def grid_span(prop):
+    def handler(value, theme, neg):
+        if neg or value is None:
+            return None
+        if value == 'full':
+            return [(prop, '1 / -1')]
+        n = arbitrary(value) or theme['gridColumnSpan'].get(value)
+        return None if n is None else [(prop, f'span {n} / span {n}')]
+    return handler
+
+
+def line_clamp(value, theme, neg):
+    n = None if neg else theme_value(theme, 'lineClamp', value)
+    if n is None:
+        return None
+    return [('overflow', 'hidden'), ('display', '-webkit-box'), ('-webkit-box-orient', 'vertical'),
+            ('-webkit-line-clamp', n)]
+
+
+def content(value, theme, neg):
+    arb = None if neg else arbitrary(value or '')
+    return None if arb is None else [('--tw-content', arb), ('content', 'var(--tw-content)')]
+
+
+def _rules():
+    """Every utility in Tailwind's plugin order: (name, decls) for fixed
+    utilities, (root, handler[, child selector]) for ones taking a value."""
+    r = []
+    add = r.append
+    add(('sr-only', [('position', 'absolute'), ('width', '1px'), ('height', '1px'), ('padding', '0'),
+                     ('margin', '-1px'), ('overflow', 'hidden'), ('clip', 'rect(0, 0, 0, 0)'),
+                     ('white-space', 'nowrap'), ('border-width', '0')]))
+    add(('not-sr-only', [('position', 'static'), ('width', 'auto'), ('height', 'auto'), ('padding', '0'),
+                         ('margin', '0'), ('overflow', 'visible'), ('clip', 'auto'), ('white-space', 'normal')]))
+    r += [(f'pointer-events-{v}', [('pointer-events', v)]) for v in ('none', 'auto')]
+    r += [('visible', [('visibility', 'visible')]), ('invisible', [('visibility', 'hidden')]),
+          ('collapse', [('visibility', 'collapse')])]
+    r += [(v, [('position', v)]) for v in ('static', 'fixed', 'absolute', 'relative', 'sticky')]
+    add(('inset', scale('inset', 'inset', negative=True)))
+    add(('inset-x', scale('inset', 'left', 'right', negative=True)))
+    add(('inset-y', scale('inset', 'top', 'bottom', negative=True)))
+    for side in ('start', 'end', 'top', 'right', 'bottom', 'left'):
+        add((side, scale('inset', {'start': 'inset-inline-start', 'end': 'inset-inline-end'}.get(side, side),
+                         negative=True)))
+    r += [('isolate', [('isolation', 'isolate')]), ('isolation-auto', [('isolation', 'auto')])]
+    add(('z', scale('zIndex', 'z-index', negative=True, check=lambda v: v.lstrip('-').isdigit() or v == 'auto')))
+    add(('order', scale('order', 'order', negative=True, check=None)))
+    add(('col-auto', [('grid-column', 'auto')]))
+    add(('col-span', grid_span('grid-column')))
+    add(('col-start', scale('gridLine', 'grid-column-start', check=None)))
+    add(('col-end', scale('gridLine', 'grid-column-end', check=None)))
+    add(('row-auto', [('grid-row', 'auto')]))
+    add(('row-span', grid_span('grid-row')))
+    add(('row-start', scale('gridLine', 'grid-row-start', check=None)))
+    add(('row-end', scale('gridLine', 'grid-row-end', check=None)))
+    r += [(f'float-{v}', [('float', v)]) for v in ('right', 'left', 'none')]
+    r += [(f'clear-{v}', [('clear', v)]) for v in ('left', 'right', 'both', 'none')]
+    add(('m', scale('margin', 'margin', negative=True)))
+    for side, props in SIDES.items():
+        add((f'm{side}', scale('margin', *(f'margin-{p}' for p in props), negative=True)))
+    r += [('box-border', [('box-sizing', 'border-box')]), ('box-content', [('box-sizing', 'content-box')])]
+    add(('line-clamp', line_clamp))
+    add(('line-clamp-none', [('overflow', 'visible'), ('display', 'block'), ('-webkit-box-orient', 'horizontal'),
+                             ('-webkit-line-clamp', 'none')]))
+    r += [(v, [('display', v)]) for v in ('block', 'inline-block', 'inline', 'flex', 'inline-flex', 'table',
+                                          'inline-table', 'table-caption', 'table-cell', 'table-column',
+                                          'table-column-group', 'table-footer-group', 'table-header-group',
+                                          'table-row-group', 'table-row', 'flow-root', 'grid', 'inline-grid',
+                                          'contents', 'list-item')]
+    add(('hidden', [('display', 'none')]))
+    add(('aspect', scale('aspectRatio', 'aspect-ratio', check=None)))
+    add(('size', scale('size', 'width', 'height')))
+    add(('h', scale('height', 'height')))
+    add(('max-h', scale('maxHeight', 'max-height')))
+    add(('min-h', scale('minHeight', 'min-height')))
+    add(('w', scale('width', 'width')))
+    add(('min-w', scale('minWidth', 'min-width')))
+    add(('max-w', scale('maxWidth', 'max-width')))
+    add(('flex', scale('flex', 'flex', check=None)))
+    for name in ('shrink', 'flex-shrink'):
+        add((name, lambda v, t, n: None if n or v not in (None, '0') else [('flex-shrink', v or '1')]))
+    for name in ('grow', 'flex-grow'):
+        add((name, lambda v, t, n: None if n or v not in (None, '0') else [('flex-grow', v or '1')]))
+    add(('basis', scale('flexBasis', 'flex-basis')))
+    r += [('table-auto', [('table-layout', 'auto')]), ('table-fixed', [('table-layout', 'fixed')]),
+          ('border-collapse', [('border-collapse', 'collapse')]),
+          ('border-separate', [('border-collapse', 'separate')])]
+    add(('origin', scale('transformOrigin', 'transform-origin', check=None)))
+    for axis in ('x', 'y'):
+        add((f'translate-{axis}', composite('translate', [f'--tw-translate-{axis}'], 'transform', negative=True)))
+    add(('rotate', composite('rotate', ['--tw-rotate'], 'transform', negative=True)))
+    for axis in ('x', 'y'):
+        add((f'skew-{axis}', composite('skew', [f'--tw-skew-{axis}'], 'transform', negative=True)))
+    add(('scale', composite('scale', ['--tw-scale-x', '--tw-scale-y'], 'transform', negative=True)))
+    for axis in ('x', 'y'):
+        add((f'scale-{axis}', composite('scale', [f'--tw-scale-{axis}'], 'transform', negative=True)))
+    r += [('transform', [('transform', TRANSFORM)]), ('transform-cpu', [('transform', TRANSFORM)]),
+          ('transform-gpu', [('transform', TRANSFORM.replace(
+              'translate(var(--tw-translate-x), var(--tw-translate-y))',
+              'translate3d(var(--tw-translate-x), var(--tw-translate-y), 0)'))]),
+          ('transform-none', [('transform', 'none')])]
+    add(('animate', animation))
+    add(('cursor', scale('cursor', 'cursor', check=None)))
+    r += [(f'touch-{v}', [('touch-action', v)]) for v in ('auto', 'none', 'manipulation')]
+    r += [(f'select-{v}', [('user-select', v)]) for v in ('none', 'text', 'all', 'auto')]
+    r += [('resize-none', [('resize', 'none')]), ('resize-y', [('resize', 'vertical')]),
+          ('resize-x', [('resize', 'horizontal')]), ('resize', [('resize', 'both')])]
+    r += [('list-inside', [('list-style-position', 'inside')]), ('list-outside', [('list-style-position', 'outside')])]
+    r += [(f'list-{v}', [('list-style-type', v)]) for v in ('none', 'disc', 'decimal')]
+    r += [('appearance-none', [('appearance', 'none')]), ('appearance-auto', [('appearance', 'auto')])]
+    add(('grid-cols', scale('gridTemplateColumns', 'grid-template-columns', check=None)))
+    add(('grid-rows', scale('gridTemplateRows', 'grid-template-rows', check=None)))
+    r += [('grid-flow-row', [('grid-auto-flow', 'row')]), ('grid-flow-col', [('grid-auto-flow', 'column')]),
+          ('grid-flow-dense', [('grid-auto-flow', 'dense')])]
+    r += [('flex-row', [('flex-direction', 'row')]), ('flex-row-reverse', [('flex-direction', 'row-reverse')]),
+          ('flex-col', [('flex-direction', 'column')]), ('flex-col-reverse', [('flex-direction', 'column-reverse')])]
+    r += [('flex-wrap', [('flex-wrap', 'wrap')]), ('flex-wrap-reverse', [('flex-wrap', 'wrap-reverse')]),
+          ('flex-nowrap', [('flex-wrap', 'nowrap')])]
+    aligns = {'start': 'flex-start', 'end': 'flex-end', 'center': 'center', 'between': 'space-between',
+              'around': 'space-around', 'evenly': 'space-evenly', 'stretch': 'stretch', 'baseline': 'baseline',
+              'normal': 'normal'}
+    r += [(f'place-content-{k}', [('place-content', {'start': 'start', 'end': 'end'}.get(k, v))])
+          for k, v in aligns.items() if k not in ('normal',)]
+    r += [(f'place-items-{k}', [('place-items', k)]) for k in ('start', 'end', 'center', 'baseline', 'stretch')]
+    r += [(f'content-{k}', [('align-content', v)]) for k, v in aligns.items()]
+    r += [(f'items-{k}', [('align-items', aligns[k])]) for k in ('start', 'end', 'center', 'baseline', 'stretch')]
+    r += [(f'justify-{k}', [('justify-content', v)]) for k, v in aligns.items() if k != 'baseline']
+    r += [(f'justify-items-{k}', [('justify-items', k)]) for k in ('start', 'end', 'center', 'stretch')]
+    add(('gap', scale('spacing', 'gap')))
+    add(('gap-x', scale('spacing', 'column-gap')))
+    add(('gap-y', scale('spacing', 'row-gap')))
+    add(('space-x', space('x'), BETWEEN_CHILDREN))
+    add(('space-y', space('y'), BETWEEN_CHILDREN))
+    add(('space-x-reverse', [('--tw-space-x-reverse', '1')], BETWEEN_CHILDREN))
+    add(('space-y-reverse', [('--tw-space-y-reverse', '1')], BETWEEN_CHILDREN))
+    add(('divide-x', divide('x'), BETWEEN_CHILDREN))
+    add(('divide-y', divide('y'), BETWEEN_CHILDREN))
+    add(('divide', colors('border-color'), BETWEEN_CHILDREN))
+    r += [(f'self-{k}', [('align-self', {'start': 'flex-start', 'end': 'flex-end'}.get(k, k))])
+          for k in ('auto', 'start', 'end', 'center', 'stretch', 'baseline')]
+    r += [(f'justify-self-{k}', [('justify-self', k)]) for k in ('auto', 'start', 'end', 'center', 'stretch')]
+    for axis in ('', '-x', '-y'):
+        r += [(f'overflow{axis}-{v}', [(f'overflow{axis}', v)]) for v in ('auto', 'hidden', 'clip', 'visible', 'scroll')]
+    r += [(f'overscroll-{v}', [('overscroll-behavior', v)]) for v in ('auto', 'contain', 'none')]
+    r += [('scroll-auto', [('scroll-behavior', 'auto')]), ('scroll-smooth', [('scroll-behavior', 'smooth')])]
+    r += [('truncate', [('overflow', 'hidden'), ('text-overflow', 'ellipsis'), ('white-space', 'nowrap')]),
+          ('text-ellipsis', [('text-overflow', 'ellipsis')]), ('text-clip', [('text-overflow', 'clip')])]
+    r += [(f'whitespace-{v}', [('white-space', v)]) for v in ('normal', 'nowrap', 'pre', 'pre-line', 'pre-wrap',
+                                                              'break-spaces')]
+    r += [('text-wrap', [('text-wrap', 'wrap')]), ('text-nowrap', [('text-wrap', 'nowrap')]),
+          ('text-balance', [('text-wrap', 'balance')]), ('text-pretty', [('text-wrap', 'pretty')])]
+    r += [('break-normal', [('overflow-wrap', 'normal'), ('word-break', 'normal')]),
+          ('break-words', [('overflow-wrap', 'break-word')]), ('break-all', [('word-break', 'break-all')]),
+          ('break-keep', [('word-break', 'keep-all')])]
+    add(('rounded', scale('borderRadius', 'border-radius')))
+    for side, corners in CORNERS.items():
+        add((f'rounded-{side}', scale('borderRadius', *(f'border-{c}-radius' for c in corners))))
+    add(('border', scale('borderWidth', 'border-width')))
+    for side, props in SIDES.items():
+        add((f'border-{side}', scale('borderWidth', *(f'border-{p}-width' for p in props))))
+    r += [(f'border-{v}', [('border-style', v)]) for v in ('solid', 'dashed', 'dotted', 'double', 'hidden', 'none')]
+    add(('border', colors('border-color')))
+    for side, props in SIDES.items():
+        add((f'border-{side}', colors(*(f'border-{p}-color' for p in props))))
+    add(('bg', colors('background-color')))
+    add(('bg', background))
+    add(('bg-none', [('background-image', 'none')]))
+    for key, direction in (('t', 'top'), ('tr', 'top right'), ('r', 'right'), ('br', 'bottom right'),
+                           ('b', 'bottom'), ('bl', 'bottom left'), ('l', 'left'), ('tl', 'top left')):
+        add((f'bg-gradient-to-{key}', [('background-image', f'linear-gradient(to {direction}, var(--tw-gradient-stops))')]))
+    add(('from', gradient_from))
+    add(('via', gradient_via))
+    add(('to', gradient_to))
+    r += [(f'bg-{v}', [('background-size', v)]) for v in ('auto', 'cover', 'contain')]
+    r += [(f'bg-{v}', [('background-attachment', v)]) for v in ('fixed', 'local', 'scroll')]
+    r += [(f'bg-clip-{v}', [('background-clip', v if v == 'text' else f'{v}-box')])
+          for v in ('border', 'padding', 'content', 'text')]
+    r += [(f'bg-{k}', [('background-position', v)]) for k, v in default_theme()['objectPosition'].items()]
+    r += [('bg-repeat', [('background-repeat', 'repeat')]), ('bg-no-repeat', [('background-repeat', 'no-repeat')]),
+          ('bg-repeat-x', [('background-repeat', 'repeat-x')]), ('bg-repeat-y', [('background-repeat', 'repeat-y')])]
+    add(('fill', colors('fill')))
+    add(('stroke', colors('stroke')))
+    add(('stroke', scale('strokeWidth', 'stroke-width', check=None)))
+    r += [(f'object-{v}', [('object-fit', v)]) for v in ('contain', 'cover', 'fill', 'none', 'scale-down')]
+    add(('object', scale('objectPosition', 'object-position', check=None)))
+    add(('p', scale('spacing', 'padding')))
+    for side, props in SIDES.items():
+        add((f'p{side}', scale('spacing', *(f'padding-{p}' for p in props))))
+    r += [(f'text-{v}', [('text-align', v)]) for v in ('left', 'center', 'right', 'justify', 'start', 'end')]
+    add(('indent', scale('spacing', 'text-indent', negative=True)))
+    r += [(f'align-{v}', [('vertical-align', v)]) for v in ('baseline', 'top', 'middle', 'bottom', 'text-top',
+                                                           'text-bottom', 'sub', 'super')]
+    add(('font', font_family))
+    add(('text', font_size))
+    add(('font', font_weight))
+    r += [('uppercase', [('text-transform', 'uppercase')]), ('lowercase', [('text-transform', 'lowercase')]),
+          ('capitalize', [('text-transform', 'capitalize')]), ('normal-case', [('text-transform', 'none')])]
+    r += [('italic', [('font-style', 'italic')]), ('not-italic', [('font-style', 'normal')])]
+    r += [(v, [('font-variant-numeric', v)]) for v in ('ordinal', 'slashed-zero', 'lining-nums', 'oldstyle-nums',
+                                                       'proportional-nums', 'tabular-nums')]
+    add(('normal-nums', [('font-variant-numeric', 'normal')]))
+    add(('leading', scale('lineHeight', 'line-height', check=None)))
+    add(('tracking', scale('letterSpacing', 'letter-spacing', negative=True)))
+    add(('text', colors('color')))
+    r += [('underline', [('text-decoration-line', 'underline')]), ('overline', [('text-decoration-line', 'overline')]),
+          ('line-through', [('text-decoration-line', 'line-through')]),
+          ('no-underline', [('text-decoration-line', 'none')])]
+    add(('decoration', colors('text-decoration-color')))
+    add(('underline-offset', scale('textUnderlineOffset', 'text-underline-offset')))
+    r += [('antialiased', [('-webkit-font-smoothing', 'antialiased'), ('-moz-osx-font-smoothing', 'grayscale')]),
+          ('subpixel-antialiased', [('-webkit-font-smoothing', 'auto'), ('-moz-osx-font-smoothing', 'auto')])]
+    add(('placeholder', colors('color'), '::placeholder'))
+    add(('caret', colors('caret-color')))
+    add(('accent', colors('accent-color')))
+    add(('opacity', scale('opacity', 'opacity', check=None)))
+    r += [(f'mix-blend-{v}', [('mix-blend-mode', v)]) for v in ('normal', 'multiply', 'screen', 'overlay',
+                                                               'darken', 'lighten', 'soft-light', 'plus-lighter')]
+    add(('shadow', box_shadow))
+    add(('shadow', shadow_color))
+    r += [('outline-none', [('outline', '2px solid transparent'), ('outline-offset', '2px')]),
+          ('outline', [('outline-style', 'solid')]), ('outline-dashed', [('outline-style', 'dashed')]),
+          ('outline-dotted', [('outline-style', 'dotted')])]
+    add(('outline', scale('outlineWidth', 'outline-width')))
+    add(('outline-offset', scale('outlineOffset', 'outline-offset')))
+    add(('outline', colors('outline-color')))
+    add(('ring', ring_width))
+    add(('ring-inset', [('--tw-ring-inset', 'inset')]))
+    add(('ring', colors('--tw-ring-color')))
+    add(('ring-offset', scale('ringOffsetWidth', '--tw-ring-offset-width')))
+    add(('ring-offset', colors('--tw-ring-offset-color')))
+    add(('blur', composite('blur', ['--tw-blur'], 'filter', 'blur({})')))
+    add(('brightness', composite('brightness', ['--tw-brightness'], 'filter', 'brightness({})')))
+    add(('contrast', composite('contrast', ['--tw-contrast'], 'filter', 'contrast({})')))
+    add(('grayscale', composite('grayscale', ['--tw-grayscale'], 'filter', 'grayscale({})')))
+    add(('invert', composite('invert', ['--tw-invert'], 'filter', 'invert({})')))
+    add(('saturate', composite('saturate', ['--tw-saturate'], 'filter', 'saturate({})')))
+    add(('sepia', composite('sepia', ['--tw-sepia'], 'filter', 'sepia({})')))
+    r += [('filter', [('filter', FILTER)]), ('filter-none', [('filter', 'none')])]
+    add(('backdrop-blur', _backdrop('blur', '--tw-backdrop-blur', 'blur({})')))
+    add(('backdrop-brightness', _backdrop('brightness', '--tw-backdrop-brightness', 'brightness({})')))
+    add(('backdrop-contrast', _backdrop('contrast', '--tw-backdrop-contrast', 'contrast({})')))
+    add(('backdrop-grayscale', _backdrop('grayscale', '--tw-backdrop-grayscale', 'grayscale({})')))
+    add(('backdrop-opacity', _backdrop('opacity', '--tw-backdrop-opacity', 'opacity({})')))
+    add(('backdrop-saturate', _backdrop('saturate', '--tw-backdrop-saturate', 'saturate({})')))
+    r += [('backdrop-filter', [('-webkit-backdrop-filter', BACKDROP), ('backdrop-filter', BACKDROP)]),
+          ('backdrop-filter-none', [('-webkit-backdrop-filter', 'none'), ('backdrop-filter', 'none')])]
+    add(('transition', transition))
+    add(('delay', scale('transitionDuration', 'transition-delay', check=None)))
+    add(('duration', scale('transitionDuration', 'transition-duration', check=None)))
+    add(('ease', scale('transitionTimingFunction', 'transition-timing-function', check=None)))
+    r += [('will-change-auto', [('will-change', 'auto')]), ('will-change-scroll', [('will-change', 'scroll-position')]),
+          ('will-change-contents', [('will-change', 'contents')]), ('will-change-transform', [('will-change', 'transform')])]
+    add(('content', content))
+    add(('content-none', [('--tw-content', 'none'), ('content', 'none')]))
+    return r
+
+
+RULES = _rules()
+STATIC = {}
+FUNCTIONAL = {}
+for _order, _rule in enumerate(RULES):
+    _name, _spec, _child = (_rule + ('',))[:3]
+    if callable(_spec):
+        FUNCTIONAL.setdefault(_name, []).append((_order, _spec, _child))
+    else:
+        STATIC.setdefault(_name, (_order, _spec, _child))
+
+
+# Variants -------------------------------------------------------------------
+
+PSEUDO_CLASSES = {
+    'first': ':first-child', 'last': ':last-child', 'only': ':only-child', 'odd': ':nth-child(odd)',
+    'even': ':nth-child(even)', 'first-of-type': ':first-of-type', 'last-of-type': ':last-of-type',
+    'visited': ':visited', 'target': ':target', 'open': '[open]', 'checked': ':checked',
+    'placeholder-shown': ':placeholder-shown', 'required': ':required', 'valid': ':valid', 'invalid': ':invalid',
+    'read-only': ':read-only', 'empty': ':empty', 'focus-within': ':focus-within', 'hover': ':hover',
+    'focus': ':focus', 'focus-visible': ':focus-visible', 'active': ':active', 'enabled': ':enabled',
+    'disabled': ':disabled',
+}
+PSEUDO_ELEMENTS = {
+    'placeholder': '::placeholder', 'selection': '::selection', 'marker': '::marker', 'file': '::file-selector-button',
+    'before': '::before', 'after': '::after', 'first-letter': '::first-letter', 'first-line': '::first-line',
+}
+MEDIA_VARIANTS = {
+    'motion-safe': '(prefers-reduced-motion: no-preference)',
+    'motion-reduce': '(prefers-reduced-motion: reduce)',
+    'dark': '(prefers-color-scheme: dark)',
+    'print': 'print',
+    'portrait': '(orientation: portrait)',
+    'landscape': '(orientation: landscape)',
+}
+PSEUDO_RANK = {name: i + 1 for i, name in enumerate(PSEUDO_CLASSES)}
+
+
+class Variant:
+    def __init__(self, rank, pseudo='', element='', prefix='', media=None, screen=0):
+        self.rank = rank
+        self.pseudo = pseudo
+        self.element = element
+        self.prefix = prefix
+        self.media = media
+        self.screen = screen
+
+
+def parse_variant(name, theme):
+    if name in PSEUDO_CLASSES:
+        return Variant(PSEUDO_RANK[name], pseudo=PSEUDO_CLASSES[name])
+    if name in PSEUDO_ELEMENTS:
+        return Variant(0, element=PSEUDO_ELEMENTS[name])
+    for kind, combinator in (('group', ' '), ('peer', ' ~ ')):
+        if name.startswith(kind + '-') and name[len(kind) + 1:] in PSEUDO_CLASSES:
+            state = name[len(kind) + 1:]
+            return Variant(100 + PSEUDO_RANK[state] + (50 if kind == 'peer' else 0),
+                           prefix=f'.{kind}{PSEUDO_CLASSES[state]}{combinator}')
+    if name in MEDIA_VARIANTS:
+        return Variant(200 + list(MEDIA_VARIANTS).index(name), media=MEDIA_VARIANTS[name])
+    screens = list(theme['screens'])
+    if name in theme['screens']:
+        return Variant(0, media=f"(min-width: {theme['screens'][name]})", screen=1 + screens.index(name))
+    if name.startswith('max-') and name[4:] in theme['screens']:
+        # max-* come before the min-width screens, widest first
+        return Variant(0, media=f"not all and (min-width: {theme['screens'][name[4:]]})",
+                       screen=-1 - screens.index(name[4:]))
+    return None
+
+
+# Rendering ------------------------------------------------------------------
+
+def escape(name):
+    """Escape a class name for use in a selector (like CSS.escape)."""
+    out = []
+    for i, c in enumerate(name):
+        if c.isalnum() and c.isascii() or c in '-_':
+            if i == 0 and c.isdigit():
+                out.append(f'\\3{c} ')
+            else:
+                out.append(c)
+        else:
+            out.append('\\' + c)
+    return ''.join(out)
+
+
+def resolve(base, theme):
+    """(order, decls, child selector) for a utility without variants, or None."""
+    important = base.startswith('!')
+    if important:
+        base = base[1:]
+    found = _lookup(base, theme)
+    if found is None:
+        return None
+    order, decls, child = found
+    if important:
+        decls = [(p, f'{v} !important') for p, v in decls]
+    return order, decls, child
+
+
+def _lookup(base, theme):
+    if base in STATIC:
+        return STATIC[base]
+    m = re.match(r'^\[([a-z-]+):(.+)\]$', base)
+    if m:
+        return len(RULES), [(m.group(1), m.group(2).replace('_', ' '))], ''
+    negative = base.startswith('-')
+    if negative:
+        base = base[1:]
+    bracket = base.find('[')
+    head = base if bracket == -1 else base[:bracket]
+    candidates = []
+    if bracket == -1:
+        candidates.append((base, None))
+    for i in range(len(head) - 1, 0, -1):
+        if head[i] == '-':
+            candidates.append((base[:i], base[i + 1:]))
+    matches = []
+    for root, value in candidates:
+        for order, handler, child in FUNCTIONAL.get(root, ()):
+            decls = handler(value, theme, negative)
+            if decls:
+                matches.append((order, decls, child))
+                break
+    return min(matches, key=lambda m: m[0]) if matches else None
+
+
+def parse_class(name, theme):
+    """Rule for one class: (sort key, media list, selector, decls), or None."""
+    if len(name) > 200:
+        return None
+    parts = []
+    depth = 0
+    start = 0
+    for i, c in enumerate(name):
+        if c == '[':
+            depth += 1
+        elif c == ']':
+            depth -= 1
+        elif c == ':' and depth == 0:
+            parts.append(name[start:i])
+            start = i + 1
+    base = name[start:]
+    if not base:
+        return None
+    variants = [parse_variant(v, theme) for v in parts]
+    if any(v is None for v in variants):
+        return None
+    found = resolve(base, theme)
+    if found is None:
+        return None
+    order, decls, child = found
+    selector = '.' + escape(name)
+    prefix = ''
+    element = ''
+    for v in reversed(variants):
+        selector += v.pseudo
+        prefix = v.prefix + prefix
+        element = element or v.element
+    if element in ('::before', '::after') and not any(p == 'content' for p, _ in decls):
+        decls = [('content', 'var(--tw-content)')] + decls
+    selector = prefix + selector + child + element
+    media = [v.media for v in variants if v.media]
+    screen = max((v.screen for v in variants if v.screen), default=0, key=abs)
+    screen_key = (1, screen) if screen else (0, 0)
+    rank = tuple(sorted((v.rank for v in variants), reverse=True))
+    key = (screen_key, bool(media) and screen == 0, rank, order, name)
+    return key, media, selector, decls
+
+
+def _block(selector, decls, indent):
+    pad = ' ' * indent
+    body = ''.join(f'{pad}  {p}: {v};\n' for p, v in decls)
+    return f'{pad}{selector} {{\n{body}{pad}}}\n'
+
+
+PREFLIGHT = '''*,
+::before,
+::after {
+  box-sizing: border-box;
+  border-width: 0;
+  border-style: solid;
+  border-color: #e5e7eb;
+}
+::before,
+::after {
+  --tw-content: '';
+}
+html,
+:host {
+  line-height: 1.5;
+  -webkit-text-size-adjust: 100%;
+  -moz-tab-size: 4;
+  tab-size: 4;
+  font-family: {sans};
+  font-feature-settings: normal;
+  font-variation-settings: normal;
+  -webkit-tap-highlight-color: transparent;
+}
+body {
+  margin: 0;
+  line-height: inherit;
+}
+hr {
+  height: 0;
+  color: inherit;
+  border-top-width: 1px;
+}
+abbr:where([title]) {
+  text-decoration: underline dotted;
+}
+h1, h2, h3, h4, h5, h6 {
+  font-size: inherit;
+  font-weight: inherit;
+}
+a {
+  color: inherit;
+  text-decoration: inherit;
+}
+b, strong {
+  font-weight: bolder;
+}
+code, kbd, samp, pre {
+  font-family: {mono};
+  font-feature-settings: normal;
+  font-variation-settings: normal;
+  font-size: 1em;
+}
+small {
+  font-size: 80%;
+}
+sub, sup {
+  font-size: 75%;
+  line-height: 0;
+  position: relative;
+  vertical-align: baseline;
+}
+sub {
+  bottom: -0.25em;
+}
+sup {
+  top: -0.5em;
+}
+table {
+  text-indent: 0;
+  border-color: inherit;
+  border-collapse: collapse;
+}
+button, input, optgroup, select, textarea {
+  font-family: inherit;
+  font-feature-settings: inherit;
+  font-variation-settings: inherit;
+  font-size: 100%;
+  font-weight: inherit;
+  line-height: inherit;
+  letter-spacing: inherit;
+  color: inherit;
+  margin: 0;
+  padding: 0;
+}
+button, select {
+  text-transform: none;
+}
+button,
+input:where([type='button']),
+input:where([type='reset']),
+input:where([type='submit']) {
+  -webkit-appearance: button;
+  background-color: transparent;
+  background-image: none;
+}
+:-moz-focusring {
+  outline: auto;
+}
+:-moz-ui-invalid {
+  box-shadow: none;
+}
+progress {
+  vertical-align: baseline;
+}
+::-webkit-inner-spin-button,
+::-webkit-outer-spin-button {
+  height: auto;
+}
+[type='search'] {
+  -webkit-appearance: textfield;
+  outline-offset: -2px;
+}
+::-webkit-search-decoration {
+  -webkit-appearance: none;
+}
+::-webkit-file-upload-button {
+  -webkit-appearance: button;
+  font: inherit;
+}
+summary {
+  display: list-item;
+}
+blockquote, dl, dd, h1, h2, h3, h4, h5, h6, hr, figure, p, pre {
+  margin: 0;
+}
+fieldset {
+  margin: 0;
+  padding: 0;
+}
+legend {
+  padding: 0;
+}
+ol, ul, menu {
+  list-style: none;
+  margin: 0;
+  padding: 0;
+}
+dialog {
+  padding: 0;
+}
+textarea {
+  resize: vertical;
+}
+input::placeholder,
+textarea::placeholder {
+  opacity: 1;
+  color: #9ca3af;
+}
+button, [role="button"] {
+  cursor: pointer;
+}
+:disabled {
+  cursor: default;
+}
+img, svg, video, canvas, audio, iframe, embed, object {
+  display: block;
+  vertical-align: middle;
+}
+img, video {
+  max-width: 100%;
+  height: auto;
+}
+[hidden]:where(:not([hidden="until-found"])) {
+  display: none;
+}
+'''
+
+TW_DEFAULTS = [
+    ('--tw-border-spacing-x', '0'), ('--tw-border-spacing-y', '0'), ('--tw-translate-x', '0'),
+    ('--tw-translate-y', '0'), ('--tw-rotate', '0'), ('--tw-skew-x', '0'), ('--tw-skew-y', '0'),
+    ('--tw-scale-x', '1'), ('--tw-scale-y', '1'), ('--tw-pan-x', ' '), ('--tw-pan-y', ' '),
+    ('--tw-pinch-zoom', ' '), ('--tw-scroll-snap-strictness', 'proximity'),
+    ('--tw-gradient-from-position', ' '), ('--tw-gradient-via-position', ' '), ('--tw-gradient-to-position', ' '),
+    ('--tw-ordinal', ' '), ('--tw-slashed-zero', ' '), ('--tw-numeric-figure', ' '), ('--tw-numeric-spacing', ' '),
+    ('--tw-numeric-fraction', ' '), ('--tw-ring-inset', ' '), ('--tw-ring-offset-width', '0px'),
+    ('--tw-ring-offset-color', '#fff'), ('--tw-ring-color', 'rgb(59 130 246 / 0.5)'),
+    ('--tw-ring-offset-shadow', '0 0 #0000'), ('--tw-ring-shadow', '0 0 #0000'), ('--tw-shadow', '0 0 #0000'),
+    ('--tw-shadow-colored', '0 0 #0000'), ('--tw-blur', ' '), ('--tw-brightness', ' '), ('--tw-contrast', ' '),
+    ('--tw-grayscale', ' '), ('--tw-hue-rotate', ' '), ('--tw-invert', ' '), ('--tw-saturate', ' '),
+    ('--tw-sepia', ' '), ('--tw-drop-shadow', ' '), ('--tw-backdrop-blur', ' '), ('--tw-backdrop-brightness', ' '),
+    ('--tw-backdrop-contrast', ' '), ('--tw-backdrop-grayscale', ' '), ('--tw-backdrop-hue-rotate', ' '),
+    ('--tw-backdrop-invert', ' '), ('--tw-backdrop-opacity', ' '), ('--tw-backdrop-saturate', ' '),
+    ('--tw-backdrop-sepia', ' '),
+]
+
+
+def generate(classes, config=None, header=''):
+    """Stylesheet with preflight and the utilities among `classes`.
+    Returns (css, number of utility classes emitted)."""
+    theme = resolve_theme(config)
+    rules = [rule for rule in (parse_class(name, theme) for name in set(classes)) if rule]
+    rules.sort(key=lambda rule: rule[0])
+
+    out = [header] if header else []
+    out.append(PREFLIGHT.replace('{sans}', theme['fontFamily'].get('sans', SANS))
+               .replace('{mono}', theme['fontFamily'].get('mono', MONO)))
+    out.append(_block('*, ::before, ::after', TW_DEFAULTS, 0))
+    out.append(_block('::backdrop', TW_DEFAULTS, 0))
+
+    used = set()
+    for _, _, _, decls in rules:
+        for prop, value in decls:
+            if prop == 'animation':
+                used.add(value.split()[0])
+    for name, frames in theme['keyframes'].items():
+        if name in used:
+            body = ''.join(_block(step, list(props.items()), 2) for step, props in frames.items())
+            out.append(f'@keyframes {name} {{\n{body}}}\n')
+
+    open_media = []
+    for _, media, selector, decls in rules:
+        if media != open_media:
+            out.extend(f'{"  " * i}}}\n' for i in reversed(range(len(open_media))))
+            out.extend(f'{"  " * i}@media {m} {{\n' for i, m in enumerate(media))
+            open_media = media
+        out.append(_block(selector, decls, 2 * len(media)))
+    out.extend(f'{"  " * i}}}\n' for i in reversed(range(len(open_media))))
+    return ''.join(out), len(rules)
@@ -0,0 +1,51 @@
+"""
+Generate page variants by rearranging @marker sections.
+
+    python3 -m transforms.variants index.html --list
+    python3 -m transforms.variants index.html --order hero,award,transformation -o variant-b.html
+    python3 -m transforms.variants index.html --drop pricing-beta -o variant-c.html
+"""
+import argparse
+import sys
+
+from .sections import SectionIndex
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m transforms.variants',
+                                     description='List or rearrange the @marker sections of a page.')
+    parser.add_argument('page')
+    parser.add_argument('--list', action='store_true', help='list sections and their sizes')
+    parser.add_argument('--order', help='comma-separated section order (others stay in place)')
+    parser.add_argument('--drop', default='', help='comma-separated sections to remove')
+    parser.add_argument('-o', '--output', help='write the variant here (default: stdout)')
+    args = parser.parse_args(argv)
+
+    with open(args.page, 'r') as f:
+        index = SectionIndex(f.read())
+
+    if args.list or not (args.order or args.drop):
+        for name in index.names:
+            print(f'@{name:20} {index.size(name):>8} chars')
+        return 0
+
+    layout = index.layout()
+    try:
+        if args.order:
+            layout.reorder(args.order.split(','))
+        layout.drop(*filter(None, args.drop.split(',')))
+    except KeyError as e:
+        print(f'✗ {e.args[0]}')
+        return 1
+    html = layout.render()
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(html)
+        print(f"✓ Wrote {args.output}: {' → '.join(layout.order)}")
+    else:
+        sys.stdout.write(html)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
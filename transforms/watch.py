@@ -0,0 +1,179 @@
+"""
+Watch mode: re-run a pipeline on just the pages that change.
+
+Uses inotify (through ctypes) on Linux and falls back to mtime polling
+elsewhere. Events are debounced, then:
+
+- if a transform source changed (blog/index.html for sync-from-blog and
+  update-pages) or a partial, the whole pipeline re-runs and the cache
+  limits it to the pages that depend on the changed file;
+- otherwise only the edited pages are re-processed.
+
+Files the pipeline itself just wrote are recognised by their content hash
+and ignored, so a run never triggers another run.
+
+    python3 -m transforms sync-from-blog --watch
+    python3 sync_navbar.py --watch --poll
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from . import cache
+from .engine import ERROR, ROOT, run, site_pages
+from .includes import PARTIALS_DIR
+from .registry import get_pipeline
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class InotifyWatcher:
+    def __init__(self, root, dirs):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError('inotify not available')
+        self.root = root
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = {}
+        for d in dirs:
+            wd = libc.inotify_add_watch(self.fd, os.path.join(root, d).encode(),
+                                        IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {d}')
+            self.dirs[wd] = d
+
+    def poll(self, timeout):
+        """Paths (relative to root) written within `timeout` seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = os.read(self.fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode()
+            offset += length
+            if name and wd in self.dirs:
+                d = self.dirs[wd]
+                changed.add(f'{d}/{name}' if d else name)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    def __init__(self, root, dirs, interval=0.5):
+        self.root = root
+        self.dirs = dirs
+        self.interval = interval
+        self.mtimes = self._scan()
+
+    def _scan(self):
+        mtimes = {}
+        for d in self.dirs:
+            path = os.path.join(self.root, d)
+            try:
+                entries = os.scandir(path)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_file():
+                        mtimes[f'{d}/{entry.name}' if d else entry.name] = entry.stat().st_mtime_ns
+        return mtimes
+
+    def poll(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        mtimes = self._scan()
+        changed = {p for p, m in mtimes.items() if self.mtimes.get(p) != m}
+        self.mtimes = mtimes
+        return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(root, dirs, poll=False):
+    if not poll:
+        try:
+            return InotifyWatcher(root, dirs)
+        except OSError:
+            pass
+    return PollingWatcher(root, dirs)
+
+
+def batches(watcher, debounce=0.2):
+    """Yield sets of changed paths, each once writes have been quiet for `debounce` seconds."""
+    while True:
+        changed = watcher.poll(1.0)
+        if not changed:
+            continue
+        while True:
+            more = watcher.poll(debounce)
+            if not more:
+                break
+            changed |= more
+        yield changed
+
+
+def watch(pipeline, root=ROOT, jobs=1, poll=False, debounce=0.2):
+    transforms = get_pipeline(pipeline)
+    sources = {s for t in transforms for s in t.sources}
+    pages = set(site_pages(root))
+    dirs = {os.path.dirname(p) for p in pages | sources}
+    if os.path.isdir(os.path.join(root, PARTIALS_DIR)):
+        dirs.add(PARTIALS_DIR)
+    dirs = sorted(dirs)
+
+    def record(results):
+        for result in results:
+            if result.status != ERROR:
+                written[result.path] = result.hash
+
+    written = {}  # path -> content hash we last left on disk
+    record(run(pipeline, root=root, jobs=jobs))
+
+    watcher = make_watcher(root, dirs, poll)
+    kind = 'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'
+    print(f"\n👀 Watching {', '.join(d or '.' for d in dirs)} ({kind}); Ctrl+C to stop")
+    try:
+        for changed in batches(watcher, debounce):
+            edited = set()
+            for path in changed:
+                if not path.endswith('.html'):
+                    continue
+                try:
+                    with open(os.path.join(root, path), 'r') as f:
+                        digest = cache.content_hash(f.read())
+                except OSError:
+                    continue
+                if written.get(path) != digest:
+                    edited.add(path)
+            if not edited:
+                continue
+
+            print(f"\n{time.strftime('%H:%M:%S')} changed: {', '.join(sorted(edited))}")
+            if edited & sources or edited - pages:
+                print('Source or partial changed, re-syncing dependent pages')
+                record(run(pipeline, root=root, jobs=jobs))
+                pages = set(site_pages(root))
+            else:
+                record(run(pipeline, pages=sorted(edited), root=root))
+    except KeyboardInterrupt:
+        print('\nStopped watching.')
+    finally:
+        watcher.close()
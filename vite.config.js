@@ -1,6 +1,14 @@
 import { defineConfig } from 'vite';
+import { existsSync, readFileSync } from 'fs';
 import { resolve } from 'path';
 
+// Blog pages (listing pages and posts) are written by the blog generator:
+// python3 -m transforms.blog
+const blogInputsFile = resolve(__dirname, 'vite.inputs.json');
+const blogInputs = existsSync(blogInputsFile)
+  ? JSON.parse(readFileSync(blogInputsFile, 'utf8'))
+  : { blog: 'blog/index.html' };
+
 export default defineConfig({
   build: {
     rollupOptions: {
@@ -14,10 +22,9 @@ export default defineConfig({
         calculator: resolve(__dirname, 'calculator.html'),
         contact: resolve(__dirname, 'contact.html'),
         signup: resolve(__dirname, 'signup.html'),
-        blog: resolve(__dirname, 'blog/index.html'),
-        'blog-ai-dental-companion': resolve(__dirname, 'blog/best-ai-dental-companion-2025.html'),
-        'blog-patient-compliance': resolve(__dirname, 'blog/patient-compliance-dental-apps.html'),
-        'blog-ai-assistant-guide': resolve(__dirname, 'blog/dental-practice-ai-assistant-guide.html'),
+        ...Object.fromEntries(
+          Object.entries(blogInputs).map(([name, path]) => [name, resolve(__dirname, path)])
+        ),
       },
     },
   },